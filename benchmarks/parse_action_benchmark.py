@@ -0,0 +1,117 @@
+# parse_action_benchmark.py
+"""Compare CommandHandler.parse_action with the pre-grammar implementation.
+
+Run from the repository root:
+    python benchmarks/parse_action_benchmark.py [--repeat N]
+"""
+
+import argparse
+import os
+import re
+import sys
+import timeit
+from types import SimpleNamespace
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.command_handler import CommandHandler  # noqa: E402
+from game_engine.game_config import COMMAND_SYNONYMS  # noqa: E402
+
+CORPUS_FILE = os.path.join(os.path.dirname(__file__), "recorded_commands.txt")
+
+
+def legacy_parse_action(raw_input):
+    """parse_action as it was before the grammar was compiled at import."""
+    action = raw_input.strip().lower()
+    if not action:
+        return None, None
+    give_match = re.match(r"^(give|offer)\s+(.+?)\s+to\s+(.+)$", action)
+    if give_match:
+        return "use", (
+            give_match.group(2).strip(),
+            give_match.group(3).strip(),
+            "give",
+        )
+    read_match = re.match(r"^(read|peruse)\s+(.+)$", action)
+    if read_match:
+        return "use", (read_match.group(2).strip(), None, "read")
+    use_on_match = re.match(r"^(use|apply)\s+(.+?)\s+on\s+(.+)$", action)
+    if use_on_match:
+        return "use", (
+            use_on_match.group(2).strip(),
+            use_on_match.group(3).strip(),
+            "use_on",
+        )
+    persuade_match = re.match(
+        r"^(persuade|convince|argue with)\s+(.+?)\s+(?:that|to)\s+(.+)$", action
+    )
+    if persuade_match:
+        return "persuade", (
+            persuade_match.group(2).strip(),
+            persuade_match.group(3).strip(),
+        )
+
+    matched_command = None
+    best_match_length = 0
+    parsed_arg = None
+    for base_cmd, synonyms in COMMAND_SYNONYMS.items():
+        for cmd_to_check in [base_cmd] + synonyms:
+            if action == cmd_to_check:
+                if len(cmd_to_check) > best_match_length:
+                    matched_command = base_cmd
+                    best_match_length = len(cmd_to_check)
+                    parsed_arg = None
+            elif action.startswith(cmd_to_check + " "):
+                if len(cmd_to_check) > best_match_length:
+                    matched_command = base_cmd
+                    best_match_length = len(cmd_to_check)
+                    parsed_arg = action[len(cmd_to_check) :].strip()
+    if matched_command:
+        return matched_command, parsed_arg
+    parts = action.split(" ", 1)
+    return parts[0], parts[1] if len(parts) > 1 else None
+
+
+def load_corpus(path=CORPUS_FILE):
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n") for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the corpus")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    handler = CommandHandler(SimpleNamespace())
+    mismatches = [
+        command
+        for command in corpus
+        if handler.parse_action(command) != legacy_parse_action(command)
+    ]
+    if mismatches:
+        print(f"Parsers disagree on: {mismatches}")
+        return 1
+
+    def run_legacy():
+        for command in corpus:
+            legacy_parse_action(command)
+
+    def run_compiled():
+        for command in corpus:
+            handler.parse_action(command)
+
+    legacy_time = min(timeit.repeat(run_legacy, number=args.repeat, repeat=5))
+    compiled_time = min(timeit.repeat(run_compiled, number=args.repeat, repeat=5))
+    per_command = args.repeat * len(corpus)
+    print(f"{len(corpus)} recorded commands x {args.repeat} passes")
+    print(f"legacy:   {legacy_time / per_command * 1e6:7.2f} us/command")
+    print(f"compiled: {compiled_time / per_command * 1e6:7.2f} us/command")
+    print(f"speedup:  {legacy_time / compiled_time:7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
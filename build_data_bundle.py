@@ -0,0 +1,23 @@
+# build_data_bundle.py
+"""Validate data/*.json once and write data/game_data.bundle for faster startup.
+
+Run this before packaging (e.g. PyInstaller) and ship the bundle next to the JSON
+files. The game ignores the bundle whenever the JSON no longer matches its hash.
+"""
+
+import sys
+
+from game_engine.data_bundle import build_bundle
+from game_engine.game_config import HIGHLY_NOTABLE_ITEMS_FOR_MEMORY
+
+
+def main():
+    output_path, problems = build_bundle(HIGHLY_NOTABLE_ITEMS_FOR_MEMORY)
+    for message in problems:
+        print(f"Warning: {message}")
+    print(f"Wrote {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
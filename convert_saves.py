@@ -0,0 +1,56 @@
+# convert_saves.py
+"""Re-encode save slots with another save codec, folding any autosave delta log in.
+
+Examples:
+    python convert_saves.py                          # every savegame*.json, default codec
+    python convert_saves.py savegame_slot1.json --codec json
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+from game_engine.game_config import SAVE_CODEC
+from game_engine.save_codec import available_codecs, read_save_file
+from game_engine.save_log import replay_delta_log, write_checkpoint
+
+
+def convert_save(path, codec):
+    """Rewrite one save in codec; returns (bytes_before, bytes_after, deltas_folded)."""
+    state = read_save_file(path)
+    state, deltas_folded = replay_delta_log(path, state)
+    bytes_before = os.path.getsize(path)
+    write_checkpoint(path, state, codec)
+    return bytes_before, os.path.getsize(path), deltas_folded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert save files between save codecs.")
+    parser.add_argument("paths", nargs="*", help="save files (default: savegame*.json here)")
+    parser.add_argument(
+        "--codec",
+        default=SAVE_CODEC,
+        choices=available_codecs(),
+        help=f"target codec (default: {SAVE_CODEC})",
+    )
+    args = parser.parse_args(argv)
+
+    paths = args.paths or sorted(glob.glob("savegame*.json"))
+    if not paths:
+        print("No save files found.")
+        return 1
+    failures = 0
+    for path in paths:
+        try:
+            before, after, folded = convert_save(path, args.codec)
+        except Exception as e:
+            print(f"{path}: failed ({e})")
+            failures += 1
+            continue
+        print(f"{path}: {before} -> {after} bytes ({args.codec}, {folded} delta(s) folded in)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
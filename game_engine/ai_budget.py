@@ -0,0 +1,132 @@
+# ai_budget.py
+"""Budget-aware policy that downgrades low-priority AI calls when the API is struggling.
+
+GeminiAPI feeds every completed call into AdaptiveAIPolicy.observe(). While the
+p95 latency or the error rate of recent calls is over budget, or the session
+has spent its token budget, allows() turns away the low-priority call sites so
+their callers fall back to the static_fallbacks pools. Latency and errors are
+judged over a sliding time window, so the policy recovers on its own once
+recent calls are healthy again (or once the slow ones have aged out).
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import deque
+
+from .game_config import (
+    AI_ERROR_RATE_BUDGET,
+    AI_HEALTH_WINDOW_SECONDS,
+    AI_LATENCY_P95_BUDGET_SECONDS,
+    AI_SESSION_TOKEN_BUDGET,
+    LOW_PRIORITY_AI_CALL_SITES,
+)
+
+MIN_SAMPLES = 5  # Fewer recent calls than this say nothing about latency or errors
+MAX_SAMPLES = 50
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of values (fraction in 0-1); None when empty."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class AdaptiveAIPolicy:
+    def __init__(
+        self,
+        latency_p95_budget=AI_LATENCY_P95_BUDGET_SECONDS,
+        error_rate_budget=AI_ERROR_RATE_BUDGET,
+        session_token_budget=AI_SESSION_TOKEN_BUDGET,
+        window_seconds=AI_HEALTH_WINDOW_SECONDS,
+        low_priority_call_sites=LOW_PRIORITY_AI_CALL_SITES,
+        clock=time.monotonic,
+    ):
+        self.latency_p95_budget = latency_p95_budget
+        self.error_rate_budget = error_rate_budget
+        self.session_token_budget = session_token_budget
+        self.window_seconds = window_seconds
+        self.low_priority_call_sites = frozenset(low_priority_call_sites)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=MAX_SAMPLES)  # (timestamp, latency, failed)
+        self.tokens_spent = 0
+        self.skipped_calls = 0
+        self._last_reason = None
+
+    def observe(self, outcome, latency=0.0, tokens=0):
+        """Record a call that reached the API; cache hits and skips are not observed."""
+        if outcome in ("cache_hit", "skipped"):
+            return
+        with self._lock:
+            self.tokens_spent += tokens or 0
+            self._samples.append((self._clock(), latency, outcome == "error"))
+
+    def _recent_samples(self):
+        cutoff = self._clock() - self.window_seconds
+        while self._samples and self._samples[0][0] < cutoff:
+            self._samples.popleft()
+        return list(self._samples)
+
+    def degraded_reason(self):
+        """Why low-priority calls are being turned away, or None while within budget."""
+        with self._lock:
+            if self.session_token_budget and self.tokens_spent >= self.session_token_budget:
+                reason = f"session token budget of {self.session_token_budget} spent"
+            else:
+                reason = None
+                samples = self._recent_samples()
+                if len(samples) >= MIN_SAMPLES:
+                    p95 = percentile([latency for _, latency, _ in samples], 0.95)
+                    error_rate = sum(failed for _, _, failed in samples) / len(samples)
+                    if error_rate > self.error_rate_budget:
+                        reason = f"error rate {error_rate:.0%} over {self.error_rate_budget:.0%}"
+                    elif p95 > self.latency_p95_budget:
+                        reason = f"p95 latency {p95:.1f}s over {self.latency_p95_budget:.1f}s"
+            if reason != self._last_reason:
+                if reason:
+                    logging.info(f"Downgrading low-priority AI text to static fallbacks: {reason}.")
+                else:
+                    logging.info("AI budget healthy again; low-priority AI text resumed.")
+                self._last_reason = reason
+            return reason
+
+    def allows(self, call_site):
+        if call_site not in self.low_priority_call_sites or self.degraded_reason() is None:
+            return True
+        with self._lock:
+            self.skipped_calls += 1
+        return False
+
+    def status(self):
+        reason = self.degraded_reason()
+        with self._lock:
+            samples = self._recent_samples()
+            latencies = [latency for _, latency, _ in samples]
+            return {
+                "degraded_reason": reason,
+                "recent_calls": len(samples),
+                "p95_latency_s": percentile(latencies, 0.95),
+                "error_rate": (
+                    sum(failed for _, _, failed in samples) / len(samples) if samples else 0.0
+                ),
+                "tokens_spent": self.tokens_spent,
+                "skipped_calls": self.skipped_calls,
+            }
+
+    def format_status(self):
+        status = self.status()
+        p95 = status["p95_latency_s"]
+        summary = (
+            f"Recent calls: {status['recent_calls']}, p95 latency: "
+            f"{'n/a' if p95 is None else f'{p95:.2f}s'}, errors: {status['error_rate']:.0%}, "
+            f"tokens this session: {status['tokens_spent']}, flavor calls skipped: "
+            f"{status['skipped_calls']}."
+        )
+        if status["degraded_reason"]:
+            return f"Flavor text is on static fallbacks ({status['degraded_reason']}). {summary}"
+        return f"AI budget healthy. {summary}"
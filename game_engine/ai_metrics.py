@@ -0,0 +1,162 @@
+# ai_metrics.py
+"""Per-call-site accounting of Gemini calls: tokens, latency, cache hits and fallbacks.
+
+GeminiAPI records one entry per generation request under a call site name
+(e.g. "atmospheric_details"), so the cost of each feature can be compared when
+deciding what low AI mode should switch off.
+"""
+
+import csv
+import json
+import os
+import threading
+
+# ok: the model returned usable text; cache_hit: served from the response cache;
+# fallback: the call went through but produced an (OOC: ...) fallback; error: it raised;
+# skipped: turned away before reaching the API (AI budget, or the circuit breaker is open).
+OUTCOMES = ("ok", "cache_hit", "fallback", "error", "skipped")
+# How a reply requested as JSON parsed: parsed in one json.loads pass; salvaged from
+# around fences or prose by the lenient extractor; unusable even after that.
+JSON_PARSE_STATUSES = ("parsed", "salvaged", "unusable")
+
+EXPORT_FIELDS = (
+    "call_site",
+    "calls",
+    "ok",
+    "cache_hit",
+    "fallback",
+    "error",
+    "skipped",
+    "prompt_chars",
+    "prompt_tokens",
+    "output_tokens",
+    "total_latency_s",
+    "mean_latency_s",
+    "max_latency_s",
+    "json_replies",
+    "json_malformed",
+    "json_unusable",
+    "json_malformed_bytes",
+)
+
+
+def usage_token_counts(response):
+    """(prompt_tokens, output_tokens) from a response's usage_metadata; None where absent."""
+    usage = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(usage, "prompt_token_count", None)
+    output_tokens = getattr(usage, "candidates_token_count", None)
+    return (
+        prompt_tokens if isinstance(prompt_tokens, int) else None,
+        output_tokens if isinstance(output_tokens, int) else None,
+    )
+
+
+class AICallMetrics:
+    """Thread-safe running totals per call site."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sites = {}
+
+    def record(
+        self,
+        call_site,
+        outcome,
+        prompt_chars=0,
+        prompt_tokens=None,
+        output_tokens=None,
+        latency=0.0,
+    ):
+        if outcome not in OUTCOMES:
+            raise ValueError(f"Unknown AI call outcome '{outcome}'.")
+        with self._lock:
+            site = self._site(call_site)
+            site["calls"] += 1
+            site[outcome] += 1
+            site["prompt_chars"] += prompt_chars
+            site["prompt_tokens"] += prompt_tokens or 0
+            site["output_tokens"] += output_tokens or 0
+            site["total_latency_s"] += latency
+            site["max_latency_s"] = max(site["max_latency_s"], latency)
+
+    def record_json_parse(self, call_site, status, reply_bytes):
+        """Count a JSON-mode reply; the bytes of any reply that was not valid JSON are malformed."""
+        if status not in JSON_PARSE_STATUSES:
+            raise ValueError(f"Unknown JSON parse status '{status}'.")
+        with self._lock:
+            site = self._site(call_site)
+            site["json_replies"] += 1
+            if status != "parsed":
+                site["json_malformed"] += 1
+                site["json_malformed_bytes"] += reply_bytes
+            if status == "unusable":
+                site["json_unusable"] += 1
+
+    def _site(self, call_site):
+        return self._sites.setdefault(
+            call_site,
+            {
+                "calls": 0,
+                **{name: 0 for name in OUTCOMES},
+                "prompt_chars": 0,
+                "prompt_tokens": 0,
+                "output_tokens": 0,
+                "total_latency_s": 0.0,
+                "max_latency_s": 0.0,
+                "json_replies": 0,
+                "json_malformed": 0,
+                "json_unusable": 0,
+                "json_malformed_bytes": 0,
+            },
+        )
+
+    def rows(self):
+        """One dict per call site, the most expensive (by total latency) first."""
+        rows = []
+        with self._lock:
+            for call_site, site in self._sites.items():
+                api_calls = site["calls"] - site["cache_hit"] - site["skipped"]
+                mean_latency = site["total_latency_s"] / api_calls if api_calls else 0.0
+                rows.append({"call_site": call_site, **site, "mean_latency_s": mean_latency})
+        rows.sort(key=lambda row: (-row["total_latency_s"], -row["calls"], row["call_site"]))
+        return [{field: row[field] for field in EXPORT_FIELDS} for row in rows]
+
+    def format_report(self):
+        rows = self.rows()
+        if not rows:
+            return "No AI calls have been made yet."
+        lines = [
+            f"{'call site':<28} {'calls':>5} {'cached':>6} {'ooc':>4} {'err':>4} {'skip':>4} "
+            f"{'in tok':>7} {'out tok':>7} {'mean s':>7} {'total s':>8}"
+        ]
+        for row in rows:
+            lines.append(
+                f"{row['call_site'][:28]:<28} {row['calls']:>5} {row['cache_hit']:>6} "
+                f"{row['fallback']:>4} {row['error']:>4} {row['skipped']:>4} "
+                f"{row['prompt_tokens']:>7} {row['output_tokens']:>7} {row['mean_latency_s']:>7.2f} "
+                f"{row['total_latency_s']:>8.2f}"
+            )
+        for row in rows:
+            if row["json_replies"]:
+                lines.append(
+                    f"JSON replies for {row['call_site']}: {row['json_replies']}, malformed: "
+                    f"{row['json_malformed']} ({row['json_malformed'] / row['json_replies']:.0%}, "
+                    f"{row['json_malformed_bytes']} bytes), unusable: {row['json_unusable']}."
+                )
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write the rows to path: CSV if it ends in .csv, JSON otherwise."""
+        rows = self.rows()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=EXPORT_FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"call_sites": rows}, f, indent=2)
+        return path
@@ -0,0 +1,48 @@
+# atomic_write.py
+"""Crash-safe file replacement shared by saves and the data bundle."""
+
+import json
+import os
+import tempfile
+
+
+def write_json_atomic(path, data):
+    write_bytes_atomic(path, json.dumps(data, indent=4).encode("utf-8"))
+
+
+def write_bytes_atomic(path, payload):
+    """Write payload to a temp file beside path, fsync it, then rename it over path.
+
+    Readers see either the previous file or the complete new one, never a partial write.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        _remove_quietly(temp_path)
+        raise
+    if hasattr(os, "O_DIRECTORY"):
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -4,14 +4,27 @@ import copy
 import logging
 import json
 from typing import Any, Dict, Optional
-from .game_config import DEBUG_LOGS
+from .conversation_summary import SUMMARY_LOCK, extractive_summary, fit_summary
+from .game_config import (
+    CONVERSATION_HISTORY_MAX_LINES,
+    CONVERSATION_SUMMARY_MAX_PENDING_LINES,
+    DEBUG_LOGS,
+    MAX_PLAYER_MEMORIES,
+    MEMORY_RECENT_SLOTS,
+)
+from .memory_index import MemoryIndex
 
 
 def load_characters_data(data_path=None):
-    """Loads character data from a JSON file."""
+    """Loads character data from the data bundle if it is current, else from JSON."""
     from .game_config import get_data_path
 
     if data_path is None:
+        from .data_bundle import bundled_data
+
+        bundled_characters = bundled_data("characters")
+        if bundled_characters is not None:
+            return bundled_characters
         data_path = get_data_path("data/characters.json")
     try:
         with open(data_path, "r", encoding="utf-8") as f:
@@ -26,13 +39,29 @@ def load_characters_data(data_path=None):
 
 _CHARACTERS_DATA = None
 
+# Large per-character fields that incremental saves only write when they changed.
+# They are only mutated through Character methods, which mark them dirty.
+DELTA_TRACKED_FIELDS = (
+    "conversation_histories",
+    "conversation_summaries",
+    "memory_about_player",
+    "journal_entries",
+    "objectives",
+    "inventory",
+)
 
-def __getattr__(name):
+
+def get_characters_data():
+    """CHARACTERS_DATA, loaded on first use and then kept for the process."""
     global _CHARACTERS_DATA
+    if _CHARACTERS_DATA is None:
+        _CHARACTERS_DATA = load_characters_data()
+    return _CHARACTERS_DATA
+
+
+def __getattr__(name):
     if name == "CHARACTERS_DATA":
-        if _CHARACTERS_DATA is None:
-            _CHARACTERS_DATA = load_characters_data()
-        return _CHARACTERS_DATA
+        return get_characters_data()
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -56,13 +85,18 @@ class Character:
         self.persona = persona
         self.greeting = greeting
         self.default_location = default_location
+        self._location_observers = []
         self.current_location = default_location
         self.accessible_locations = (
             accessible_locations if accessible_locations is not None else [default_location]
         )
         self.is_player = is_player
         self.conversation_histories = {}
+        # Per conversation partner: {"summary": str, "pending": [evicted lines not yet in it]}
+        self.conversation_summaries = {}
         self.memory_about_player = []  # List of dictionaries
+        # Derived from memory_about_player and rebuilt on demand; never saved.
+        self._memory_index = MemoryIndex(self._describe_player_memory)
         self.journal_entries = []
         self.relationship_with_player = 0
         self.npc_relationships = (
@@ -116,8 +150,36 @@ class Character:
         )
         self.schedule = schedule if schedule else {}
         self.apparent_state = __getattr__("CHARACTERS_DATA").get(name, {}).get("apparent_state", "normal")
+        self._dirty_fields = set(DELTA_TRACKED_FIELDS)
+
+    @property
+    def current_location(self):
+        return self._current_location
+
+    @current_location.setter
+    def current_location(self, location_name):
+        previous_location = getattr(self, "_current_location", None)
+        self._current_location = location_name
+        for observer in list(self._location_observers):
+            observer(self, previous_location, location_name)
+
+    def add_location_observer(self, observer):
+        """Call observer(character, old_location, new_location) after every move."""
+        if observer not in self._location_observers:
+            self._location_observers.append(observer)
+
+    def remove_location_observer(self, observer):
+        if observer in self._location_observers:
+            self._location_observers.remove(observer)
+
+    def mark_dirty(self, *field_names):
+        self._dirty_fields.update(field_names)
+
+    def clear_dirty_fields(self):
+        self._dirty_fields.clear()
 
     def add_journal_entry(self, entry_type, text_content, game_day_time_period_str):
+        self.mark_dirty("journal_entries")
         MAX_JOURNAL_ENTRIES = 20
         if len(self.journal_entries) >= MAX_JOURNAL_ENTRIES:
             self.journal_entries.pop(0)
@@ -136,6 +198,7 @@ class Character:
             "current_location": self.current_location,
             "is_player": self.is_player,
             "conversation_histories": self.conversation_histories,
+            "conversation_summaries": self.conversation_summaries,
             "memory_about_player": self.memory_about_player,
             "journal_entries": self.journal_entries,
             "relationship_with_player": self.relationship_with_player,
@@ -147,6 +210,15 @@ class Character:
             "psychology": self.psychology,
         }
 
+    def to_delta_dict(self) -> Dict[str, Any]:
+        """Like to_dict, but the large fields appear only if they changed since the last call."""
+        data = self.to_dict()
+        for field_name in DELTA_TRACKED_FIELDS:
+            if field_name not in self._dirty_fields:
+                del data[field_name]
+        self.clear_dirty_fields()
+        return data
+
     @classmethod
     def from_dict(
         cls, data: Dict[str, Any], static_char_data: Optional[Dict[str, Any]]
@@ -170,6 +242,7 @@ class Character:
 
         char.current_location = data.get("current_location", char.default_location)
         char.conversation_histories = data.get("conversation_histories", {})
+        char.conversation_summaries = data.get("conversation_summaries", {})
         char.memory_about_player = data.get(
             "memory_about_player", []
         )  # Ensures backward compatibility
@@ -300,6 +373,7 @@ class Character:
         if item_name not in DEFAULT_ITEMS:
             return False
 
+        self.mark_dirty("inventory")
         item_props = DEFAULT_ITEMS[item_name]
         is_stackable = item_props.get("stackable", False) or item_props.get("value") is not None
 
@@ -322,6 +396,7 @@ class Character:
     def remove_from_inventory(self, item_name, quantity=1):
         from .game_config import DEFAULT_ITEMS
 
+        self.mark_dirty("inventory")
         item_props = DEFAULT_ITEMS.get(item_name, {})
         is_stackable = item_props.get("stackable", False) or item_props.get("value") is not None
 
@@ -417,16 +492,71 @@ class Character:
         return "You are carrying: " + ", ".join(descriptions) + "."
 
     def add_to_history(self, other_char_name, speaker_name, text):
+        self.mark_dirty("conversation_histories")
         if other_char_name not in self.conversation_histories:
             self.conversation_histories[other_char_name] = []
-        max_history = 10
         self.conversation_histories[other_char_name].append(f"{speaker_name}: {text}")
-        if len(self.conversation_histories[other_char_name]) > max_history:
-            self.conversation_histories[other_char_name].pop(0)
+        if len(self.conversation_histories[other_char_name]) > CONVERSATION_HISTORY_MAX_LINES:
+            self._queue_for_summary(
+                other_char_name, self.conversation_histories[other_char_name].pop(0)
+            )
+
+    def _queue_for_summary(self, other_char_name, line):
+        with SUMMARY_LOCK:
+            entry = self.conversation_summaries.get(other_char_name, {})
+            summary = entry.get("summary", "")
+            pending = entry.get("pending", []) + [line]
+            if len(pending) > CONVERSATION_SUMMARY_MAX_PENDING_LINES:
+                # The AI summary has not kept up (or is off); fold the lines in extractively.
+                summary, pending = extractive_summary(summary, pending), []
+            # Entries are replaced, not mutated, so a save never serializes half an update.
+            self.conversation_summaries[other_char_name] = {"summary": summary, "pending": pending}
+        self.mark_dirty("conversation_summaries")
+
+    def get_pending_summary_lines(self, other_char_name):
+        return list(self.conversation_summaries.get(other_char_name, {}).get("pending", []))
+
+    def summary_snapshot(self, other_char_name):
+        """(summary, pending lines) for the pair, as the summarizer should fold them."""
+        with SUMMARY_LOCK:
+            entry = self.conversation_summaries.get(other_char_name, {})
+            return entry.get("summary", ""), list(entry.get("pending", []))
+
+    def apply_conversation_summary(self, other_char_name, previous_summary, folded_lines, summary):
+        """Replace the summary made from previous_summary and the first folded_lines pending lines.
+
+        Returns False, changing nothing, if the entry moved on meanwhile (an
+        extractive fold replaced the summary the new one was built from).
+        """
+        with SUMMARY_LOCK:
+            entry = self.conversation_summaries.get(other_char_name, {})
+            if entry.get("summary", "") != previous_summary:
+                return False
+            self.conversation_summaries[other_char_name] = {
+                "summary": fit_summary(summary),
+                "pending": entry.get("pending", [])[folded_lines:],
+            }
+        self.mark_dirty("conversation_summaries")
+        return True
+
+    def get_conversation_summary(self, other_char_name, older_lines=()):
+        """The running summary with pending and older_lines folded in extractively; "" if none."""
+        with SUMMARY_LOCK:
+            entry = self.conversation_summaries.get(other_char_name, {})
+            summary, pending = entry.get("summary", ""), entry.get("pending", [])
+        return extractive_summary(summary, [*pending, *older_lines])
 
-    def get_formatted_history(self, other_char_name, limit=6):
+    def get_formatted_history(self, other_char_name, limit=6, include_summary=True):
+        """The last limit lines, after a summary of everything older when include_summary."""
         history = self.conversation_histories.get(other_char_name, [])
-        return "\n".join(history[-limit:])
+        recent_lines = "\n".join(history[-limit:])
+        if not include_summary:
+            return recent_lines
+        older_lines = history[:-limit] if limit else []
+        summary = self.get_conversation_summary(other_char_name, older_lines)
+        if not summary:
+            return recent_lines
+        return f"(Earlier, in summary:\n{summary})\n{recent_lines}"
 
     def add_player_memory(
         self, memory_type: str, turn: int, content: dict, sentiment_impact: int = 0
@@ -446,6 +576,7 @@ class Character:
             # Potentially add a default error memory or skip adding this memory
             return
 
+        self.mark_dirty("memory_about_player")
         memory_entry = {
             "type": memory_type,
             "turn": turn,
@@ -455,38 +586,46 @@ class Character:
 
         # Avoid duplicate exact memories if necessary, though turn makes most unique
         # For now, allow all memories to be added.
+        self._player_memory_index().add(memory_entry)
         self.memory_about_player.append(memory_entry)
 
-        MAX_MEMORIES = 30  # Increased slightly
-        if len(self.memory_about_player) > MAX_MEMORIES:
+        if len(self.memory_about_player) > MAX_PLAYER_MEMORIES:
+            self._memory_index.evict_oldest()
             self.memory_about_player.pop(0)
 
-    def get_player_memory_summary(self, current_turn: int, count: int = 7):
+    def _player_memory_index(self):
+        """The index over memory_about_player, rebuilt if the list was replaced or edited."""
+        self._memory_index.sync(self.memory_about_player)
+        return self._memory_index
+
+    def recall_player_memories(
+        self, current_turn: int, count: int = 7, query: Optional[str] = None
+    ):
+        """Up to count memories: those most relevant to query, then the most recent ones.
+
+        MEMORY_RECENT_SLOTS of the count always go to the most recent memories; with
+        no query, or nothing matching it, all of them do.
+        """
+        index = self._player_memory_index()
+        relevant = index.relevant(query, current_turn, count - MEMORY_RECENT_SLOTS)
+        chosen = {id(mem) for mem in relevant}
+        recent = [mem for mem in index.most_recent(count) if id(mem) not in chosen]
+        return relevant + recent[: count - len(relevant)]
+
+    def get_player_memory_summary(
+        self, current_turn: int, count: int = 7, query: Optional[str] = None
+    ):
+        """Describe what this character recalls about the player; query (e.g. what the
+        player just said) brings the memories that bear on it forward."""
         if not self.memory_about_player:
             return "You don't recall any specific interactions or observations about them yet."
 
-        # Sort memories by turn, most recent first, then by sentiment impact
-        # Lambda takes a memory dict and returns a tuple for sorting.
-        # Sort primarily by recency (descending), then by absolute sentiment impact (descending)
-        sorted_memories = sorted(
-            self.memory_about_player,
-            key=lambda m: (
-                m.get("turn", 0) if isinstance(m, dict) else 0,
-                abs(m.get("sentiment_impact", 0)) if isinstance(m, dict) else 0,
-            ),
-            reverse=True,
-        )
-
         summary_parts = []
-        for mem in sorted_memories[:count]:
+        for mem in self.recall_player_memories(current_turn, count, query):
             if isinstance(mem, dict):
                 turn_ago = current_turn - mem.get("turn", current_turn)
-                mem_type = mem.get("type")
-                content = mem.get("content", {})
             else:
                 turn_ago = 0
-                mem_type = None
-                content = mem
             recency_prefix = ""
             if turn_ago == 0:
                 recency_prefix = "Just now, "
@@ -497,63 +636,74 @@ class Character:
             else:
                 recency_prefix = "Some time ago, "
 
-            content_str = "details unclear"
-
-            if mem_type == "received_item":
-                item_name = content.get("item_name", "an item")
-                qty = content.get("quantity", 1)
-                content_str = f"player gave me {item_name}{f' (x{qty})' if qty > 1 else ''}"
-            elif mem_type == "gave_item_to_player":
-                item_name = content.get("item_name", "an item")
-                qty = content.get("quantity", 1)
-                content_str = f"I gave {item_name}{f' (x{qty})' if qty > 1 else ''} to the player"
-            elif mem_type == "dialogue_exchange":
-                player_stmt = content.get("player_statement", "something")
-                topic = content.get("topic_hint", "")
-                sentiment = mem.get("sentiment_impact", 0)
-                if topic:
-                    content_str = f"we talked about {topic}"
-                    if player_stmt and player_stmt != "...":
-                        content_str += f", and they said '{player_stmt[:50]}...'"
-                else:
-                    content_str = f"player said '{player_stmt[:50]}...'"
-                if sentiment > 0:
-                    content_str += " (it was a positive exchange)"
-                elif sentiment < 0:
-                    content_str += " (it was a negative exchange)"
-            elif mem_type == "player_action_observed":
-                action = content.get("action", "did something")
-                location = content.get("location")
-                target = content.get("target_item")
-                if target:
-                    action_desc = f"player {action} {target}"
-                else:
-                    action_desc = f"player {action}"
-                if location:
-                    content_str = f"{action_desc} in {location}"
-                else:
-                    content_str = action_desc
-            elif mem_type == "relationship_change":  # For direct relationship updates
-                direction = "positively" if content.get("change", 0) > 0 else "negatively"
-                reason = content.get("reason", "something they did or said")
-                content_str = f"my view of them changed {direction} because of {reason}"
-            else:  # Fallback for old string memories or unknown types
-                if isinstance(mem, str):  # Handle old format
-                    content_str = mem
-                elif (
-                    isinstance(content, dict) and "summary" in content
-                ):  # If new type has a summary
-                    content_str = content["summary"]
-                elif isinstance(content, str):  # If content is just a string
-                    content_str = content
-
-            summary_parts.append(recency_prefix + content_str)
+            summary_parts.append(recency_prefix + self._describe_player_memory(mem))
 
         if not summary_parts:
             return "You have some fleeting recollections, but nothing stands out clearly."
 
         return "Key things you recall about them: " + "; ".join(summary_parts) + "."
 
+    @staticmethod
+    def _describe_player_memory(mem):
+        if isinstance(mem, dict):
+            mem_type = mem.get("type")
+            content = mem.get("content", {})
+        else:
+            mem_type = None
+            content = mem
+
+        content_str = "details unclear"
+
+        if mem_type == "received_item":
+            item_name = content.get("item_name", "an item")
+            qty = content.get("quantity", 1)
+            content_str = f"player gave me {item_name}{f' (x{qty})' if qty > 1 else ''}"
+        elif mem_type == "gave_item_to_player":
+            item_name = content.get("item_name", "an item")
+            qty = content.get("quantity", 1)
+            content_str = f"I gave {item_name}{f' (x{qty})' if qty > 1 else ''} to the player"
+        elif mem_type == "dialogue_exchange":
+            player_stmt = content.get("player_statement", "something")
+            topic = content.get("topic_hint", "")
+            sentiment = mem.get("sentiment_impact", 0)
+            if topic:
+                content_str = f"we talked about {topic}"
+                if player_stmt and player_stmt != "...":
+                    content_str += f", and they said '{player_stmt[:50]}...'"
+            else:
+                content_str = f"player said '{player_stmt[:50]}...'"
+            if sentiment > 0:
+                content_str += " (it was a positive exchange)"
+            elif sentiment < 0:
+                content_str += " (it was a negative exchange)"
+        elif mem_type == "player_action_observed":
+            action = content.get("action", "did something")
+            location = content.get("location")
+            target = content.get("target_item")
+            if target:
+                action_desc = f"player {action} {target}"
+            else:
+                action_desc = f"player {action}"
+            if location:
+                content_str = f"{action_desc} in {location}"
+            else:
+                content_str = action_desc
+        elif mem_type == "relationship_change":  # For direct relationship updates
+            direction = "positively" if content.get("change", 0) > 0 else "negatively"
+            reason = content.get("reason", "something they did or said")
+            content_str = f"my view of them changed {direction} because of {reason}"
+        else:  # Fallback for old string memories or unknown types
+            if isinstance(mem, str):  # Handle old format
+                content_str = mem
+            elif (
+                isinstance(content, dict) and "summary" in content
+            ):  # If new type has a summary
+                content_str = content["summary"]
+            elif isinstance(content, str):  # If content is just a string
+                content_str = content
+
+        return content_str
+
     def update_relationship(
         self,
         player_dialogue: str,
@@ -602,6 +752,7 @@ class Character:
     def advance_objective_stage(self, objective_id, next_stage_id):
         obj = self.get_objective_by_id(objective_id)
         if obj and obj.get("stages"):
+            self.mark_dirty("objectives")
             current_stage_found_in_obj = False
             next_stage_obj_from_template = None
 
@@ -640,6 +791,7 @@ class Character:
     def complete_objective(self, objective_id, by_stage=False):
         obj = self.get_objective_by_id(objective_id)
         if obj and not obj.get("completed", False):
+            self.mark_dirty("objectives")
             obj["completed"] = True
             obj["active"] = False
             obj_desc = obj.get("description", "Unnamed Objective")
@@ -809,6 +961,7 @@ class Character:
     def activate_objective(self, objective_id, set_stage_id=None):
         obj = self.get_objective_by_id(objective_id)
         if obj:
+            self.mark_dirty("objectives")
             obj["active"] = True
             obj["completed"] = False
 
@@ -15,6 +15,30 @@ from .game_config import (
     apply_color_theme,
 )
 from .location_module import LOCATIONS_DATA
+from .intent_classifier import LocalIntentClassifier
+
+INTENT_COMMANDS = {"move": "move to", "take": "take", "examine": "look", "talk": "talk to"}
+
+# --- Command grammar, compiled once at import ---
+GIVE_PATTERN = re.compile(r"^(give|offer)\s+(.+?)\s+to\s+(.+)$")
+READ_PATTERN = re.compile(r"^(read|peruse)\s+(.+)$")
+USE_ON_PATTERN = re.compile(r"^(use|apply)\s+(.+?)\s+on\s+(.+)$")
+PERSUADE_PATTERN = re.compile(r"^(persuade|convince|argue with)\s+(.+?)\s+(?:that|to)\s+(.+)$")
+
+
+def _build_command_prefixes(command_synonyms):
+    """Map every command phrase to its base command; the first listing of a phrase wins."""
+    prefixes = {}
+    for base_cmd, synonyms in command_synonyms.items():
+        for phrase in [base_cmd] + synonyms:
+            prefixes.setdefault(phrase, base_cmd)
+    return prefixes
+
+
+COMMAND_PREFIXES = _build_command_prefixes(COMMAND_SYNONYMS)
+MAX_COMMAND_WORDS = max(phrase.count(" ") + 1 for phrase in COMMAND_PREFIXES)
+# Commands whose argument is a file path, kept in the casing the player typed.
+CASE_SENSITIVE_ARGUMENT_COMMANDS = {"stats"}
 
 
 class CommandHandler:
@@ -22,6 +46,7 @@ class CommandHandler:
 
     def __init__(self, game_state):
         self.game_state = game_state
+        self.intent_classifier = LocalIntentClassifier()
 
     def _canonical_command_text(self, command, argument):
         if command is None:
@@ -218,16 +243,18 @@ class CommandHandler:
         if intent_payload.get("intent") == "unknown" or intent_payload.get("confidence", 0.0) < 0.7:
             self._handle_unknown_intent()
             return None, None
-        intent = intent_payload.get("intent")
-        target = intent_payload.get("target")
-        if intent == "move":
-            return "move to", target
-        if intent == "take":
-            return "take", target
-        if intent == "examine":
-            return "look", target
-        if intent == "talk":
-            return "talk to", target
+        command = INTENT_COMMANDS.get(intent_payload.get("intent"))
+        if command:
+            return command, intent_payload.get("target")
+        self._handle_unknown_intent()
+        return None, None
+
+    def _interpret_free_text(self, raw_input):
+        local_intent = self.intent_classifier.resolve(raw_input, self._build_intent_context())
+        if local_intent:
+            return INTENT_COMMANDS[local_intent["intent"]], local_intent["target"]
+        if self.game_state.gemini_api.model:
+            return self._interpret_with_nlp(raw_input)
         self._handle_unknown_intent()
         return None, None
 
@@ -242,49 +269,41 @@ class CommandHandler:
         action = raw_input.strip().lower()
         if not action:
             return None, None
-        give_match = re.match(r"^(give|offer)\s+(.+?)\s+to\s+(.+)$", action)
+        give_match = GIVE_PATTERN.match(action)
         if give_match:
             return "use", (
                 give_match.group(2).strip(),
                 give_match.group(3).strip(),
                 "give",
             )
-        read_match = re.match(r"^(read|peruse)\s+(.+)$", action)
+        read_match = READ_PATTERN.match(action)
         if read_match:
             return "use", (read_match.group(2).strip(), None, "read")
-        use_on_match = re.match(r"^(use|apply)\s+(.+?)\s+on\s+(.+)$", action)
+        use_on_match = USE_ON_PATTERN.match(action)
         if use_on_match:
             return "use", (
                 use_on_match.group(2).strip(),
                 use_on_match.group(3).strip(),
                 "use_on",
             )
-        persuade_match = re.match(
-            r"^(persuade|convince|argue with)\s+(.+?)\s+(?:that|to)\s+(.+)$", action
-        )
+        persuade_match = PERSUADE_PATTERN.match(action)
         if persuade_match:
             return "persuade", (
                 persuade_match.group(2).strip(),
                 persuade_match.group(3).strip(),
             )
 
-        matched_command = None
-        best_match_length = 0
-        parsed_arg = None
-        for base_cmd, synonyms in COMMAND_SYNONYMS.items():
-            for cmd_to_check in [base_cmd] + synonyms:
-                if action == cmd_to_check:
-                    if len(cmd_to_check) > best_match_length:
-                        matched_command = base_cmd
-                        best_match_length = len(cmd_to_check)
-                        parsed_arg = None
-                elif action.startswith(cmd_to_check + " "):
-                    if len(cmd_to_check) > best_match_length:
-                        matched_command = base_cmd
-                        best_match_length = len(cmd_to_check)
-                        parsed_arg = action[len(cmd_to_check) :].strip()
-        if matched_command:
-            return matched_command, parsed_arg
+        # Longest command phrase that ends on a word boundary wins.
+        words = action.split(" ", MAX_COMMAND_WORDS)
+        for word_count in range(min(len(words), MAX_COMMAND_WORDS), 0, -1):
+            phrase = " ".join(words[:word_count])
+            matched_command = COMMAND_PREFIXES.get(phrase)
+            if matched_command:
+                if len(phrase) == len(action):
+                    return matched_command, None
+                if matched_command in CASE_SENSITIVE_ARGUMENT_COMMANDS:
+                    return matched_command, raw_input.strip().split(" ", word_count)[-1].strip()
+                return matched_command, action[len(phrase) :].strip()
         parts = action.split(" ", 1)
         return parts[0], parts[1] if len(parts) > 1 else None
 
@@ -524,18 +543,12 @@ class CommandHandler:
                 parsed_command, parsed_argument = self.parse_action(raw_action_input)
                 if self._is_known_command(parsed_command):
                     return parsed_command, parsed_argument
-                if self.game_state.gemini_api.model:
-                    return self._interpret_with_nlp(raw_action_input)
-                self._handle_unknown_intent()
-                return None, None
+                return self._interpret_free_text(raw_action_input)
         except ValueError:
             parsed_command, parsed_argument = self.parse_action(raw_action_input)
             if self._is_known_command(parsed_command):
                 return parsed_command, parsed_argument
-            if self.game_state.gemini_api.model:
-                return self._interpret_with_nlp(raw_action_input)
-            self._handle_unknown_intent()
-            return None, None
+            return self._interpret_free_text(raw_action_input)
         return None, None
 
     def _handle_theme_command(self, argument):
@@ -619,7 +632,7 @@ class CommandHandler:
             )
 
         regenerated_text = self.game_state.gemini_api._generate_content_with_fallback(
-            prompt, f"{mode} last AI output"
+            prompt, f"{mode} last AI output", use_cache=False, call_site=mode
         )
         if regenerated_text is None or (
             isinstance(regenerated_text, str) and regenerated_text.startswith("(OOC:")
@@ -705,6 +718,10 @@ class CommandHandler:
             self.game_state.save_game(argument)
             action_taken_this_turn = False
             show_atmospherics_this_turn = False
+        elif command == "compact":
+            self.game_state.compact_save(argument)
+            action_taken_this_turn = False
+            show_atmospherics_this_turn = False
         elif command == "load":
             if self.game_state.load_game(argument):
                 show_atmospherics_this_turn = True
@@ -771,6 +788,10 @@ class CommandHandler:
             self.game_state._handle_status_command()
             action_taken_this_turn = False
             show_atmospherics_this_turn = False
+        elif command == "stats":
+            self.game_state._handle_stats_command(argument)
+            action_taken_this_turn = False
+            show_atmospherics_this_turn = False
         elif command == "toggle_lowai":
             self.game_state.low_ai_data_mode = not self.game_state.low_ai_data_mode
             self.game_state._print_color(
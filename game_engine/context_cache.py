@@ -0,0 +1,181 @@
+# context_cache.py
+"""Explicit Gemini context caches for the stable prefix of per-NPC prompts.
+
+An NPC's persona and the standing instructions for playing them do not change
+between turns, so ContextCache registers that prefix once with
+client.caches.create() and hands back the cache name for every later call
+with the same model and prefix. Only the short per-turn suffix is then sent as
+input. Creating and renewing caches happens on a background thread: the call
+that first meets a prefix sends it inline rather than wait on the service, and
+a cache close to its expiry is renewed through client.caches.update() while
+calls keep using it. A prefix estimated below the model's minimum cacheable
+size is never offered, and one the service rejects outright is not offered
+again this session; after other failures it is retried once a TTL has passed.
+"""
+
+import hashlib
+import logging
+import math
+import queue
+import threading
+import time
+
+from .game_config import (
+    CONTEXT_CACHE_MIN_TOKENS,
+    CONTEXT_CACHE_REFRESH_MARGIN_SECONDS,
+    CONTEXT_CACHE_TTL_SECONDS,
+)
+from .prompt_templates import estimate_tokens
+from .resilience import FATAL, TERMINAL, classify_error
+
+# Wording of a create() failure the same prefix would meet again, whatever the status code.
+REFUSAL_KEYWORDS = ["too small", "minimum", "not supported"]
+
+
+def _is_refusal(error):
+    if classify_error(error) in (TERMINAL, FATAL):
+        return True
+    error_str = str(error).lower()
+    return any(keyword in error_str for keyword in REFUSAL_KEYWORDS)
+
+
+class ContextCache:
+    def __init__(
+        self,
+        ttl_seconds=CONTEXT_CACHE_TTL_SECONDS,
+        refresh_margin_seconds=CONTEXT_CACHE_REFRESH_MARGIN_SECONDS,
+        min_tokens=CONTEXT_CACHE_MIN_TOKENS,
+        clock=time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.min_tokens = min_tokens
+        self._clock = clock
+        self._lock = threading.Lock()
+        # digest -> {"name": cache name or None if refused, "expires_at": clock time}
+        self._entries = {}
+        self._pending = set()  # digests with a create or renewal queued
+        self._jobs = queue.Queue()
+        self._worker = None
+        self.created = 0
+        self.refreshed = 0
+        self.reused = 0
+        self.refused = 0
+
+    @staticmethod
+    def _digest(model_name, prefix):
+        return hashlib.sha256(f"{model_name}\0{prefix}".encode("utf-8")).hexdigest()
+
+    def _ttl(self):
+        return f"{int(self.ttl_seconds)}s"
+
+    def handle_for(self, client, model_name, prefix, display_name=None):
+        """The cache name holding prefix for model_name, or None to send the prefix inline.
+
+        Never waits on the service: a missing cache is queued for creation and this
+        call goes inline, and one close to expiry is queued for renewal and used.
+        """
+        digest = self._digest(model_name, prefix)
+        with self._lock:
+            now = self._clock()
+            entry = self._entries.get(digest)
+            if entry and now < entry["expires_at"]:
+                if entry["name"] is None:
+                    return None
+                if entry["expires_at"] - now <= self.refresh_margin_seconds:
+                    self._schedule(digest, self._refresh, client, digest)
+                self.reused += 1
+                return entry["name"]
+            if estimate_tokens(prefix) < self.min_tokens:
+                self._entries[digest] = {"name": None, "expires_at": math.inf}
+                self.refused += 1
+                return None
+            self._schedule(digest, self._create, client, model_name, prefix, display_name, digest)
+            return None
+
+    def _schedule(self, digest, job, *args):
+        # Called with the lock held.
+        if digest in self._pending:
+            return
+        self._pending.add(digest)
+        self._jobs.put((digest, job, args))
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="context-cache", daemon=True)
+            self._worker.start()
+
+    def wait_until_idle(self):
+        self._jobs.join()
+
+    def _run(self):
+        while True:
+            digest, job, args = self._jobs.get()
+            try:
+                job(*args)
+            except Exception as e:
+                logging.warning(f"Context cache job failed: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(digest)
+                self._jobs.task_done()
+
+    def _refresh(self, client, digest):
+        with self._lock:
+            entry = self._entries.get(digest)
+        if not entry or not entry["name"]:
+            return
+        try:
+            client.caches.update(name=entry["name"], config={"ttl": self._ttl()})
+        except Exception as e:
+            # The cache stays usable until it expires; the next call then creates a new one.
+            logging.info(f"Could not renew context cache {entry['name']}: {e}")
+            return
+        with self._lock:
+            entry["expires_at"] = self._clock() + self.ttl_seconds
+            self.refreshed += 1
+
+    def _create(self, client, model_name, prefix, display_name, digest):
+        try:
+            cached = client.caches.create(
+                model=model_name,
+                config={
+                    "contents": [prefix],
+                    "display_name": display_name or f"prefix-{digest[:12]}",
+                    "ttl": self._ttl(),
+                },
+            )
+            name = getattr(cached, "name", None)
+            if not isinstance(name, str) or not name:
+                raise ValueError("the service returned no cache name")
+        except Exception as e:
+            logging.info(f"Sending prompt prefix inline; context caching unavailable: {e}")
+            rejected = _is_refusal(e)
+            with self._lock:
+                self._entries[digest] = {
+                    "name": None,
+                    "expires_at": math.inf if rejected else self._clock() + self.ttl_seconds,
+                }
+                self.refused += rejected
+            return
+        with self._lock:
+            self._entries[digest] = {"name": name, "expires_at": self._clock() + self.ttl_seconds}
+            self.created += 1
+
+    def invalidate(self, name):
+        """Forget a cache a call could not use, so the next call creates a fresh one."""
+        with self._lock:
+            for digest, entry in list(self._entries.items()):
+                if entry["name"] == name:
+                    del self._entries[digest]
+
+    def release_all(self, client):
+        """Delete every cache this session created instead of waiting for them to expire."""
+        # A create still in flight would otherwise leave its cache behind.
+        self.wait_until_idle()
+        with self._lock:
+            names = [entry["name"] for entry in self._entries.values() if entry["name"]]
+            self._entries.clear()
+        for name in names:
+            try:
+                client.caches.delete(name=name)
+            except Exception as e:
+                logging.info(f"Could not delete context cache {name}: {e}")
@@ -0,0 +1,104 @@
+# conversation_session.py
+"""A Gemini chat kept open for the length of one conversation with an NPC.
+
+GeminiAPI.open_conversation() starts a chat (client.chats) whose configuration
+carries the NPC's persona prefix, so each line of dialogue sends only the
+player's words and the parts of the situation that changed since the last line,
+instead of re-describing the whole situation and re-sending recent history.
+The chat is trimmed to its last few exchanges once it grows long, so the input
+per turn stays flat, and it is dropped when the conversation ends.
+"""
+
+import logging
+
+from .game_config import CHAT_SESSION_KEPT_EXCHANGES, CHAT_SESSION_MAX_EXCHANGES
+
+# Situation fields, in the order they are reported to the model.
+STATE_LABELS = {
+    "player_name": "You are talking to",
+    "location": "Location",
+    "time_period": "Time",
+    "npc_state": "Your mood",
+    "npc_objectives": "Your objectives",
+    "player_state": "The player appears",
+    "player_items": "The player",
+    "player_objectives": "The player is pursuing",
+    "relationship": "Your relationship with the player",
+    "npc_memory": "You recall",
+    "recent_events": "Recent events",
+    "psychology": "Your psychological state (0-100)",
+    "earlier_conversation": "Earlier conversation (most recent last)",
+}
+
+
+def format_state_changes(changes):
+    lines = [f"- {label}: {changes[key]}" for key, label in STATE_LABELS.items() if key in changes]
+    return "\n".join(lines) if lines else "- Nothing has changed."
+
+
+class ConversationSession:
+    """One NPC conversation's chat; stands in for a model in GeminiAPI's generation paths."""
+
+    def __init__(
+        self,
+        open_chat,
+        npc_name,
+        cache_name=None,
+        max_exchanges=CHAT_SESSION_MAX_EXCHANGES,
+        kept_exchanges=CHAT_SESSION_KEPT_EXCHANGES,
+    ):
+        self._open_chat = open_chat
+        self.chat = open_chat(None)
+        self.npc_name = npc_name
+        self.cache_name = cache_name  # Context cache holding the persona prefix, if any.
+        self.model_name = None  # Chat replies depend on the chat, so they are never cached.
+        self.max_exchanges = max_exchanges
+        self.kept_exchanges = kept_exchanges
+        self.exchanges = 0
+        self.closed = False
+        self._reported_state = {}
+
+    def state_changes(self, state):
+        """The entries of state the chat has not been told yet."""
+        return {
+            key: value for key, value in state.items() if self._reported_state.get(key) != value
+        }
+
+    @property
+    def is_new(self):
+        return not self._reported_state
+
+    def record_exchange(self, state):
+        self._reported_state = dict(state)
+        self.exchanges += 1
+        if self.exchanges >= self.max_exchanges:
+            self._trim()
+
+    def _trim(self):
+        get_history = getattr(self.chat, "get_history", None)
+        if not callable(get_history):
+            return
+        try:
+            history = list(get_history())
+            # One exchange is a user turn and a model turn.
+            self.chat = self._open_chat(history[-2 * self.kept_exchanges :])
+        except Exception as e:
+            logging.info(f"Could not trim the chat with {self.npc_name}: {e}")
+            return
+        self.exchanges = self.kept_exchanges
+        # The situation reports may have been trimmed away; describe it in full next turn.
+        self._reported_state = {}
+
+    def generate_content(self, prompt, generation_config=None, safety_settings=None):
+        # Generation and safety settings were fixed when the chat was opened.
+        return self.chat.send_message(prompt)
+
+    def generate_content_stream(self, prompt, generation_config=None, safety_settings=None):
+        send_stream = getattr(self.chat, "send_message_stream", None)
+        if not callable(send_stream):
+            return iter([self.chat.send_message(prompt)])
+        return send_stream(prompt)
+
+    def close(self):
+        self.closed = True
+        self.chat = None
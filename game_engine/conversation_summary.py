@@ -0,0 +1,129 @@
+# conversation_summary.py
+"""Running summaries of conversation lines that fall out of a character's recent history.
+
+Character.add_to_history keeps only the last few lines verbatim. Lines it evicts
+wait as "pending" in the character's conversation_summaries until the
+ConversationSummarizer folds them into an AI-written summary in the background;
+if that never happens (low AI mode, no API key, failed calls), extractive_summary()
+folds them in by keeping the first sentence of each line. Either way, the summary
+plus the recent lines fit a fixed budget however long two characters have talked.
+"""
+
+import logging
+import queue
+import re
+import threading
+
+from .game_config import CONVERSATION_SUMMARY_MAX_CHARS
+
+# Guards every conversation_summaries entry; the summarizer's worker replaces
+# entries while the game thread is adding lines.
+SUMMARY_LOCK = threading.Lock()
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+MAX_LINE_CHARS = 120
+
+
+def condense_line(line):
+    """The first sentence of a "Speaker: text" history line, clipped to MAX_LINE_CHARS."""
+    speaker, separator, text = line.partition(": ")
+    if not separator:
+        speaker, text = "", line
+    sentence = _SENTENCE_END.split(text.strip(), maxsplit=1)[0]
+    if len(sentence) > MAX_LINE_CHARS:
+        sentence = sentence[: MAX_LINE_CHARS - 3].rstrip() + "..."
+    return f"{speaker}: {sentence}" if speaker else sentence
+
+
+def fit_summary(text, max_chars=CONVERSATION_SUMMARY_MAX_CHARS):
+    """text cut to max_chars by dropping its oldest (first) lines, then clipping the rest."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    while len(lines) > 1 and len("\n".join(lines)) > max_chars:
+        lines.pop(0)
+    fitted = "\n".join(lines)
+    if len(fitted) > max_chars:
+        fitted = "..." + fitted[-(max_chars - 3) :].lstrip()
+    return fitted
+
+
+def extractive_summary(previous_summary, lines, max_chars=CONVERSATION_SUMMARY_MAX_CHARS):
+    """The static fallback: previous_summary followed by the first sentence of each line."""
+    parts = [previous_summary] if previous_summary else []
+    parts.extend(condense_line(line) for line in lines)
+    return fit_summary("\n".join(parts), max_chars)
+
+
+class ConversationSummarizer:
+    """Fold a character's pending history lines into its running summary, off the game thread."""
+
+    def __init__(self, gemini_api):
+        self.gemini_api = gemini_api
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._worker = None
+        self.summarized = 0
+        self.failed = 0
+
+    def schedule(self, character, other_char_name, min_lines=1):
+        """Queue a summary for the pair once at least min_lines lines are pending."""
+        if len(character.get_pending_summary_lines(other_char_name)) < min_lines:
+            return
+        key = (character.name, other_char_name)
+        with self._lock:
+            if key in self._pending:
+                return
+            self._pending.add(key)
+        self._jobs.put((key, character, other_char_name))
+        self._ensure_worker()
+
+    def wait_until_idle(self):
+        self._jobs.join()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name="conversation-summary", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                self._summarize(*job)
+            finally:
+                self._jobs.task_done()
+
+    def _summarize(self, key, character, other_char_name):
+        try:
+            previous_summary, lines = character.summary_snapshot(other_char_name)
+            if not lines:
+                return
+            try:
+                with self.gemini_api.quiet_generations():
+                    text = self.gemini_api.get_conversation_summary(
+                        character.name, other_char_name, previous_summary, lines
+                    )
+            except Exception as e:
+                logging.warning(
+                    f"Summary of {character.name}'s talk with {other_char_name} failed: {e}"
+                )
+                text = None
+            if not isinstance(text, str) or not text.strip() or text.startswith("(OOC:"):
+                # The lines stay pending; extractive_summary() covers them meanwhile.
+                self.failed += 1
+                return
+            if character.apply_conversation_summary(
+                other_char_name, previous_summary, len(lines), text.strip()
+            ):
+                self.summarized += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "pending": len(self._pending),
+                "summarized": self.summarized,
+                "failed": self.failed,
+            }
@@ -0,0 +1,165 @@
+# data_bundle.py
+"""Precompiled game-data bundle: validated characters, locations and items in one pickle.
+
+build_bundle() parses and validates the JSON data once and writes
+data/game_data.bundle, stamped with a hash of the JSON sources and their sizes
+and modification times. The data loaders use the bundle instead of parsing JSON
+when the sources are unchanged, and fall back to JSON without a word when they
+have changed, or when there is no bundle. The sources are only read and hashed
+when their size or modification time differs from the stamp.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+
+from .data_paths import get_base_path
+from .atomic_write import write_bytes_atomic
+
+BUNDLE_FORMAT_VERSION = 1
+BUNDLE_RELATIVE_PATH = os.path.join("data", "game_data.bundle")
+DATA_SOURCES = {
+    "characters": os.path.join("data", "characters.json"),
+    "locations": os.path.join("data", "locations.json"),
+    "items": os.path.join("data", "items.json"),
+}
+
+_bundle = None
+_bundle_checked = False
+
+
+def find_item_data_problems(characters, locations, items, notable_items):
+    """Cross-reference items, locations and characters; returns sorted messages."""
+    problems = set()
+    for location_name, location_data in locations.items():
+        for item_info in location_data.get("items_present", []):
+            item_name = item_info.get("name")
+            if item_name and item_name not in items:
+                problems.add(f"Location '{location_name}' references unknown item '{item_name}'.")
+
+    for character_name, character_data in characters.items():
+        for item_info in character_data.get("inventory_items", []):
+            item_name = item_info.get("name")
+            if item_name and item_name not in items:
+                problems.add(
+                    f"Character '{character_name}' references unknown item '{item_name}'."
+                )
+
+    for item_name in notable_items:
+        if item_name not in items:
+            problems.add(f"Notable items list references unknown item '{item_name}'.")
+
+    for item_name, item_data in items.items():
+        hidden_location = item_data.get("hidden_in_location")
+        if hidden_location and hidden_location not in locations:
+            problems.add(
+                f"Item '{item_name}' references unknown hidden location '{hidden_location}'."
+            )
+    return sorted(problems)
+
+
+def source_hash(base_path=None):
+    """sha256 over the raw JSON sources, or None if any of them is missing."""
+    base_path = base_path or get_base_path()
+    digest = hashlib.sha256()
+    for key, relative_path in DATA_SOURCES.items():
+        try:
+            with open(os.path.join(base_path, relative_path), "rb") as f:
+                contents = f.read()
+        except OSError:
+            return None
+        digest.update(key.encode("utf-8") + b"\0" + contents + b"\0")
+    return digest.hexdigest()
+
+
+def source_stats(base_path=None):
+    """{key: [mtime_ns, size]} for the JSON sources, or None if any of them is missing."""
+    base_path = base_path or get_base_path()
+    stats = {}
+    for key, relative_path in DATA_SOURCES.items():
+        try:
+            stat = os.stat(os.path.join(base_path, relative_path))
+        except OSError:
+            return None
+        stats[key] = [stat.st_mtime_ns, stat.st_size]
+    return stats
+
+
+def build_bundle(notable_items, base_path=None, output_path=None):
+    """Parse, validate and pickle the JSON data; returns (output_path, problems).
+
+    notable_items is HIGHLY_NOTABLE_ITEMS_FOR_MEMORY, passed in so that the loader
+    does not depend on game_config, which itself loads from the bundle.
+    """
+    base_path = base_path or get_base_path()
+    output_path = output_path or os.path.join(base_path, BUNDLE_RELATIVE_PATH)
+    data = {}
+    for key, relative_path in DATA_SOURCES.items():
+        with open(os.path.join(base_path, relative_path), "r", encoding="utf-8") as f:
+            data[key] = json.load(f)
+    problems = find_item_data_problems(
+        data["characters"], data["locations"], data["items"], notable_items
+    )
+    bundle = {
+        "format": BUNDLE_FORMAT_VERSION,
+        "source_hash": source_hash(base_path),
+        "source_stats": source_stats(base_path),
+        "characters": data["characters"],
+        "locations": data["locations"],
+        "items": data["items"],
+        "notable_items": list(notable_items),
+        "item_data_problems": problems,
+    }
+    write_bytes_atomic(output_path, pickle.dumps(bundle, pickle.HIGHEST_PROTOCOL))
+    return output_path, problems
+
+
+def load_bundle(base_path=None):
+    """Return the bundle if it exists and matches the JSON sources, else None."""
+    base_path = base_path or get_base_path()
+    bundle_path = os.path.join(base_path, BUNDLE_RELATIVE_PATH)
+    if not os.path.exists(bundle_path):
+        return None
+    try:
+        with open(bundle_path, "rb") as f:
+            bundle = pickle.load(f)
+    except Exception as e:
+        logging.info(f"Ignoring unreadable data bundle {bundle_path}: {e}")
+        return None
+    if not isinstance(bundle, dict) or bundle.get("format") != BUNDLE_FORMAT_VERSION:
+        return None
+    current_stats = source_stats(base_path)
+    # Without the JSON sources (a stripped build), the bundle is the only data there is.
+    if current_stats is None or current_stats == bundle.get("source_stats"):
+        return bundle
+    # A touched but unchanged source (e.g. after a checkout) still matches by content.
+    current_hash = source_hash(base_path)
+    if current_hash is not None and current_hash != bundle.get("source_hash"):
+        logging.info(f"Data bundle {bundle_path} is stale; loading JSON instead.")
+        return None
+    return bundle
+
+
+def bundled_data(key):
+    """The bundled dict for key ("characters", "locations" or "items"), or None."""
+    global _bundle, _bundle_checked
+    if not _bundle_checked:
+        _bundle = load_bundle()
+        _bundle_checked = True
+    return _bundle[key] if _bundle else None
+
+
+def bundled_item_data_problems(characters, locations, items, notable_items):
+    """Validation done at build time, if these are exactly the bundled data; else None."""
+    if not _bundle:
+        return None
+    if (
+        characters is _bundle["characters"]
+        and locations is _bundle["locations"]
+        and items is _bundle["items"]
+        and list(notable_items) == _bundle["notable_items"]
+    ):
+        return _bundle["item_data_problems"]
+    return None
@@ -0,0 +1,28 @@
+# data_paths.py
+"""Where the game's data files live, in a source checkout or a PyInstaller build."""
+
+import logging
+import os
+import sys
+
+
+def get_base_path():
+    try:
+        base_path = sys._MEIPASS
+        logging.info(f"Using MEIPASS: {base_path}")
+    except AttributeError:
+        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        logging.info(f"Using dirname: {base_path}")
+    return base_path
+
+
+def get_data_path(relative_path):
+    p = os.path.join(get_base_path(), relative_path)
+    if not os.path.exists(p):
+        print(f"ERROR: Could not find data path explicitly at: {p}")
+        # Try to resolve relative to CWD instead as an absolute last resort
+        alt_p = os.path.join(os.getcwd(), relative_path)
+        if os.path.exists(alt_p):
+            print(f"Found it at alt_p: {alt_p}")
+            return alt_p
+    return p
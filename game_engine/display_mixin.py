@@ -1,11 +1,12 @@
 # display_mixin.py
 """Display and UI output methods for the Game class."""
 
-import re
 import random
 
 from .game_config import Colors, DEFAULT_ITEMS
 from .static_fallbacks import STATIC_ATMOSPHERIC_DETAILS
+from .streaming import StreamingTextPrinter, apply_verbosity
+from .turn_generations import PlannedGeneration, TurnGenerations
 
 
 class DisplayMixin:
@@ -34,14 +35,19 @@ class DisplayMixin:
         normalized = str(text).strip()
         if not normalized:
             return normalized
-        if self.verbosity_level == "brief":
-            sentence = re.split(r"(?<=[.!?])\s+", normalized, maxsplit=1)[0]
-            if len(sentence) > 180:
-                sentence = sentence[:177].rstrip() + "..."
-            return sentence
-        if self.verbosity_level == "standard" and len(normalized) > 550:
-            return normalized[:547].rstrip() + "..."
-        return normalized
+        # The same rule StreamingTextPrinter streams by, so finish() sees matching text.
+        return apply_verbosity(normalized, self.verbosity_level)
+
+    def _streaming_printer(self, prefix, prefix_color, text_color="", suffix="", verbosity=True):
+        """A printer for AI text streamed after prefix; verbosity=False never truncates."""
+        return StreamingTextPrinter(
+            self._print_color,
+            prefix,
+            prefix_color,
+            text_color,
+            suffix=suffix,
+            verbosity=self.verbosity_level if verbosity else None,
+        )
 
     def _print_turn_header(self):
         if not self.turn_headers_enabled:
@@ -125,43 +131,73 @@ class DisplayMixin:
         }
         self._print_color(tutorial_lines.get(step, ""), Colors.DIM)
 
-    def display_atmospheric_details(self):
-        if self.player_character and self.current_location_name:
-            details = None
-            ai_generated = False
-            if not self.low_ai_data_mode and self.gemini_api.model:
-                recently_visited = (
-                    getattr(self.world_manager, "last_visited_location", None)
-                    == self.current_location_name
-                )
-                details = self.gemini_api.get_atmospheric_details(
+    def display_atmospheric_details(self, turn=None):
+        """Describe the surroundings; with a turn, the text is generated alongside the
+        turn's other generations and shown when the turn runs."""
+        if not (self.player_character and self.current_location_name):
+            return
+        if turn is None:
+            turn = TurnGenerations(self.gemini_api)
+            self.display_atmospheric_details(turn)
+            turn.run()
+            return
+        details = None
+        generation = None
+        if not self.low_ai_data_mode and self.gemini_api.model:
+            recently_visited = (
+                getattr(self.world_manager, "last_visited_location", None)
+                == self.current_location_name
+            )
+            time_period = self.world_manager.get_current_time_period()
+            objective_focus = self._get_objectives_summary(self.player_character)
+            prefetcher = getattr(self, "atmosphere_prefetcher", None)
+            if prefetcher is not None and not recently_visited:
+                details = prefetcher.take(
                     self.player_character,
                     self.current_location_name,
-                    self.world_manager.get_current_time_period(),
+                    time_period,
                     self.last_significant_event_summary,
-                    self._get_objectives_summary(self.player_character),
-                    recently_visited,
+                    objective_focus,
+                )
+            if details is None:
+                generation = PlannedGeneration(
+                    "get_atmospheric_details",
+                    (
+                        self.player_character,
+                        self.current_location_name,
+                        time_period,
+                        self.last_significant_event_summary,
+                        objective_focus,
+                        recently_visited,
+                    ),
+                    {},
                 )
-                self.world_manager.last_visited_location = self.current_location_name
+            self.world_manager.last_visited_location = self.current_location_name
+        if generation is None:
+            turn.add(None, lambda _text: self._show_atmospheric_details(details))
+        else:
+            turn.add(generation, self._show_atmospheric_details)
 
-            if (
-                details is None
-                or (isinstance(details, str) and details.startswith("(OOC:"))
-                or self.low_ai_data_mode
-            ):
-                if STATIC_ATMOSPHERIC_DETAILS:
-                    details = random.choice(STATIC_ATMOSPHERIC_DETAILS)
-                else:
-                    details = "The atmosphere is thick with unspoken stories."  # Ultimate fallback
+    def _show_atmospheric_details(self, details):
+        ai_generated = False
+        if (
+            details is None
+            or (isinstance(details, str) and details.startswith("(OOC:"))
+            or self.low_ai_data_mode
+        ):
+            if STATIC_ATMOSPHERIC_DETAILS:
+                details = random.choice(STATIC_ATMOSPHERIC_DETAILS)
             else:
-                ai_generated = True
+                details = "The atmosphere is thick with unspoken stories."  # Ultimate fallback
+        else:
+            ai_generated = True
 
-            if details:  # Ensure details is not None if fallbacks were empty
-                final_details = self._apply_verbosity(details)
-                self._print_color(f"\n{final_details}", Colors.CYAN)
-                if ai_generated:
-                    self._remember_ai_output(final_details, "atmosphere")
-            self.last_significant_event_summary = None
+        if details:  # Ensure details is not None if fallbacks were empty
+            final_details = self._apply_verbosity(details)
+            self._print_color(f"\n{final_details}", Colors.CYAN)
+            if ai_generated:
+                self._remember_ai_output(final_details, "atmosphere")
+        self.last_significant_event_summary = None
 
     def display_objectives(self):
         self._print_color("\n--- Your Objectives ---", Colors.CYAN + Colors.BOLD)
@@ -259,11 +295,19 @@ class DisplayMixin:
                     "Save your current game progress (optional slot name).",
                 ),
                 ("load [slot]", "Load a previously saved game (optional slot name)."),
+                (
+                    "compact [slot]",
+                    "Fold a save's incremental log into one file (autosave by default).",
+                ),
                 ("help / commands", "Show this help message."),
                 (
                     "status / char / profile / st",
                     "Display your character's current status.",
                 ),
+                (
+                    "stats [file.json|file.csv]",
+                    "Show AI calls, tokens and latency per feature (optionally export them).",
+                ),
                 ("toggle lowai / lowaimode", "Toggle low AI data usage mode."),
                 ("history / /history", "Show recent commands."),
                 ("!!", "Repeat your previous command."),
@@ -349,9 +393,9 @@ class DisplayMixin:
             for _, character_name, relationship_text in relationship_entries[:3]:
                 self._print_color(f"- {character_name}: {relationship_text}", Colors.DIM)
 
-    def _display_turn_feedback(self, show_atmospherics_this_turn, command):
+    def _display_turn_feedback(self, show_atmospherics_this_turn, command, turn=None):
         if show_atmospherics_this_turn:
-            self.display_atmospheric_details()
+            self.display_atmospheric_details(turn)
         elif command == "load":
             self.last_significant_event_summary = None
 
@@ -459,6 +503,21 @@ class DisplayMixin:
             self._print_color("No significant relationships established yet.", Colors.DIM)
         self._print_color("", Colors.RESET)
 
+    def _handle_stats_command(self, export_path=None):
+        """Show per-call-site AI usage; with a .json/.csv path, also export it there."""
+        self._print_color("\n--- AI Usage This Session ---", Colors.CYAN + Colors.BOLD)
+        self._print_color(self.gemini_api.ai_metrics.format_report(), Colors.WHITE)
+        self._print_color(self.gemini_api.ai_policy.format_status(), Colors.DIM)
+        if hasattr(self, "command_handler") and hasattr(self.command_handler, "intent_classifier"):
+            self._print_color(self.command_handler.intent_classifier.format_status(), Colors.DIM)
+        if export_path:
+            try:
+                self.gemini_api.ai_metrics.export(export_path)
+            except OSError as e:
+                self._print_color(f"Could not export AI stats to {export_path}: {e}", Colors.RED)
+                return
+            self._print_color(f"AI stats exported to {export_path}.", Colors.GREEN)
+
     def _handle_inventory_command(self):
         if self.player_character:
             self._print_color("\n--- Your Inventory ---", Colors.CYAN + Colors.BOLD)
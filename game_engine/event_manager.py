@@ -7,6 +7,7 @@ from .static_fallbacks import (
     STATIC_STREET_LIFE_EVENTS,
     STATIC_NPC_NPC_INTERACTIONS,
 )
+from .turn_generations import PlannedGeneration, TurnGenerations
 
 
 class EventManager:
@@ -403,105 +404,110 @@ class EventManager:
                     return False
         return False
 
-    def attempt_npc_npc_interaction(self):
-        if len(self.game.npcs_in_current_location) >= 2:
-            try:
-                npc1, npc2 = random.sample(self.game.npcs_in_current_location, 2)
-            except ValueError:
-                return False
+    def attempt_npc_npc_interaction(self, turn=None):
+        """Plan an exchange between two NPCs here. With a turn, its text is generated
+        alongside the turn's other generations; otherwise it is played out now."""
+        if turn is None:
+            turn = TurnGenerations(self.game.gemini_api)
+            planned = self.attempt_npc_npc_interaction(turn)
+            turn.run()
+            return planned
+        if len(self.game.npcs_in_current_location) < 2:
+            return False
+        try:
+            npc1, npc2 = random.sample(self.game.npcs_in_current_location, 2)
+        except ValueError:
+            return False
 
-            self.game._print_color(
-                f"\n{Colors.MAGENTA}Nearby, you overhear a brief exchange...{Colors.RESET}",
-                Colors.MAGENTA,
+        generation = None
+        if not self.game.low_ai_data_mode and self.game.gemini_api.model:
+            generation = PlannedGeneration(
+                "get_npc_to_npc_interaction",
+                (npc1, npc2, self.game.current_location_name, self.game.get_current_time_period()),
+                {
+                    "npc1_objectives_summary": self.game._get_objectives_summary(npc1),
+                    "npc2_objectives_summary": self.game._get_objectives_summary(npc2),
+                },
             )
-            interaction_text = None
+        turn.add(generation, lambda text: self._show_npc_npc_interaction(npc1, npc2, text))
+        return True
 
-            if not self.game.low_ai_data_mode and self.game.gemini_api.model:
-                interaction_text = self.game.gemini_api.get_npc_to_npc_interaction(
-                    npc1,
-                    npc2,
-                    self.game.current_location_name,
-                    self.game.get_current_time_period(),
-                    npc1_objectives_summary=self.game._get_objectives_summary(npc1),
-                    npc2_objectives_summary=self.game._get_objectives_summary(npc2),
-                )
-
-            if (
-                interaction_text is None
-                or (isinstance(interaction_text, str) and interaction_text.startswith("(OOC:"))
-                or self.game.low_ai_data_mode
-            ):
-                if STATIC_NPC_NPC_INTERACTIONS:
-                    interaction_text = random.choice(STATIC_NPC_NPC_INTERACTIONS)
+    def _show_npc_npc_interaction(self, npc1, npc2, interaction_text):
+        self.game._print_color(
+            f"\n{Colors.MAGENTA}Nearby, you overhear a brief exchange...{Colors.RESET}",
+            Colors.MAGENTA,
+        )
+        if (
+            interaction_text is None
+            or (isinstance(interaction_text, str) and interaction_text.startswith("(OOC:"))
+            or self.game.low_ai_data_mode
+        ):
+            if STATIC_NPC_NPC_INTERACTIONS:
+                interaction_text = random.choice(STATIC_NPC_NPC_INTERACTIONS)
+            else:
+                interaction_text = f"{npc1.name} and {npc2.name} exchange a few quiet words."  # Ultimate fallback
+            # No specific color change for static here, just print it like AI would have.
+            # The (OOC:) check is handled, so it won't print that.
+
+        if interaction_text:  # Check if not None from fallback
+            # Print the interaction first
+            lines = interaction_text.split("\n")
+            for line in lines:
+                if ":" in line:
+                    speaker, dialogue = line.split(":", 1)
+                    self.game._print_color(f"{speaker.strip()}:", Colors.YELLOW, end="")
+                    print(f' "{dialogue.strip()}"')
                 else:
-                    interaction_text = f"{npc1.name} and {npc2.name} exchange a few quiet words."  # Ultimate fallback
-                # No specific color change for static here, just print it like AI would have.
-                # The (OOC:) check is handled, so it won't print that.
-
-            if interaction_text:  # Check if not None from fallback
-                # Print the interaction first
-                lines = interaction_text.split("\n")
-                for line in lines:
-                    if ":" in line:
-                        speaker, dialogue = line.split(":", 1)
-                        self.game._print_color(f"{speaker.strip()}:", Colors.YELLOW, end="")
-                        print(f' "{dialogue.strip()}"')
-                    else:
-                        self.game._print_color(f"{Colors.DIM}{line}{Colors.RESET}", Colors.DIM)
-
-                # Now, try to identify and process rumors
-                rumor_keywords = [
-                    "did you hear",
-                    "they say",
-                    "i heard that",
-                    "word is",
-                    "gossip has it",
-                    "rumor is",
-                ]
-                potential_rumor_identified = False
-                extracted_rumor_core = ""
-
-                for line in lines:  # Iterate again for rumor check
-                    for keyword in rumor_keywords:
-                        if keyword in line.lower():
-                            try:
-                                rumor_part_index = line.lower().find(keyword) + len(keyword)
-                                rumor_candidate = (
-                                    line[rumor_part_index:].strip(" .,;:!?-").capitalize()
-                                )
-                                if len(rumor_candidate) > 15:
-                                    extracted_rumor_core = rumor_candidate
-                                    potential_rumor_identified = True
-                                    break
-                            except Exception:
-                                pass
-                    if potential_rumor_identified:
-                        break
-
-                if potential_rumor_identified and extracted_rumor_core:
-                    if not hasattr(self.game, "overheard_rumors"):
-                        self.game.overheard_rumors = []
-
-                    MAX_OVERHEARD_RUMORS = 10
-                    if len(self.game.overheard_rumors) >= MAX_OVERHEARD_RUMORS:
-                        self.game.overheard_rumors.pop(0)
-
-                    rumor_to_add = f'Overheard between {npc1.name} and {npc2.name}: "{extracted_rumor_core[:150]}..."'
-                    if rumor_to_add not in self.game.overheard_rumors:
-                        self.game.overheard_rumors.append(rumor_to_add)
+                    self.game._print_color(f"{Colors.DIM}{line}{Colors.RESET}", Colors.DIM)
+
+            # Now, try to identify and process rumors
+            rumor_keywords = [
+                "did you hear",
+                "they say",
+                "i heard that",
+                "word is",
+                "gossip has it",
+                "rumor is",
+            ]
+            potential_rumor_identified = False
+            extracted_rumor_core = ""
+
+            for line in lines:  # Iterate again for rumor check
+                for keyword in rumor_keywords:
+                    if keyword in line.lower():
+                        try:
+                            rumor_part_index = line.lower().find(keyword) + len(keyword)
+                            rumor_candidate = (
+                                line[rumor_part_index:].strip(" .,;:!?-").capitalize()
+                            )
+                            if len(rumor_candidate) > 15:
+                                extracted_rumor_core = rumor_candidate
+                                potential_rumor_identified = True
+                                break
+                        except Exception:
+                            pass
+                if potential_rumor_identified:
+                    break
+
+            if potential_rumor_identified and extracted_rumor_core:
+                if not hasattr(self.game, "overheard_rumors"):
+                    self.game.overheard_rumors = []
+
+                MAX_OVERHEARD_RUMORS = 10
+                if len(self.game.overheard_rumors) >= MAX_OVERHEARD_RUMORS:
+                    self.game.overheard_rumors.pop(0)
+
+                rumor_to_add = f'Overheard between {npc1.name} and {npc2.name}: "{extracted_rumor_core[:150]}..."'
+                if rumor_to_add not in self.game.overheard_rumors:
+                    self.game.overheard_rumors.append(rumor_to_add)
 
-                    self.game._print_color(
-                        f"\n{Colors.MAGENTA}(You overhear an intriguing snippet of gossip...){Colors.RESET}",
-                        Colors.MAGENTA,
+                self.game._print_color(
+                    f"\n{Colors.MAGENTA}(You overhear an intriguing snippet of gossip...){Colors.RESET}",
+                    Colors.MAGENTA,
+                )
+                if self.game.player_character:
+                    self.game.player_character.add_journal_entry(
+                        "Gossip Overheard",
+                        extracted_rumor_core,
+                        self.game._get_current_game_time_period_str(),
                     )
-                    if self.game.player_character:
-                        self.game.player_character.add_journal_entry(
-                            "Gossip Overheard",
-                            extracted_rumor_core,
-                            self.game._get_current_game_time_period_str(),
-                        )
-
-                return True  # Interaction happened (and was printed)
-            # self.game._print_color(f"{Colors.MAGENTA}...but it trails off into indistinct murmurs.{Colors.RESET}", Colors.MAGENTA)
-            return False
-        return False
@@ -1,30 +1,8 @@
 # game_config.py
 import json
 import logging
-import sys
-import os
 
-
-def get_base_path():
-    try:
-        base_path = sys._MEIPASS
-        logging.info(f"Using MEIPASS: {base_path}")
-    except AttributeError:
-        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-        logging.info(f"Using dirname: {base_path}")
-    return base_path
-
-
-def get_data_path(relative_path):
-    p = os.path.join(get_base_path(), relative_path)
-    if not os.path.exists(p):
-        print(f"ERROR: Could not find data path explicitly at: {p}")
-        # Try to resolve relative to CWD instead as an absolute last resort
-        alt_p = os.path.join(os.getcwd(), relative_path)
-        if os.path.exists(alt_p):
-            print(f"Found it at alt_p: {alt_p}")
-            return alt_p
-    return p
+from .data_paths import get_base_path, get_data_path  # noqa: F401
 
 
 # --- ANSI Color Codes ---
@@ -103,6 +81,52 @@ apply_color_theme(DEFAULT_COLOR_THEME)
 
 # --- Save Game File ---
 SAVE_GAME_FILE = "savegame.json"
+AUTOSAVE_SLOT = "autosave"
+SAVE_CHECKPOINT_INTERVAL = 20  # Autosave deltas appended before the next full checkpoint
+# "json" writes the legacy pretty-printed format; "json+zlib" needs only the standard
+# library; "msgpack", "msgpack+zlib" and "+zstd" variants need msgpack / zstandard.
+SAVE_CODEC = "json+zlib"
+
+# --- Adaptive AI Budget ---
+# Flavor-text call sites that fall back to static text while the API is slow, failing,
+# or the session has spent its token budget. Dialogue is never downgraded.
+LOW_PRIORITY_AI_CALL_SITES = (
+    "rumor_or_gossip",
+    "atmospheric_details",
+    "street_life_event_description",
+    "enhanced_observation",
+)
+AI_LATENCY_P95_BUDGET_SECONDS = 3.0
+AI_ERROR_RATE_BUDGET = 0.25
+AI_SESSION_TOKEN_BUDGET = 250_000
+AI_HEALTH_WINDOW_SECONDS = 120  # Only calls this recent count toward latency and errors
+
+# --- AI Call Resilience ---
+AI_RETRY_MAX_ATTEMPTS = 3  # Attempts per call for rate limits, overload and timeouts
+AI_RETRY_BASE_DELAY_SECONDS = 0.5
+AI_RETRY_MAX_DELAY_SECONDS = 4.0
+AI_CALL_DEADLINE_SECONDS = 12.0  # No retry starts that would end past this
+AI_CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failed calls before AI calls pause
+AI_CIRCUIT_COOLDOWN_SECONDS = 30.0
+
+# --- Gemini Context Caching ---
+CONTEXT_CACHE_TTL_SECONDS = 900  # Lifetime of a cached NPC prompt prefix, renewed while in use
+CONTEXT_CACHE_REFRESH_MARGIN_SECONDS = 120  # Renew a cache this close to its expiry
+CONTEXT_CACHE_MIN_TOKENS = 1024  # Gemini refuses to cache less; shorter prefixes go inline
+CHAT_SESSION_MAX_EXCHANGES = 12  # A conversation's chat is trimmed after this many exchanges
+CHAT_SESSION_KEPT_EXCHANGES = 4  # Most recent exchanges a trimmed chat keeps
+
+# --- Conversation History ---
+CONVERSATION_HISTORY_MAX_LINES = 10  # Verbatim lines kept per conversation partner
+CONVERSATION_SUMMARY_MAX_CHARS = 600  # Budget of the running summary of older lines
+CONVERSATION_SUMMARY_MAX_PENDING_LINES = 8  # Older lines held for the AI before folding them in
+CONVERSATION_SUMMARY_BATCH_LINES = 4  # Older lines that justify an AI summary mid-conversation
+
+# --- NPC Memories of the Player ---
+MAX_PLAYER_MEMORIES = 2000  # Memories an NPC keeps about the player; the oldest are forgotten
+MEMORY_RECENT_SLOTS = 2  # Memories in each summary chosen for recency, whatever the player says
+MEMORY_RECENCY_HALF_LIFE_TURNS = 240  # Game turns (a day) over which a memory's weight halves
+MEMORY_RECENCY_FLOOR = 0.2  # Weight an old but relevant memory never decays below
 
 # --- Gameplay Constants ---
 DREAM_CHANCE_NORMAL_STATE = 0.05  # Chance of dream on new day if normal state
@@ -167,8 +191,13 @@ MAX_TIME_UNITS_PER_DAY = 240
 
 # --- Default Item Definitions ---
 def load_default_items(data_path=None):
-    """Loads default item data from a JSON file."""
+    """Loads default item data from the data bundle if it is current, else from JSON."""
     if data_path is None:
+        from .data_bundle import bundled_data
+
+        bundled_items = bundled_data("items")
+        if bundled_items is not None:
+            return bundled_items
         data_path = get_data_path("data/items.json")
     try:
         with open(data_path, "r", encoding="utf-8") as f:
@@ -184,12 +213,17 @@ def load_default_items(data_path=None):
 _DEFAULT_ITEMS = None
 
 
-def __getattr__(name):
+def get_default_items():
+    """DEFAULT_ITEMS, loaded on first use and then kept for the process."""
     global _DEFAULT_ITEMS
+    if _DEFAULT_ITEMS is None:
+        _DEFAULT_ITEMS = load_default_items()
+    return _DEFAULT_ITEMS
+
+
+def __getattr__(name):
     if name == "DEFAULT_ITEMS":
-        if _DEFAULT_ITEMS is None:
-            _DEFAULT_ITEMS = load_default_items()
-        return _DEFAULT_ITEMS
+        return get_default_items()
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
@@ -210,9 +244,11 @@ COMMAND_SYNONYMS = {
     "help": ["commands", "actions"],
     "save": ["save game"],
     "load": ["load game"],
+    "compact": ["compact save", "compact saves"],
     "quit": ["exit", "q"],
     "persuade": ["convince", "argue with"],  # New command
     "status": ["char", "character", "profile", "st"],
+    "stats": ["ai stats", "api stats"],
     "toggle_lowai": ["toggle lowai", "lowaimode"],
     "history": ["/history", "hist"],
     "theme": ["set theme", "color theme"],
@@ -1,12 +1,14 @@
 # game_state.py
-import json
 import os
 import re
 import random
 from typing import Set, Optional, List, Dict, Any, Tuple
 
 from .game_config import (
+    AUTOSAVE_SLOT,
     Colors,
+    SAVE_CHECKPOINT_INTERVAL,
+    SAVE_CODEC,
     SAVE_GAME_FILE,  # API_CONFIG_FILE, GEMINI_MODEL_NAME removed
     TIME_UNITS_PER_PLAYER_ACTION,
     apply_color_theme,
@@ -17,8 +19,20 @@ from .game_config import (
 from .static_fallbacks import STATIC_PLAYER_REFLECTIONS
 from .character_module import Character, CHARACTERS_DATA
 from .location_module import LOCATIONS_DATA
-from .gemini_interactions import GeminiAPI, NaturalLanguageParser
+from .gemini_interactions import AI_METRICS_FILE_ENV_VAR, GeminiAPI, NaturalLanguageParser
 from .event_manager import EventManager
+from .prefetcher import AtmospherePrefetcher
+from .conversation_summary import ConversationSummarizer
+from .save_codec import load_save
+from .save_log import (
+    CHARACTER_STATES_KEY,
+    delta_log_path,
+    new_checkpoint_id,
+    replay_delta_log,
+    write_checkpoint,
+)
+from .save_writer import SaveWriter
+from .turn_generations import TurnGenerations
 from .display_mixin import DisplayMixin
 from .command_handler import CommandHandler
 from .item_interaction_handler import ItemInteractionHandler
@@ -39,6 +53,13 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
         self.gemini_api = GeminiAPI()
         self.nl_parser = NaturalLanguageParser(self.gemini_api)
         self.event_manager = EventManager(self)
+        self.atmosphere_prefetcher = AtmospherePrefetcher(self.gemini_api)
+        self.conversation_summarizer = ConversationSummarizer(self.gemini_api)
+        self.save_codec = SAVE_CODEC
+        self.save_writer = SaveWriter(write=self._write_checkpoint_file)
+        self.save_checkpoint_interval = SAVE_CHECKPOINT_INTERVAL
+        # The save file whose delta log autosaves are currently extending.
+        self.delta_log_state = {"path": None, "checkpoint_id": None, "deltas": 0}
         # self.game_config = __import__('game_config') # Removed
 
         self.game_time = 0
@@ -170,16 +191,88 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
             "turn_headers_enabled": self.turn_headers_enabled,
             "command_history": self.command_history[-self.max_command_history :],
         }
+        if is_autosave:
+            # Serialization and disk I/O happen on the writer thread; the turn only pays for a copy.
+            self._report_background_save_errors()
+            try:
+                self._submit_autosave(save_file, game_state_data)
+                self._print_color(f"Autosaving to {save_file}", Colors.DIM)
+            except Exception as e:
+                self._print_color(f"Error saving game: {e}", Colors.RED)
+            return
+        self.save_writer.flush()
         try:
-            with open(save_file, "w", encoding="utf-8") as f:
-                json.dump(game_state_data, f, indent=4)
-            if is_autosave:
-                self._print_color(f"Autosaved to {save_file}", Colors.DIM)
-            else:
-                self._print_color(f"Game saved to {save_file}", Colors.GREEN)
+            write_checkpoint(save_file, game_state_data, self.save_codec)
+            if self.delta_log_state["path"] == save_file:
+                self._reset_delta_log_state()
+            self._print_color(f"Game saved to {save_file}", Colors.GREEN)
         except Exception as e:
             self._print_color(f"Error saving game: {e}", Colors.RED)
 
+    def _submit_autosave(self, save_file: str, game_state_data: Dict[str, Any]) -> None:
+        """Append what changed to save_file's delta log, or start a new full checkpoint."""
+        log_state = self.delta_log_state
+        if log_state["path"] == save_file and log_state["deltas"] < self.save_checkpoint_interval:
+            delta = dict(game_state_data)
+            delta["checkpoint_id"] = log_state["checkpoint_id"]
+            delta[CHARACTER_STATES_KEY] = {
+                name: char.to_delta_dict() for name, char in self.all_character_objects.items()
+            }
+            self.save_writer.submit_delta(save_file, delta)
+            log_state["deltas"] += 1
+            return
+        checkpoint_id = new_checkpoint_id()
+        game_state_data["checkpoint_id"] = checkpoint_id
+        for char in self.all_character_objects.values():
+            char.clear_dirty_fields()
+        self.save_writer.submit(save_file, game_state_data)
+        self.delta_log_state = {"path": save_file, "checkpoint_id": checkpoint_id, "deltas": 0}
+
+    def _write_checkpoint_file(self, save_file: str, game_state_data: Dict[str, Any]) -> None:
+        write_checkpoint(save_file, game_state_data, self.save_codec)
+
+    def _reset_delta_log_state(self) -> None:
+        self.delta_log_state = {"path": None, "checkpoint_id": None, "deltas": 0}
+
+    def _report_background_save_errors(self) -> None:
+        errors = self.save_writer.pop_errors()
+        for save_file, error in errors:
+            self._print_color(f"Error autosaving to {save_file}: {error}", Colors.RED)
+        if errors:
+            # A lost delta would break the log, so the next autosave starts a fresh checkpoint.
+            self._reset_delta_log_state()
+
+    def compact_save(self, slot_name: Optional[str] = None) -> bool:
+        """Fold a save's delta log into a single new checkpoint (the autosave by default)."""
+        save_file = self._get_save_file_path(slot_name or AUTOSAVE_SLOT)
+        if not save_file:
+            self._print_color(
+                "Invalid save slot name. Use letters, numbers, hyphens, or underscores.",
+                Colors.RED,
+            )
+            return False
+        self.save_writer.flush()
+        if not os.path.exists(save_file):
+            self._print_color(f"No save file found at {save_file}.", Colors.YELLOW)
+            return False
+        if not os.path.exists(delta_log_path(save_file)):
+            self._print_color(f"{save_file} has no delta log to compact.", Colors.DIM)
+            return False
+        try:
+            with open(save_file, "rb") as f:
+                game_state_data = load_save(f)
+            game_state_data, replayed_deltas = replay_delta_log(save_file, game_state_data)
+            checkpoint_id = new_checkpoint_id()
+            game_state_data["checkpoint_id"] = checkpoint_id
+            write_checkpoint(save_file, game_state_data, self.save_codec)
+        except Exception as e:
+            self._print_color(f"Error compacting save: {e}", Colors.RED)
+            return False
+        if self.delta_log_state["path"] == save_file:
+            self.delta_log_state = {"path": save_file, "checkpoint_id": checkpoint_id, "deltas": 0}
+        self._print_color(f"Compacted {replayed_deltas} delta(s) into {save_file}.", Colors.GREEN)
+        return True
+
     def load_game(self, slot_name: Optional[str] = None) -> bool:
         save_file = self._get_save_file_path(slot_name)
         if not save_file:
@@ -188,12 +281,14 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
                 Colors.RED,
             )
             return False
+        self.save_writer.flush()
         if not os.path.exists(save_file):
             self._print_color(f"No save file found at {save_file}.", Colors.YELLOW)
             return False
         try:
-            with open(save_file, "r", encoding="utf-8") as f:
-                game_state_data = json.load(f)
+            with open(save_file, "rb") as f:
+                game_state_data = load_save(f)
+            game_state_data, replayed_deltas = replay_delta_log(save_file, game_state_data)
             self.game_time = game_state_data.get("game_time", 0)
             self.current_day = game_state_data.get("current_day", 1)
             self.current_location_name = game_state_data.get("current_location_name")
@@ -264,6 +359,18 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
             if not self.dynamic_location_items:
                 self.world_manager.initialize_dynamic_location_items()
             self.world_manager.update_npcs_in_current_location()
+            checkpoint_id = game_state_data.get("checkpoint_id")
+            if checkpoint_id:
+                # The file now matches memory, so later autosaves keep extending its log.
+                for char in self.all_character_objects.values():
+                    char.clear_dirty_fields()
+                self.delta_log_state = {
+                    "path": save_file,
+                    "checkpoint_id": checkpoint_id,
+                    "deltas": replayed_deltas,
+                }
+            else:
+                self._reset_delta_log_state()
             self._print_color("Game loaded successfully.", Colors.GREEN)
             self._display_load_recap()
             self.world_manager.update_current_location_details(from_explicit_look_cmd=False)
@@ -348,6 +455,7 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
             self._print_turn_header()
             self._display_tutorial_hint()
             self.world_manager._handle_ambient_rumors()
+            self.world_manager.prefetch_adjacent_atmospherics()
             command, argument = self.command_handler._get_player_input()
             if command is None and argument is None:
                 continue
@@ -361,13 +469,21 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
             if special_flag:
                 self.last_turn_result_icon = "QUIT"
                 break
-            self.world_manager._update_world_state_after_action(command, action_taken, time_units)
-            self._display_turn_feedback(show_atmospherics, command)
+            # This turn's NPC exchange and atmospherics, and the rumor rolled for the next
+            # turn header, are generated together and shown in their usual places.
+            turn = TurnGenerations(self.gemini_api)
+            self.world_manager._update_world_state_after_action(
+                command, action_taken, time_units, turn
+            )
+            self._display_turn_feedback(show_atmospherics, command, turn)
+            self.world_manager.planned_rumors = self.world_manager.plan_ambient_rumor(turn)
+            turn.run()
             if action_taken:
                 self.last_turn_result_icon = "OK"
             elif command in [
                 "help",
                 "status",
+                "stats",
                 "history",
                 "theme",
                 "verbosity",
@@ -376,6 +492,7 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
                 "rephrase",
                 "save",
                 "load",
+                "compact",
                 "toggle_lowai",
             ]:
                 self.last_turn_result_icon = "INFO"
@@ -383,6 +500,18 @@ class Game(DisplayMixin, ItemInteractionHandler, NPCInteractionHandler):
                 self.last_turn_result_icon = "NOOP"
             if self.world_manager._check_game_ending_conditions():
                 break
+        self.save_writer.flush()
+        self._export_ai_metrics()
+        self.gemini_api.release_context_caches()
+
+    def _export_ai_metrics(self) -> None:
+        export_path = os.getenv(AI_METRICS_FILE_ENV_VAR)
+        if not export_path:
+            return
+        try:
+            self.gemini_api.ai_metrics.export(export_path)
+        except OSError as e:
+            self._print_color(f"Could not export AI stats to {export_path}: {e}", Colors.RED)
 
     def _handle_think_command(self) -> None:
         if not self.player_character:
@@ -1,19 +1,86 @@
 # gemini_interactions.py
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import inspect
 import os
 import json
 import importlib
 import importlib.util
+import itertools
+import logging
 import re
 import sys
 import threading
+import time
 from types import SimpleNamespace
 
-from .game_config import Colors, SPINNER_FRAMES
+from .ai_budget import AdaptiveAIPolicy
+from .ai_metrics import AICallMetrics, usage_token_counts
+from .atomic_write import write_json_atomic
+from .context_cache import ContextCache
+from .conversation_session import ConversationSession, format_state_changes
+from .game_config import CONVERSATION_SUMMARY_MAX_CHARS, Colors, SPINNER_FRAMES
+from .resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    call_with_retries,
+    call_with_retries_async,
+    is_auth_error,
+)
+from . import prompt_templates
+from .response_cache import ResponseCache, normalize_prompt
+from .streaming import JsonFieldStreamer
+
+# Quiet mode for generations gathered on the shared event loop, which serves every caller.
+_QUIET_TASKS = contextvars.ContextVar("quiet_generation_tasks", default=False)
 
 # --- Self-contained API Configuration Constants ---
 API_CONFIG_FILE = "gemini_config.json"
 GEMINI_API_KEY_ENV_VAR = "GEMINI_API_KEY"
 DEFAULT_GEMINI_MODEL_NAME = "gemini-3-flash-preview"
+# Point this at a file to keep generated text cached across restarts.
+RESPONSE_CACHE_FILE_ENV_VAR = "GEMINI_RESPONSE_CACHE_FILE"
+# Point this at a .json or .csv file to export per-call-site AI metrics at exit.
+AI_METRICS_FILE_ENV_VAR = "GEMINI_METRICS_FILE"
+INTENT_CACHE_MAX_ENTRIES = 128
+# Successful key checks are remembered (as a hash) next to API_CONFIG_FILE, so
+# launches within the TTL skip the test call; set the TTL to 0 to always verify.
+VERIFICATION_CACHE_FILE = "gemini_verification.json"
+VERIFICATION_TTL_ENV_VAR = "GEMINI_VERIFICATION_TTL_HOURS"
+DEFAULT_VERIFICATION_TTL_HOURS = 24
+
+CONTENT_SAFETY_SETTINGS = [
+    {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_SEXUALLY_EXPLICIT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+    {"category": "HARM_CATEGORY_DANGEROUS_CONTENT", "threshold": "BLOCK_MEDIUM_AND_ABOVE"},
+]
+
+# JSON mode: the model must answer with an object matching the schema, so the reply
+# parses in one json.loads pass. response_text comes first so it can be streamed.
+NPC_RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "response_text": {"type": "STRING"},
+        "stat_changes": {
+            "type": "OBJECT",
+            "properties": {
+                "suspicion": {"type": "INTEGER"},
+                "fear": {"type": "INTEGER"},
+                "respect": {"type": "INTEGER"},
+            },
+        },
+    },
+    "required": ["response_text", "stat_changes"],
+    "property_ordering": ["response_text", "stat_changes"],
+}
+NPC_RESPONSE_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": NPC_RESPONSE_SCHEMA,
+}
 
 
 class NaturalLanguageParser:
@@ -24,9 +91,22 @@ class NaturalLanguageParser:
         "target": "string",
         "confidence": "float (0-1)",
     }
+    RESPONSE_SCHEMA = {
+        "type": "OBJECT",
+        "properties": {
+            "intent": {"type": "STRING", "enum": INTENT_SCHEMA["intent"]},
+            "target": {"type": "STRING"},
+            "confidence": {"type": "NUMBER"},
+        },
+        "required": ["intent", "target", "confidence"],
+    }
 
     def __init__(self, gemini_api):
         self.gemini_api = gemini_api
+        # Classifications only hold for the scene they were made in, so the cache is
+        # cleared whenever the scene fingerprint changes rather than aged out.
+        self.intent_cache = ResponseCache(max_entries=INTENT_CACHE_MAX_ENTRIES, ttl_seconds=None)
+        self._scene_fingerprint = None
 
     def _contains_unsafe_request(self, input_text):
         lowered = input_text.lower()
@@ -51,6 +131,24 @@ class NaturalLanguageParser:
         except Exception:
             return self.gemini_api.model
 
+    @staticmethod
+    def scene_fingerprint(current_context):
+        """Order-independent digest of the exits, items, NPCs and inventory in view."""
+        exits = sorted(
+            (exit_info.get("name", ""), exit_info.get("description", ""))
+            for exit_info in current_context.get("exits", [])
+        )
+        scene = {
+            "exits": exits,
+            "items": sorted(current_context.get("items", [])),
+            "npcs": sorted(current_context.get("npcs", [])),
+            "inventory": sorted(current_context.get("inventory", [])),
+        }
+        return ResponseCache.make_key("scene", json.dumps(scene, sort_keys=True))
+
+    def intent_cache_stats(self):
+        return self.intent_cache.stats()
+
     def parse_player_intent(self, input_text, current_context):
         default_response = {"intent": "unknown", "target": "", "confidence": 0.0}
         if not input_text or not input_text.strip():
@@ -60,6 +158,15 @@ class NaturalLanguageParser:
         if not self.gemini_api.model:
             return default_response
 
+        fingerprint = self.scene_fingerprint(current_context)
+        if fingerprint != self._scene_fingerprint:
+            self.intent_cache.clear()
+            self._scene_fingerprint = fingerprint
+        cache_key = ResponseCache.make_key(fingerprint, normalize_prompt(input_text).lower())
+        cached_intent = self.intent_cache.get(cache_key)
+        if cached_intent is not None:
+            return dict(cached_intent)
+
         exits = current_context.get("exits", [])
         items = current_context.get("items", [])
         npcs = current_context.get("npcs", [])
@@ -77,48 +184,54 @@ class NaturalLanguageParser:
         schema = json.dumps(self.INTENT_SCHEMA, ensure_ascii=False)
         sanitized_input = input_text.replace('"', '\\"')
 
-        prompt = (
-            "You are an intent classifier for a text adventure game. "
-            "Map the player's input to a JSON object following the schema exactly. "
-            "Only choose targets from the provided lists. "
-            "If the player expresses a refusal, negation, or the target is not available, return intent 'unknown'. "
-            "If the input requests unsafe or disallowed actions, return intent 'unknown'. "
-            "Return JSON only, no markdown or code fences.\n"
-            f"Schema: {schema}\n"
-            f"Available exits: {exits_text}\n"
-            f"Available items in room: {items_text}\n"
-            f"Available NPCs: {npcs_text}\n"
-            f"Player inventory: {inventory_text}\n"
-            f'Player input: "{sanitized_input}"\n'
+        prompt = prompt_templates.render(
+            "intent_classification",
+            schema=schema,
+            exits=exits_text,
+            items=items_text,
+            npcs=npcs_text,
+            inventory=inventory_text,
+            player_input=sanitized_input,
         )
 
         model = self._select_intent_model()
-        spinner_stop = threading.Event()
-        spinner_thread = threading.Thread(
-            target=self.gemini_api._run_spinner,
-            args=(spinner_stop,),
-            daemon=True,
-        )
-        spinner_thread.start()
-        try:
-            response = model.generate_content(
-                prompt,
-                generation_config={
-                    "candidate_count": 1,
-                    "max_output_tokens": 120,
-                    "temperature": 0.1,
-                },
-            )
-        except Exception:
-            return default_response
-        finally:
-            spinner_stop.set()
-            spinner_thread.join()
-            sys.stdout.write("\r" + " " * 60 + "\r")
-            sys.stdout.flush()
+        started = time.perf_counter()
+        with self.gemini_api._thinking_indicator():
+            try:
+                response = call_with_retries(
+                    lambda timeout: model.generate_content(
+                        prompt,
+                        generation_config=self.gemini_api._with_request_timeout(
+                            {
+                                "candidate_count": 1,
+                                "max_output_tokens": 120,
+                                "temperature": 0.1,
+                                "response_mime_type": "application/json",
+                                "response_schema": self.RESPONSE_SCHEMA,
+                            },
+                            timeout,
+                        ),
+                    ),
+                    self.gemini_api.retry_policy,
+                    self.gemini_api.circuit_breaker,
+                )
+            except CircuitOpenError:
+                # Nothing was asked of the model, so this is not one of its errors.
+                self.gemini_api._record_ai_call("intent_classification", prompt, None, "skipped")
+                return default_response
+            except Exception:
+                self.gemini_api._record_ai_call("intent_classification", prompt, started, "error")
+                return default_response
 
         raw_text = response.text.strip() if hasattr(response, "text") and response.text else ""
-        payload = self.gemini_api._extract_json_payload(raw_text)
+        payload = self.gemini_api._parse_json_reply(raw_text, "intent_classification")
+        self.gemini_api._record_ai_call(
+            "intent_classification",
+            prompt,
+            started,
+            "ok" if isinstance(payload, dict) else "fallback",
+            response,
+        )
         if not isinstance(payload, dict):
             return default_response
 
@@ -134,26 +247,100 @@ class NaturalLanguageParser:
         except (TypeError, ValueError):
             confidence = 0.0
         confidence = max(0.0, min(1.0, confidence))
-        return {"intent": intent, "target": target.strip(), "confidence": confidence}
+        result = {"intent": intent, "target": target.strip(), "confidence": confidence}
+        self.intent_cache.put(cache_key, result)
+        return dict(result)
+
+
+def _running_under_tests():
+    return "unittest" in sys.modules or "pytest" in sys.modules
+
+
+def genai_installed():
+    """True if google.genai can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec("google.genai") is not None
+    except ModuleNotFoundError:  # No `google` namespace package at all.
+        return False
 
 
 class GeminiAPI:
     def __init__(self):
+        # Key verification may still be running on a background thread; reading
+        # `model` waits for it, so the first AI call is the only one that can block.
+        self._setup_thread = None
+        self._setup_lock = threading.Lock()
+        self._setup_outcome = None
         self.model = None
         self.client = None
         self.genai = None
         self._genai_warning_shown = False
+        self._genai_import_thread = None
+        self._imported_genai = None
+        self._genai_import_error = None
+        # Digest of the key/model pair whose cached verification is in use, if any.
+        self._verification_digest = None
         self.chosen_model_name = DEFAULT_GEMINI_MODEL_NAME  # Initialize with default
         self._print_color_func = lambda text, color, end="\n": print(
             f"{color}{text}{Colors.RESET}", end=end
         )
         self._input_color_func = lambda prompt, color: input(f"{color}{prompt}{Colors.RESET}")
+        self.response_cache = ResponseCache()
+        self.ai_metrics = AICallMetrics()
+        self.ai_policy = AdaptiveAIPolicy()
+        self.retry_policy = RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.context_cache = ContextCache()
+        # Concurrent generations share one spinner; the depth counts how many are in flight.
+        self._spinner_lock = threading.Lock()
+        self._spinner_depth = 0
+        self._spinner_stop = None
+        self._spinner_thread = None
+        self._quiet_state = threading.local()
+        self._async_loop_lock = threading.Lock()
+        self._event_loop = None
+
+    @property
+    def model(self):
+        if self._setup_thread is not None:
+            self._finish_background_setup()
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        self._model = value
+
+    def _warn_genai_missing(self):
+        if not self._genai_warning_shown:
+            self._log_message(
+                "Gemini API library not installed. Running with placeholder responses.",
+                Colors.YELLOW,
+            )
+            self._genai_warning_shown = True
+
+    def _import_genai(self):
+        try:
+            self._imported_genai = importlib.import_module("google.genai")
+        except Exception as e:
+            self._genai_import_error = e
+
+    def _start_genai_import(self):
+        """Begin importing google.genai on a background thread; False if it is not installed."""
+        if self.genai or self._genai_import_thread is not None or _running_under_tests():
+            return self._load_genai()
+        if not genai_installed():
+            self._warn_genai_missing()
+            return False
+        self._genai_import_thread = threading.Thread(
+            target=self._import_genai, name="genai-import", daemon=True
+        )
+        self._genai_import_thread.start()
+        return True
 
     def _load_genai(self):
         if self.genai:
             return True
-        os.environ["PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION"] = "python"
-        if "unittest" in sys.modules or "pytest" in sys.modules:
+        if _running_under_tests():
             self.genai = SimpleNamespace(
                 Client=lambda **kwargs: SimpleNamespace(
                     models=SimpleNamespace(
@@ -162,24 +349,93 @@ class GeminiAPI:
                 )
             )
             return True
-        spec = importlib.util.find_spec("google.genai")
-        if spec is None:
+        if self._genai_import_thread is None and not self._start_genai_import():
+            return False
+        self._genai_import_thread.join()
+        if self._genai_import_error is not None:
             if not self._genai_warning_shown:
                 self._log_message(
-                    "Gemini API library not installed. Running with placeholder responses.",
+                    f"Gemini API library failed to import ({self._genai_import_error}). Running with placeholder responses.",
                     Colors.YELLOW,
                 )
                 self._genai_warning_shown = True
             return False
-        self.genai = importlib.import_module("google.genai")
+        self.genai = self._imported_genai
+        return True
+
+    def _setup_message(self, text, color):
+        """Print a setup message, or hold it back while verifying on the background thread."""
+        held_messages = getattr(self._quiet_state, "setup_messages", None)
+        if held_messages is not None:
+            held_messages.append((text, color))
+        else:
+            self._print_color_func(text, color)
+
+    def _run_background_setup(
+        self, api_key, source, model_to_use, on_failure, use_verification_cache
+    ):
+        self._quiet_state.setup_messages = []
+        try:
+            succeeded = self._attempt_api_setup(
+                api_key, source, model_to_use, use_verification_cache=use_verification_cache
+            )
+        except Exception as e:
+            self._quiet_state.setup_messages.append(
+                (f"Error during API key verification (from {source}): {e}", Colors.RED)
+            )
+            succeeded = False
+        self._setup_outcome = (succeeded, self._quiet_state.setup_messages, on_failure)
+        self._quiet_state.setup_messages = None
+
+    def _start_background_setup(
+        self, api_key, source, model_to_use, on_failure=None, use_verification_cache=False
+    ):
+        if not self._start_genai_import():
+            self.model = None
+            return False
+        # Optimistic until verification says otherwise, so callers do not re-save the choice.
+        self.chosen_model_name = model_to_use
+        self._setup_outcome = None
+        self._setup_thread = threading.Thread(
+            target=self._run_background_setup,
+            args=(api_key, source, model_to_use, on_failure, use_verification_cache),
+            name="gemini-setup",
+            daemon=True,
+        )
+        self._setup_thread.start()
         return True
 
+    def _finish_background_setup(self):
+        """Wait for a background key verification and report it if it failed."""
+        thread = self._setup_thread
+        if thread is None or thread is threading.current_thread():
+            return
+        with self._setup_lock:
+            if self._setup_thread is None:
+                return
+            if thread.is_alive():
+                with self._thinking_indicator():
+                    thread.join()
+            self._setup_thread = None
+            succeeded, messages, on_failure = self._setup_outcome or (False, [], None)
+            if succeeded:
+                for text, _color in messages:
+                    logging.info(text)
+                return
+            for text, color in messages:
+                self._log_message(text, color)
+            self._log_message("API setup failed. Continuing with placeholder responses.", Colors.RED)
+            self.model = None
+            if on_failure:
+                on_failure()
+
     class _GeminiModelAdapter:
         def __init__(self, client, model_name):
             self.client = client
             self.model_name = model_name
 
-        def generate_content(self, prompt, generation_config=None, safety_settings=None):
+        @staticmethod
+        def _build_config(generation_config=None, safety_settings=None):
             config = {}
             if generation_config:
                 if isinstance(generation_config, dict):
@@ -188,11 +444,37 @@ class GeminiAPI:
                     config.update(vars(generation_config))
             if safety_settings:
                 config["safety_settings"] = safety_settings
+            return config or None
 
+        def generate_content(self, prompt, generation_config=None, safety_settings=None):
             return self.client.models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config=config or None,
+                config=self._build_config(generation_config, safety_settings),
+            )
+
+        def generate_content_stream(self, prompt, generation_config=None, safety_settings=None):
+            return self.client.models.generate_content_stream(
+                model=self.model_name,
+                contents=prompt,
+                config=self._build_config(generation_config, safety_settings),
+            )
+
+        async def generate_content_async(
+            self, prompt, generation_config=None, safety_settings=None
+        ):
+            config = self._build_config(generation_config, safety_settings)
+            aio = getattr(self.client, "aio", None)
+            if aio is None:
+                # Clients without the aio surface (older SDKs, test stubs) run on a worker thread.
+                return await asyncio.to_thread(
+                    self.client.models.generate_content,
+                    model=self.model_name,
+                    contents=prompt,
+                    config=config,
+                )
+            return await aio.models.generate_content(
+                model=self.model_name, contents=prompt, config=config
             )
 
     def _run_spinner(self, stop_event):
@@ -208,7 +490,50 @@ class GeminiAPI:
             i += 1
             stop_event.wait(0.1)
 
+    @contextlib.contextmanager
+    def quiet_generations(self):
+        """Run generations on this thread without the spinner or console warnings."""
+        previous = self._is_quiet()
+        self._quiet_state.active = True
+        try:
+            yield
+        finally:
+            self._quiet_state.active = previous
+
+    def _is_quiet(self):
+        return _QUIET_TASKS.get() or getattr(getattr(self, "_quiet_state", None), "active", False)
+
+    @contextlib.contextmanager
+    def _thinking_indicator(self):
+        """Show the spinner while at least one generation is in flight."""
+        if self._is_quiet():
+            yield
+            return
+        with self._spinner_lock:
+            self._spinner_depth += 1
+            if self._spinner_depth == 1:
+                self._spinner_stop = threading.Event()
+                self._spinner_thread = threading.Thread(
+                    target=self._run_spinner,
+                    args=(self._spinner_stop,),
+                    daemon=True,
+                )
+                self._spinner_thread.start()
+        try:
+            yield
+        finally:
+            with self._spinner_lock:
+                self._spinner_depth -= 1
+                if self._spinner_depth == 0:
+                    self._spinner_stop.set()
+                    self._spinner_thread.join()
+                    sys.stdout.write("\r" + " " * 60 + "\r")
+                    sys.stdout.flush()
+
     def _log_message(self, text, color, end="\n"):
+        if self._is_quiet():
+            logging.info(text)
+            return
         if hasattr(self, "_print_color_func") and callable(self._print_color_func):
             self._print_color_func(text, color, end=end)
         else:
@@ -255,7 +580,109 @@ class GeminiAPI:
             except OSError as ose:
                 self._print_color_func(f"Could not rename {config_file_path}: {ose}", Colors.YELLOW)
 
-    def _attempt_api_setup(self, api_key, source, model_to_use):
+    @staticmethod
+    def _is_auth_error(error):
+        return is_auth_error(error)
+
+    @staticmethod
+    def _response_cache_file():
+        """Path of the on-disk response cache from the environment, or None."""
+        return os.environ.get(RESPONSE_CACHE_FILE_ENV_VAR) or None
+
+    def attach_response_cache_file(self):
+        """Back the response cache with the file named in the environment, if any."""
+        cache_file = self._response_cache_file()
+        if cache_file and self.response_cache.db_path is None:
+            self.response_cache.attach_database(cache_file)
+
+    @staticmethod
+    def _verification_cache_path():
+        return os.path.join(os.path.dirname(API_CONFIG_FILE), VERIFICATION_CACHE_FILE)
+
+    @staticmethod
+    def _verification_ttl_seconds():
+        raw_hours = os.getenv(VERIFICATION_TTL_ENV_VAR)
+        try:
+            hours = float(raw_hours) if raw_hours else DEFAULT_VERIFICATION_TTL_HOURS
+        except ValueError:
+            hours = DEFAULT_VERIFICATION_TTL_HOURS
+        return max(0.0, hours) * 3600
+
+    @staticmethod
+    def _verification_cache_key(api_key, model_name):
+        return hashlib.sha256(f"{model_name}\0{api_key}".encode("utf-8")).hexdigest()
+
+    def _load_verifications(self):
+        try:
+            with open(self._verification_cache_path(), "r", encoding="utf-8") as f:
+                verified = json.load(f).get("verified", {})
+        except (OSError, ValueError, AttributeError):
+            return {}
+        return verified if isinstance(verified, dict) else {}
+
+    def _store_verifications(self, verified):
+        try:
+            # Written from the background setup thread; a crash must not truncate the cache.
+            write_json_atomic(self._verification_cache_path(), {"verified": verified})
+        except OSError as e:
+            logging.warning(f"Could not write {self._verification_cache_path()}: {e}")
+
+    def _verification_is_fresh(self, digest):
+        ttl = self._verification_ttl_seconds()
+        verified_at = self._load_verifications().get(digest)
+        return bool(ttl) and isinstance(verified_at, (int, float)) and (
+            0 <= time.time() - verified_at < ttl
+        )
+
+    def _record_verification(self, digest):
+        ttl = self._verification_ttl_seconds()
+        if not ttl:
+            return
+        now = time.time()
+        verified = {
+            key: verified_at
+            for key, verified_at in self._load_verifications().items()
+            if isinstance(verified_at, (int, float)) and now - verified_at < ttl
+        }
+        verified[digest] = now
+        self._store_verifications(verified)
+
+    def _forget_verification(self, digest):
+        verified = self._load_verifications()
+        if verified.pop(digest, None) is not None:
+            self._store_verifications(verified)
+
+    def _handle_rejected_key(self):
+        """The key failed on a real call: drop its cached verification and stop using it."""
+        if self._verification_digest:
+            self._forget_verification(self._verification_digest)
+            self._verification_digest = None
+        self._log_message(
+            "The API key was rejected. Continuing with placeholder responses.", Colors.RED
+        )
+        self.model = None
+
+    def _attempt_api_setup(
+        self,
+        api_key,
+        source,
+        model_to_use,
+        background=False,
+        on_failure=None,
+        use_verification_cache=False,
+    ):
+        """Configure the client and verify the key with a test call.
+
+        With background=True the import and the verification call run on a worker
+        thread and this returns True at once; the outcome is settled, and on_failure
+        called, the first time `model` is read. With use_verification_cache=True a
+        key verified for this model within the TTL skips the test call; a bad key is
+        then caught on the first real call instead.
+        """
+        if background and api_key:
+            return self._start_background_setup(
+                api_key, source, model_to_use, on_failure, use_verification_cache
+            )
         if not api_key:
             self._log_message(
                 f"Internal: _attempt_api_setup called with no API key from {source}.",
@@ -274,7 +701,7 @@ class GeminiAPI:
         try:
             self.client = genai_module.Client(api_key=api_key)
         except Exception as e_config:
-            self._print_color_func(
+            self._setup_message(
                 f"Error configuring Gemini API (Client init using key from {source}): {e_config}",
                 Colors.RED,
             )
@@ -284,18 +711,31 @@ class GeminiAPI:
         try:
             model_instance = self._GeminiModelAdapter(self.client, model_to_use)
         except Exception as model_e:
-            self._print_color_func(
+            self._setup_message(
                 f"Error instantiating Gemini model '{model_to_use}' (key from {source}): {model_e}",
                 Colors.RED,
             )
-            self._print_color_func(
+            self._setup_message(
                 f"The API key might be valid, but there's an issue with model '{model_to_use}' (e.g., name, access permissions).",
                 Colors.YELLOW,
             )
             self.model = None
             return False
 
-        self._print_color_func(
+        verification_digest = (
+            self._verification_cache_key(api_key, model_to_use) if use_verification_cache else None
+        )
+        if verification_digest and self._verification_is_fresh(verification_digest):
+            self._setup_message(
+                f"API key from {source} was verified recently for model '{model_to_use}'; skipping the test call.",
+                Colors.GREEN,
+            )
+            self.model = model_instance
+            self.chosen_model_name = model_to_use
+            self._verification_digest = verification_digest
+            return True
+
+        self._setup_message(
             f"Verifying API key from {source} with model '{model_to_use}'...",
             Colors.MAGENTA,
         )
@@ -319,12 +759,15 @@ class GeminiAPI:
             )
 
             if hasattr(test_response, "text") and "test" in test_response.text.lower():
-                self._print_color_func(
+                self._setup_message(
                     f"API key from {source} verified successfully for model '{model_to_use}'.",
                     Colors.GREEN,
                 )
                 self.model = model_instance
                 self.chosen_model_name = model_to_use  # Confirm the successfully validated model
+                if verification_digest:
+                    self._record_verification(verification_digest)
+                    self._verification_digest = verification_digest
                 return True
             feedback_text = "Unknown issue during verification."
             if (
@@ -346,39 +789,24 @@ class GeminiAPI:
                 feedback_text = (
                     f"API key test call returned unexpected text: '{test_response.text[:50]}...'"
                 )
-            self._print_color_func(
+            self._setup_message(
                 f"API key verification with model '{model_to_use}' (key from {source}) failed: {feedback_text}",
                 Colors.RED,
             )
             self.model = None
             return False
         except Exception as e_test:
-            self._print_color_func(
+            self._setup_message(
                 f"Error during API key verification call (from {source}, model '{model_to_use}'): {e_test}",
                 Colors.RED,
             )
-            error_str = str(e_test).lower()
-            auth_keywords = [
-                "api key not valid",
-                "permission_denied",
-                "authentication_failed",
-                "invalid api key",
-                "credential is invalid",
-                "unauthenticated",
-                "api_key_invalid",
-                "user_location_invalid",
-            ]
-            grpc_permission_denied = getattr(e_test, "grpc_status_code", None) == 7
-            is_auth_error = grpc_permission_denied or any(
-                keyword in error_str for keyword in auth_keywords
-            )
-            if is_auth_error:
-                self._print_color_func(
+            if self._is_auth_error(e_test):
+                self._setup_message(
                     f"The API key from '{source}' appears invalid or lacks permissions for model '{model_to_use}'/region.",
                     Colors.RED,
                 )
             else:
-                self._print_color_func(
+                self._setup_message(
                     f"Unexpected error during verification with model '{model_to_use}'.",
                     Colors.YELLOW,
                 )
@@ -469,8 +897,13 @@ class GeminiAPI:
                 env_key,
                 f"environment variable '{GEMINI_API_KEY_ENV_VAR}'",
                 DEFAULT_GEMINI_MODEL_NAME,
+                background=True,
+                use_verification_cache=True,
             ):
-                self._log_message("Non-interactive setup successful.", Colors.GREEN)
+                self._log_message(
+                    "Non-interactive setup started; the key is verified while the game loads.",
+                    Colors.GREEN,
+                )
                 return {"api_configured": True, "low_ai_preference": False}
             self._log_message(
                 "Non-interactive setup with environment variable failed. The game will run with placeholder responses.",
@@ -502,18 +935,25 @@ class GeminiAPI:
                         Colors.YELLOW,
                     )
 
-                if not self._load_genai():
+                if not self._start_genai_import():
                     return {"api_configured": False, "low_ai_preference": False}
 
-                if self._attempt_api_setup(key_to_try, key_source, preferred_model_from_config):
+                failed_suffix = f"failed_setup_with_{preferred_model_from_config.replace('/', '_')}"
+                if self._attempt_api_setup(
+                    key_to_try,
+                    key_source,
+                    preferred_model_from_config,
+                    background=True,
+                    on_failure=lambda: self._rename_invalid_config_file(
+                        API_CONFIG_FILE, failed_suffix
+                    ),
+                    use_verification_cache=True,
+                ):
                     low_ai_pref = self._prompt_for_low_ai_mode()
                     if self.chosen_model_name != preferred_model_from_config:
                         self.save_api_key_to_file(key_to_try)
                     return {"api_configured": True, "low_ai_preference": low_ai_pref}
-                self._rename_invalid_config_file(
-                    API_CONFIG_FILE,
-                    f"failed_setup_with_{preferred_model_from_config.replace('/', '_')}",
-                )
+                self._rename_invalid_config_file(API_CONFIG_FILE, failed_suffix)
                 self._print_color_func(
                     f"API key from {key_source} (with model '{preferred_model_from_config}') failed validation or setup.",
                     Colors.YELLOW,
@@ -594,8 +1034,9 @@ class GeminiAPI:
         self._print_color_func = print_func
         self._input_color_func = input_func
         self._print_color_func("\n--- Gemini API Key Configuration ---", Colors.MAGENTA)
+        self.attach_response_cache_file()
 
-        if not self._load_genai():
+        if not self._start_genai_import():
             return {"api_configured": False, "low_ai_preference": False}
 
         env_result = self._handle_env_key()
@@ -608,104 +1049,395 @@ class GeminiAPI:
 
         return self._handle_manual_key_input()
 
-    def _generate_content_with_fallback(self, prompt, error_message_context="generating content"):
-        if not self.model:
-            return f"(OOC: Gemini API not configured or key invalid. Cannot fulfill request for {error_message_context}.)"
-        spinner_stop = threading.Event()
-        spinner_thread = threading.Thread(
-            target=self._run_spinner,
-            args=(spinner_stop,),
-            daemon=True,
+    def _response_cache_key(self, prompt, generation_config=None):
+        # Only adapters that report a model name are cached; an anonymous model
+        # gives no guarantee that two identical prompts mean the same thing.
+        model_name = getattr(self.model, "model_name", None)
+        if not isinstance(model_name, str) or not model_name:
+            return None
+        return ResponseCache.make_key(model_name, prompt, generation_config)
+
+    def _cached_generation(self, prompt, use_cache, generation_config=None):
+        """Return (cache_key, cached_text); the key is None when caching does not apply."""
+        if not use_cache:
+            return None, None
+        cache_key = self._response_cache_key(
+            prompt, {"safety_settings": CONTENT_SAFETY_SETTINGS, **(generation_config or {})}
         )
-        spinner_thread.start()
-        try:
-            safety_settings = [
-                {
-                    "category": "HARM_CATEGORY_HARASSMENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                },
-                {
-                    "category": "HARM_CATEGORY_HATE_SPEECH",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                },
-                {
-                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                },
-                {
-                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE",
-                },
+        if not cache_key:
+            return None, None
+        return cache_key, self.response_cache.get(cache_key)
+
+    def _text_from_response(self, response, prompt, error_message_context, cache_key=None):
+        if not hasattr(response, "text") or not response.text:
+            block_reason_str = ""
+            # Check for block reason in prompt_feedback
+            if (
+                hasattr(response, "prompt_feedback")
+                and hasattr(response.prompt_feedback, "block_reason")
+                and response.prompt_feedback.block_reason
+            ):
+                block_reason_str = f" (Reason: {response.prompt_feedback.block_reason})"
+            # Check for finish reason in candidates if text is empty
+            elif (
+                hasattr(response, "candidates")
+                and len(response.candidates) > 0
+                and hasattr(response.candidates[0], "finish_reason")
+            ):
+                finish_reason = response.candidates[0].finish_reason
+                # FINISH_REASON_STOP (1) is normal. Other reasons (SAFETY, RECITATION, OTHER, etc.) are issues.
+                if finish_reason != 1:  # Assuming 1 is FINISH_REASON_STOP
+                    block_reason_str = f" (Finish Reason: {finish_reason})"
+
+            refusal_phrases = [
+                "cannot fulfill",
+                "unable to provide",
+                "cannot generate",
+                "not able to create",
+                "i am unable to",
             ]
-            response = self.model.generate_content(prompt, safety_settings=safety_settings)
-
-            if not hasattr(response, "text") or not response.text:
-                block_reason_str = ""
-                # Check for block reason in prompt_feedback
-                if (
-                    hasattr(response, "prompt_feedback")
-                    and hasattr(response.prompt_feedback, "block_reason")
-                    and response.prompt_feedback.block_reason
-                ):
-                    block_reason_str = f" (Reason: {response.prompt_feedback.block_reason})"
-                # Check for finish reason in candidates if text is empty
-                elif (
-                    hasattr(response, "candidates")
-                    and len(response.candidates) > 0
-                    and hasattr(response.candidates[0], "finish_reason")
-                ):
-                    finish_reason = response.candidates[0].finish_reason
-                    # FINISH_REASON_STOP (1) is normal. Other reasons (SAFETY, RECITATION, OTHER, etc.) are issues.
-                    if finish_reason != 1:  # Assuming 1 is FINISH_REASON_STOP
-                        block_reason_str = f" (Finish Reason: {finish_reason})"
-
-                refusal_phrases = [
-                    "cannot fulfill",
-                    "unable to provide",
-                    "cannot generate",
-                    "not able to create",
-                    "i am unable to",
-                ]
-                if (
-                    hasattr(response, "text")
-                    and response.text
-                    and any(phrase in response.text.lower() for phrase in refusal_phrases)
-                ):
-                    self._log_message(
-                        f"Warning: Gemini returned a refusal-like response for {error_message_context}.{block_reason_str} Prompt: {prompt[:200]}...",
-                        Colors.YELLOW,
-                    )
-                    return f"(OOC: My thoughts on this are restricted at the moment.{block_reason_str})"
-
+            if (
+                hasattr(response, "text")
+                and response.text
+                and any(phrase in response.text.lower() for phrase in refusal_phrases)
+            ):
                 self._log_message(
-                    f"Warning: Gemini returned an empty or non-text response for {error_message_context}.{block_reason_str} Model: {self.chosen_model_name}. Prompt: {prompt[:200]}...",
+                    f"Warning: Gemini returned a refusal-like response for {error_message_context}.{block_reason_str} Prompt: {prompt[:200]}...",
                     Colors.YELLOW,
                 )
-                return f"(OOC: My thoughts on this are unclear or restricted at the moment.{block_reason_str})"
-            return response.text.strip()
-        except Exception as e:
+                return f"(OOC: My thoughts on this are restricted at the moment.{block_reason_str})"
+
             self._log_message(
-                f"Error calling Gemini API for {error_message_context} using model {self.chosen_model_name}: {e}",
-                Colors.RED,
+                f"Warning: Gemini returned an empty or non-text response for {error_message_context}.{block_reason_str} Model: {self.chosen_model_name}. Prompt: {prompt[:200]}...",
+                Colors.YELLOW,
             )
-            block_reason = None
-            # Look for block reason in the exception response if available (some errors wrap the response)
-            response_obj = getattr(e, "response", None)
-            prompt_feedback = getattr(response_obj, "prompt_feedback", None)
-            block_reason = getattr(prompt_feedback, "block_reason", None)
-
-            if block_reason:
-                self._log_message(f"Blocked due to: {block_reason}", Colors.YELLOW)
-                return f"(OOC: My response was blocked: {block_reason})"
-
-            if getattr(e, "grpc_status_code", None) == 7:
-                return "(OOC: API key error - Permission Denied. My thoughts are muddled.)"
-            return f"(OOC: My thoughts are... muddled due to an error: {str(e)[:100]}...)"
-        finally:
-            spinner_stop.set()
-            spinner_thread.join()
-            sys.stdout.write("\r" + " " * 60 + "\r")
-            sys.stdout.flush()
+            return f"(OOC: My thoughts on this are unclear or restricted at the moment.{block_reason_str})"
+        generated_text = response.text.strip()
+        if cache_key:
+            self.response_cache.put(cache_key, generated_text)
+        return generated_text
+
+    def _text_from_error(self, e, error_message_context):
+        self._log_message(
+            f"Error calling Gemini API for {error_message_context} using model {self.chosen_model_name}: {e}",
+            Colors.RED,
+        )
+        block_reason = None
+        # Look for block reason in the exception response if available (some errors wrap the response)
+        response_obj = getattr(e, "response", None)
+        prompt_feedback = getattr(response_obj, "prompt_feedback", None)
+        block_reason = getattr(prompt_feedback, "block_reason", None)
+
+        if block_reason:
+            self._log_message(f"Blocked due to: {block_reason}", Colors.YELLOW)
+            return f"(OOC: My response was blocked: {block_reason})"
+
+        if self._is_auth_error(e):
+            self._handle_rejected_key()
+            return "(OOC: API key error - Permission Denied. My thoughts are muddled.)"
+        return f"(OOC: My thoughts are... muddled due to an error: {str(e)[:100]}...)"
+
+    def _record_ai_call(self, call_site, prompt, started, outcome, response=None):
+        prompt_tokens, output_tokens = usage_token_counts(response)
+        latency = time.perf_counter() - started if started is not None else 0.0
+        self.ai_metrics.record(
+            call_site,
+            outcome,
+            prompt_chars=len(prompt),
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            latency=latency,
+        )
+        # Without usage_metadata, charge roughly four characters per prompt token.
+        spent = (prompt_tokens if prompt_tokens is not None else len(prompt) // 4) + (
+            output_tokens or 0
+        )
+        self.ai_policy.observe(outcome, latency, spent)
+
+    @staticmethod
+    def _circuit_open_text(error_message_context):
+        return f"(OOC: The AI is not answering right now; skipped {error_message_context}.)"
+
+    def _skip_for_budget(self, call_site, prompt, error_message_context):
+        """The (OOC: ...) text for a call the AI budget turns away, or None if it may run."""
+        if self.ai_policy.allows(call_site):
+            return None
+        self._record_ai_call(call_site, prompt, None, "skipped")
+        return f"(OOC: Skipped {error_message_context} to stay within the AI budget.)"
+
+    def _record_generation(self, call_site, prompt, started, text, response):
+        outcome = "fallback" if text.startswith("(OOC:") else "ok"
+        self._record_ai_call(call_site, prompt, started, outcome, response)
+        return text
+
+    @staticmethod
+    def _with_request_timeout(generation_config, timeout):
+        """generation_config plus the SDK's per-request timeout (http_options, in ms)."""
+        if timeout is None:
+            return generation_config
+        if isinstance(generation_config, dict):
+            config = dict(generation_config)
+        elif generation_config:
+            config = dict(vars(generation_config))
+        else:
+            config = {}
+        config["http_options"] = {"timeout": max(1, int(timeout * 1000))}
+        return config
+
+    @classmethod
+    def _generation_kwargs(cls, generation_config, timeout=None):
+        kwargs = {"safety_settings": CONTENT_SAFETY_SETTINGS}
+        generation_config = cls._with_request_timeout(generation_config, timeout)
+        if generation_config:
+            kwargs["generation_config"] = generation_config
+        return kwargs
+
+    def _generate_content_with_fallback(
+        self,
+        prompt,
+        error_message_context="generating content",
+        use_cache=True,
+        call_site=None,
+        generation_config=None,
+        model=None,
+    ):
+        """Generate text for prompt, or an (OOC: ...) fallback; call_site names it in ai_metrics.
+
+        model overrides self.model, e.g. with a ConversationSession.
+        """
+        model = model or self.model
+        if not model:
+            return f"(OOC: Gemini API not configured or key invalid. Cannot fulfill request for {error_message_context}.)"
+        call_site = call_site or error_message_context
+        cache_key, cached_text = self._cached_generation(prompt, use_cache, generation_config)
+        if cached_text is not None:
+            self._record_ai_call(call_site, prompt, None, "cache_hit")
+            return cached_text
+        skipped_text = self._skip_for_budget(call_site, prompt, error_message_context)
+        if skipped_text:
+            return skipped_text
+        started = time.perf_counter()
+        with self._thinking_indicator():
+            try:
+                response = call_with_retries(
+                    lambda timeout: model.generate_content(
+                        prompt, **self._generation_kwargs(generation_config, timeout)
+                    ),
+                    self.retry_policy,
+                    self.circuit_breaker,
+                )
+                text = self._text_from_response(response, prompt, error_message_context, cache_key)
+                return self._record_generation(call_site, prompt, started, text, response)
+            except CircuitOpenError:
+                self._record_ai_call(call_site, prompt, None, "skipped")
+                return self._circuit_open_text(error_message_context)
+            except Exception as e:
+                self._record_ai_call(call_site, prompt, started, "error")
+                return self._text_from_error(e, error_message_context)
+
+    @classmethod
+    def _open_stream(cls, model, prompt, generation_config=None, timeout=None):
+        """Start a streamed generation; returns (chunk iterator, first chunk or None).
+
+        Waiting for the first chunk here lets call_with_retries retry a stream that
+        fails to start, before any of its text has reached the screen.
+        """
+        chunks = iter(
+            model.generate_content_stream(
+                prompt, **cls._generation_kwargs(generation_config, timeout)
+            )
+        )
+        return chunks, next(chunks, None)
+
+    def _stream_content_with_fallback(
+        self,
+        prompt,
+        on_text,
+        error_message_context="generating content",
+        use_cache=True,
+        call_site=None,
+        generation_config=None,
+        model=None,
+    ):
+        """Like _generate_content_with_fallback, but hands each text chunk to on_text as it arrives.
+
+        Returns the full assembled text. Cache hits and (OOC: ...) fallbacks are
+        never passed to on_text, and models without generate_content_stream fall
+        back to a single blocking call.
+        """
+        model = model or self.model
+        if not callable(getattr(model, "generate_content_stream", None)):
+            return self._generate_content_with_fallback(
+                prompt,
+                error_message_context,
+                use_cache=use_cache,
+                call_site=call_site,
+                generation_config=generation_config,
+                model=model,
+            )
+        call_site = call_site or error_message_context
+        cache_key, cached_text = self._cached_generation(prompt, use_cache, generation_config)
+        if cached_text is not None:
+            self._record_ai_call(call_site, prompt, None, "cache_hit")
+            return cached_text
+        skipped_text = self._skip_for_budget(call_site, prompt, error_message_context)
+        if skipped_text:
+            return skipped_text
+        started = time.perf_counter()
+        parts = []
+        last_chunk = None
+        try:
+            # The spinner covers only the wait for the first chunk; the text itself follows it.
+            with self._thinking_indicator():
+                chunks, first_chunk = call_with_retries(
+                    lambda timeout: self._open_stream(model, prompt, generation_config, timeout),
+                    self.retry_policy,
+                    self.circuit_breaker,
+                )
+            if first_chunk is not None:
+                chunks = itertools.chain([first_chunk], chunks)
+            for chunk in chunks:
+                last_chunk = chunk
+                text = getattr(chunk, "text", None)
+                if text:
+                    parts.append(text)
+                    on_text(text)
+        except CircuitOpenError:
+            self._record_ai_call(call_site, prompt, None, "skipped")
+            return self._circuit_open_text(error_message_context)
+        except Exception as e:
+            if not parts:
+                self._record_ai_call(call_site, prompt, started, "error")
+                return self._text_from_error(e, error_message_context)
+            # Part of the reply is already on screen; keep it rather than contradict it.
+            logging.warning(f"Stream for {error_message_context} broke off: {e}")
+            cache_key = None
+        response = SimpleNamespace(
+            text="".join(parts),
+            prompt_feedback=getattr(last_chunk, "prompt_feedback", None),
+            candidates=getattr(last_chunk, "candidates", None) or [],
+            usage_metadata=getattr(last_chunk, "usage_metadata", None),
+        )
+        text = self._text_from_response(response, prompt, error_message_context, cache_key)
+        return self._record_generation(call_site, prompt, started, text, response)
+
+    def _generate_or_stream(
+        self,
+        prompt,
+        context,
+        use_cache,
+        call_site,
+        on_text=None,
+        generation_config=None,
+        model=None,
+    ):
+        if on_text is None:
+            return self._generate_content_with_fallback(
+                prompt,
+                context,
+                use_cache=use_cache,
+                call_site=call_site,
+                generation_config=generation_config,
+                model=model,
+            )
+        return self._stream_content_with_fallback(
+            prompt,
+            on_text,
+            context,
+            use_cache=use_cache,
+            call_site=call_site,
+            generation_config=generation_config,
+            model=model,
+        )
+
+    async def _generate_content_with_fallback_async(
+        self,
+        prompt,
+        error_message_context="generating content",
+        use_cache=True,
+        call_site=None,
+        generation_config=None,
+    ):
+        if not self.model:
+            return f"(OOC: Gemini API not configured or key invalid. Cannot fulfill request for {error_message_context}.)"
+        call_site = call_site or error_message_context
+        cache_key, cached_text = self._cached_generation(prompt, use_cache, generation_config)
+        if cached_text is not None:
+            self._record_ai_call(call_site, prompt, None, "cache_hit")
+            return cached_text
+        skipped_text = self._skip_for_budget(call_site, prompt, error_message_context)
+        if skipped_text:
+            return skipped_text
+        started = time.perf_counter()
+        model = self.model
+        if inspect.iscoroutinefunction(getattr(model, "generate_content_async", None)):
+
+            def make_call(timeout):
+                return model.generate_content_async(
+                    prompt, **self._generation_kwargs(generation_config, timeout)
+                )
+
+        else:
+
+            def make_call(timeout):
+                return asyncio.to_thread(
+                    model.generate_content,
+                    prompt,
+                    **self._generation_kwargs(generation_config, timeout),
+                )
+
+        with self._thinking_indicator():
+            try:
+                response = await call_with_retries_async(
+                    make_call, self.retry_policy, self.circuit_breaker
+                )
+                text = self._text_from_response(response, prompt, error_message_context, cache_key)
+                return self._record_generation(call_site, prompt, started, text, response)
+            except CircuitOpenError:
+                self._record_ai_call(call_site, prompt, None, "skipped")
+                return self._circuit_open_text(error_message_context)
+            except Exception as e:
+                self._record_ai_call(call_site, prompt, started, "error")
+                return self._text_from_error(e, error_message_context)
+
+    def _async_loop(self):
+        """The event loop all async generations run on, started on first use.
+
+        The SDK's async client pools connections on the loop that first uses it, so
+        every turn must reuse that loop rather than open and close one of its own.
+        """
+        with self._async_loop_lock:
+            if self._event_loop is None:
+                self._event_loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._event_loop.run_forever, name="gemini-async", daemon=True
+                ).start()
+            return self._event_loop
+
+    def gather_generations(self, *requests):
+        """Await independent generations concurrently and return their results in order.
+
+        Each request is an awaitable from a get_*_async method. A request that raises
+        yields None so the caller can fall back to static text for that slot.
+        """
+        if not requests:
+            return []
+        quiet = self._is_quiet()
+
+        async def run_all():
+            # Tasks copy this context, so the caller's quiet mode reaches every request.
+            _QUIET_TASKS.set(quiet)
+            with self._thinking_indicator():
+                return await asyncio.gather(*requests, return_exceptions=True)
+
+        results = []
+        future = asyncio.run_coroutine_threadsafe(run_all(), self._async_loop())
+        for result in future.result():
+            if isinstance(result, BaseException):
+                self._log_message(f"Concurrent generation failed: {result}", Colors.RED)
+                result = None
+            results.append(result)
+        return results
 
     def _extract_json_payload(self, text):
         if not text:
@@ -726,47 +1458,87 @@ class GeminiAPI:
             except json.JSONDecodeError:
                 return None
 
-    def generate_npc_response(self, npc_profile, player_input, current_stats):
-        fallback_response = {
-            "response_text": "The character stares at you silently.",
-            "stat_changes": {},
-        }
-        if not npc_profile:
-            return fallback_response
+    def _parse_json_reply(self, raw_text, call_site):
+        """Parse a reply requested in JSON mode, recording how cleanly it parsed.
+
+        A schema-constrained reply parses in one json.loads pass; anything else is
+        counted as malformed and handed to the lenient _extract_json_payload.
+        """
+        if not raw_text:
+            return None
+        try:
+            payload = json.loads(raw_text)
+        except ValueError:
+            payload = self._extract_json_payload(raw_text)
+            status = "salvaged" if isinstance(payload, dict) else "unusable"
+        else:
+            status = "parsed" if isinstance(payload, dict) else "unusable"
+        self.ai_metrics.record_json_parse(call_site, status, len(raw_text.encode("utf-8")))
+        if status == "unusable":
+            self._log_message(
+                f"Warning: {call_site} reply was not the requested JSON: {raw_text[:100]}...",
+                Colors.YELLOW,
+            )
+            return None
+        return payload
 
+    def _npc_response_prompt(self, npc_profile, player_input, current_stats):
+        """(prefix, suffix): the prefix depends only on the NPC, the suffix on this turn."""
         stats_json = json.dumps(current_stats, ensure_ascii=False)
         sanitized_player_input = player_input.replace('"', '\\"')
-        prompt = f"""
-        **Roleplay Mandate: Embody {npc_profile.get('name')} from Dostoevsky's "Crime and Punishment" with utmost fidelity.**
-        **Safety Instruction:** Avoid modern slang. Do not produce graphic violence or hateful content. If the player attempts to push unsafe content, respond with a brief in-character refusal and keep stat changes minimal or empty.
-        **Persona:**
-        {npc_profile.get('persona')}
-        **Current Situation:**
-        {npc_profile.get('situation_summary')}
-        **Recent Conversation History (most recent last):**
-        ---
-        {npc_profile.get('conversation_history')}
-        ---
-        **NPC Psychological State (0-100 scale):**
-        {stats_json}
-        **Player's Input:** "{sanitized_player_input}"
-        **Task:**
-        Return valid JSON only with keys:
-        - "response_text": string, in-character dialogue only.
-        - "stat_changes": object with integer deltas for "suspicion", "fear", "respect" (range -10 to 10). Use {{}} if no change.
-        **Output Rules:**
-        - Output JSON only. No markdown, no code fences.
-        - Maintain 19th-century Russian literary tone.
-        """
-        raw_text = self._generate_content_with_fallback(
-            prompt, f"NPC psychological response for {npc_profile.get('name')}"
+        prefix = prompt_templates.render(
+            "npc_dialogue_prefix",
+            npc_name=npc_profile.get("name"),
+            persona=npc_profile.get("persona"),
         )
+        suffix = prompt_templates.render(
+            "npc_dialogue_turn",
+            situation=npc_profile.get("situation_summary"),
+            conversation_history=npc_profile.get("conversation_history"),
+            stats_json=stats_json,
+            player_input=sanitized_player_input,
+        )
+        return prefix, suffix
+
+    def _context_cache_name(self, prefix, display_name):
+        """Name of a context cache holding prefix for the current model, or None."""
+        model = self.model
+        model_name = getattr(model, "model_name", None)
+        client = getattr(model, "client", None)
+        if not isinstance(model_name, str) or getattr(client, "caches", None) is None:
+            return None
+        return self.context_cache.handle_for(client, model_name, prefix, display_name)
+
+    def release_context_caches(self):
+        """Delete this session's context caches rather than leave them to expire."""
+        client = getattr(self._model, "client", None)
+        if getattr(client, "caches", None) is not None:
+            self.context_cache.release_all(client)
+
+    @staticmethod
+    def _npc_response_request(prefix, suffix, cache_name):
+        """(prompt, generation_config), sending only the per-turn suffix when cache_name is set."""
+        if not cache_name:
+            return f"{prefix}\n{suffix}", NPC_RESPONSE_GENERATION_CONFIG
+        return suffix, {**NPC_RESPONSE_GENERATION_CONFIG, "cached_content": cache_name}
+
+    def _settle_npc_response(self, raw_text, cache_name):
+        if cache_name and raw_text and raw_text.startswith("(OOC:"):
+            # The cache may have expired or been deleted server-side; start over next turn.
+            self.context_cache.invalidate(cache_name)
+        return self._parse_npc_response(raw_text)
+
+    def _parse_npc_response(self, raw_text):
+        fallback_response = {
+            "response_text": "The character stares at you silently.",
+            "stat_changes": {},
+        }
         if not raw_text:
             return fallback_response
         if raw_text.startswith("(OOC:"):
             return {"response_text": raw_text, "stat_changes": {}}
 
-        payload = self._extract_json_payload(raw_text)
+        payload = self._parse_json_reply(raw_text, "npc_response")
         if not isinstance(payload, dict):
             return {"response_text": raw_text.strip(), "stat_changes": {}}
 
@@ -785,16 +1557,30 @@ class GeminiAPI:
 
         return {"response_text": response_text.strip(), "stat_changes": stat_changes}
 
-    # --- Other get_... methods (get_npc_dialogue, etc.) remain unchanged ---
-    # They will use self.model which is set by the updated configure method
-    # with the user's chosen model name.
-    # (The prompt construction inside these methods does not need to change for this request)
+    def generate_npc_response(
+        self, npc_profile, player_input, current_stats, use_cache=False, on_text=None
+    ):
+        """Dialogue and stat changes for npc_profile; on_text, if given, receives the
+        dialogue text as it streams in."""
+        if not npc_profile:
+            return self._parse_npc_response(None)
+        prefix, suffix = self._npc_response_prompt(npc_profile, player_input, current_stats)
+        cache_name = self._context_cache_name(prefix, f"npc-{npc_profile.get('name')}")
+        prompt, generation_config = self._npc_response_request(prefix, suffix, cache_name)
+        raw_text = self._generate_or_stream(
+            prompt,
+            f"NPC psychological response for {npc_profile.get('name')}",
+            use_cache,
+            "npc_response",
+            on_text=JsonFieldStreamer("response_text", on_text).feed if on_text else None,
+            generation_config=generation_config,
+        )
+        return self._settle_npc_response(raw_text, cache_name)
 
-    def get_npc_dialogue(
-        self,
+    @staticmethod
+    def _npc_dialogue_state(
         npc_character,
         player_character,
-        player_dialogue,
         current_location_name,
         current_time_period,
         relationship_status_text,
@@ -805,59 +1591,41 @@ class GeminiAPI:
         npc_objectives_summary="No specific objectives.",
         player_objectives_summary="No specific objectives.",
     ):
-        conversation_context = npc_character.get_formatted_history(player_character.name)
-        situation_summary = (
-            f"You, {npc_character.name} (current internal state/mood: '{npc_character.apparent_state}', pursuing: {npc_objectives_summary}), "
-            f"are in {current_location_name} during the {current_time_period}. "
-            f"The player, {player_character.name} (appearing '{player_apparent_state}', pursuing: {player_objectives_summary}), "
-            f"{player_notable_items_summary}. "
-            f"Your relationship with {player_character.name} is '{relationship_status_text}'. "
-            f"You recall: {npc_memory_summary}. "
-            f"Key recent events in the world: {recent_game_events_summary}."
-        )
-
-        player_state_consideration = f"""
-        You should also consider the player's current apparent state: '{player_apparent_state}'.
-        If this state is unusual (e.g., not 'normal', 'thoughtful', 'contemplative'), your response should subtly acknowledge or react to it, in a way that is consistent with your persona and your relationship with the player.
-        For example, if the player is 'feverish', you might express concern or keep your distance. If they are 'agitated', you might be more cautious or try to calm them. If they are 'slightly drunk', you might dismiss them or find them amusing.
-        This reaction should be woven into your dialogue, not necessarily a separate statement, unless a direct comment is highly in character.
-        Do not overdo this; not every unusual state needs a strong reaction every time, but it should be a possibility.
-        """
-
-        player_items_consideration = f"""
-        The player is also carrying these notable items: '{player_notable_items_summary}'.
-        If any of these items are particularly striking, unusual for the player to carry, or relevant to your knowledge or suspicions (e.g., an axe, a bloodied item, a sacred symbol in an unexpected context), your dialogue should reflect your awareness of them.
-        Your reaction could range from subtle curiosity, suspicion, concern, fear, or even a direct comment, depending on your personality, the item, and the situation.
-        For instance, if the player is carrying 'raskolnikov's axe', a character like Porfiry might make an indirect or probing remark, while Sonya might show distress if she saw a 'bloodied rag'.
-        This awareness should be naturally integrated into your response. Do not simply list the items you see.
-        """
+        """The situation an NPC speaks in, keyed by the npc_situation template's fields."""
+        return {
+            "npc_name": npc_character.name,
+            "npc_state": npc_character.apparent_state,
+            "npc_objectives": npc_objectives_summary,
+            "location": current_location_name,
+            "time_period": current_time_period,
+            "player_name": player_character.name,
+            "player_state": player_apparent_state,
+            "player_objectives": player_objectives_summary,
+            "player_items": player_notable_items_summary,
+            "relationship": relationship_status_text,
+            "npc_memory": npc_memory_summary,
+            "recent_events": recent_game_events_summary,
+        }
 
-        npc_objective_consideration = f"""
-        Consider your own current objectives and your progress on them: '{npc_objectives_summary}'.
-        Your current dialogue, tone, and focus should be influenced by how you are feeling about these objectives and your current stage in achieving them.
-        For example, if you are close to completing an important objective, you might sound more confident or focused. If you are frustrated by a lack of progress on a key stage, this might color your words or make you less patient.
-        Let this internal state subtly guide your responses.
-        """
+    @staticmethod
+    def _npc_dialogue_profile(npc_character, player_character, state):
+        conversation_context = npc_character.get_formatted_history(player_character.name)
+        situation_summary = prompt_templates.render("npc_situation", **state)
         npc_profile = {
             "name": npc_character.name,
             "persona": npc_character.persona,
-            "situation_summary": "\n".join(
-                [
-                    situation_summary,
-                    player_state_consideration.strip(),
-                    player_items_consideration.strip(),
-                    npc_objective_consideration.strip(),
-                ]
-            ),
+            "situation_summary": situation_summary,
             "conversation_history": (
                 conversation_context
                 if conversation_context
                 else "No prior conversation in this session."
             ),
         }
-        response_payload = self.generate_npc_response(
-            npc_profile, player_dialogue, npc_character.psychology
-        )
+        return npc_profile
+
+    def _record_npc_dialogue(
+        self, npc_character, player_character, player_dialogue, response_payload
+    ):
         ai_text = response_payload.get("response_text", "The character stares at you silently.")
         npc_character.apply_psychology_changes(response_payload.get("stat_changes", {}))
 
@@ -883,35 +1651,174 @@ class GeminiAPI:
         player_character.add_to_history(npc_character.name, npc_character.name, final_ai_text)
         return final_ai_text
 
-    def get_player_reflection(
-        self,
-        player_character,
-        current_location_name,
-        current_time_period,
-        context_text,
-        recent_interactions_summary="Nothing specific recently.",
-        inventory_highlights="You carry your usual burdens.",
-        active_objectives_summary="Your goals weigh on you.",
-    ):
-        prompt = f"""
-        **Roleplay Mandate: Embody the internal thoughts of {player_character.name} from Dostoevsky's "Crime and Punishment".**
-        **Your Persona, {player_character.name}:**
-        {player_character.persona}
-        **Current Situation:**
-        * Location: {current_location_name}, Time: {current_time_period}, State: {player_character.apparent_state}
-        * Carrying: {inventory_highlights}, Objectives: {active_objectives_summary}
-        * Recent Interactions: {recent_interactions_summary}, Context: {context_text}
-        **Your Task: Generate a brief, introspective inner thought (1-3 sentences).**
-        **Reflection Guidelines (Strict Adherence Required):** Deeply Personal, Dostoevskian Style, First-Person, Contextual, Concise, No OOC, Output Only Thought.
-        Generate {player_character.name}'s inner thought now:
+    def open_conversation(self, npc_character, player_character):
+        """Open a chat with npc_character for one conversation, or None if chats are unavailable.
+
+        The chat is configured with the NPC's persona prefix (from its context cache
+        when there is one), so get_npc_dialogue(..., session=...) sends each turn only
+        the player's line and what changed in the situation.
         """
-        return self._generate_content_with_fallback(
-            prompt, f"player reflection for {player_character.name}"
+        model = self.model
+        model_name = getattr(model, "model_name", None)
+        chats = getattr(getattr(model, "client", None), "chats", None)
+        if not isinstance(model_name, str) or chats is None:
+            return None
+        prefix = prompt_templates.render(
+            "npc_dialogue_prefix", npc_name=npc_character.name, persona=npc_character.persona
+        )
+        cache_name = self._context_cache_name(prefix, f"npc-{npc_character.name}")
+        # A chat's config is fixed when it opens, so its requests get the whole deadline.
+        config = self._with_request_timeout(
+            {**NPC_RESPONSE_GENERATION_CONFIG, "safety_settings": CONTENT_SAFETY_SETTINGS},
+            self.retry_policy.deadline,
         )
+        if cache_name:
+            config["cached_content"] = cache_name
+        else:
+            config["system_instruction"] = prefix
 
-    def get_atmospheric_details(
-        self,
-        player_character,
+        def open_chat(history):
+            return chats.create(model=model_name, config=config, history=history or None)
+
+        try:
+            session = ConversationSession(open_chat, npc_character.name, cache_name)
+        except Exception as e:
+            logging.info(f"Could not open a chat with {npc_character.name}: {e}")
+            if cache_name:
+                self.context_cache.invalidate(cache_name)
+            return None
+        return session
+
+    def _npc_chat_response(self, session, state, player_input, on_text=None):
+        """One turn of an open conversation: the player's line and the state that changed."""
+        sanitized_player_input = player_input.replace('"', '\\"')
+        prompt = prompt_templates.render(
+            "npc_chat_turn",
+            state_changes=format_state_changes(session.state_changes(state)),
+            player_input=sanitized_player_input,
+        )
+        raw_text = self._generate_or_stream(
+            prompt,
+            f"NPC conversation with {session.npc_name}",
+            False,
+            "npc_chat",
+            on_text=JsonFieldStreamer("response_text", on_text).feed if on_text else None,
+            model=session,
+        )
+        if raw_text and raw_text.startswith("(OOC:"):
+            # The chat (or the cache behind it) may be gone; later turns go through stateless prompts.
+            session.close()
+            if session.cache_name:
+                self.context_cache.invalidate(session.cache_name)
+        else:
+            session.record_exchange(state)
+        return self._parse_npc_response(raw_text)
+
+    def get_npc_dialogue(
+        self,
+        npc_character,
+        player_character,
+        player_dialogue,
+        current_location_name,
+        current_time_period,
+        relationship_status_text,
+        npc_memory_summary,
+        player_apparent_state="normal",
+        player_notable_items_summary="nothing noteworthy",
+        recent_game_events_summary="No significant recent events.",
+        npc_objectives_summary="No specific objectives.",
+        player_objectives_summary="No specific objectives.",
+        use_cache=False,
+        on_text=None,
+        session=None,
+    ):
+        state = self._npc_dialogue_state(
+            npc_character,
+            player_character,
+            current_location_name,
+            current_time_period,
+            relationship_status_text,
+            npc_memory_summary,
+            player_apparent_state,
+            player_notable_items_summary,
+            recent_game_events_summary,
+            npc_objectives_summary,
+            player_objectives_summary,
+        )
+        if session is not None and not session.closed:
+            state["psychology"] = json.dumps(npc_character.psychology, ensure_ascii=False)
+            if session.is_new:
+                state["earlier_conversation"] = (
+                    npc_character.get_formatted_history(player_character.name)
+                    or "No prior conversation."
+                )
+            response_payload = self._npc_chat_response(session, state, player_dialogue, on_text)
+            return self._record_npc_dialogue(
+                npc_character, player_character, player_dialogue, response_payload
+            )
+        npc_profile = self._npc_dialogue_profile(npc_character, player_character, state)
+        response_payload = self.generate_npc_response(
+            npc_profile,
+            player_dialogue,
+            npc_character.psychology,
+            use_cache=use_cache,
+            on_text=on_text,
+        )
+        return self._record_npc_dialogue(
+            npc_character, player_character, player_dialogue, response_payload
+        )
+
+    def _player_reflection_request(
+        self,
+        player_character,
+        current_location_name,
+        current_time_period,
+        context_text,
+        recent_interactions_summary="Nothing specific recently.",
+        inventory_highlights="You carry your usual burdens.",
+        active_objectives_summary="Your goals weigh on you.",
+    ):
+        prompt = prompt_templates.render(
+            "player_reflection",
+            player_name=player_character.name,
+            persona=player_character.persona,
+            location=current_location_name,
+            time_period=current_time_period,
+            player_state=player_character.apparent_state,
+            inventory_highlights=inventory_highlights,
+            objectives=active_objectives_summary,
+            recent_interactions=recent_interactions_summary,
+            context=context_text,
+        )
+        return prompt, f"player reflection for {player_character.name}"
+
+    def get_player_reflection(
+        self,
+        player_character,
+        current_location_name,
+        current_time_period,
+        context_text,
+        recent_interactions_summary="Nothing specific recently.",
+        inventory_highlights="You carry your usual burdens.",
+        active_objectives_summary="Your goals weigh on you.",
+        use_cache=True,
+    ):
+        prompt, context = self._player_reflection_request(
+            player_character,
+            current_location_name,
+            current_time_period,
+            context_text,
+            recent_interactions_summary,
+            inventory_highlights,
+            active_objectives_summary,
+        )
+        return self._generate_content_with_fallback(
+            prompt, context, use_cache=use_cache, call_site="player_reflection"
+        )
+
+    def _atmospheric_details_request(
+        self,
+        player_character,
         location_name,
         time_period,
         recent_event_summary=None,
@@ -929,13 +1836,81 @@ class GeminiAPI:
         if recently_visited:
             brevity_instruction = "Keep it extremely brief (1 short sentence), as the character was just here. Focus on a single fleeting detail."
 
-        prompt = f"""
-        **Task: Evoke Dostoevsky's St. Petersburg atmosphere via {player_character.name}'s perception.**
-        **Context:** {context}
-        **Instructions:** {brevity_instruction} Enhance mood, Dostoevskian tone. Sensory/Symbolic. Reflect internal state. Not a plot point. Output only description.
-        Generate the atmospheric detail now:
-        """
-        return self._generate_content_with_fallback(prompt, "atmospheric details")
+        prompt = prompt_templates.render(
+            "atmospheric_details",
+            player_name=player_character.name,
+            context=context,
+            brevity_instruction=brevity_instruction,
+        )
+        return prompt, "atmospheric details"
+
+    def get_atmospheric_details(
+        self,
+        player_character,
+        location_name,
+        time_period,
+        recent_event_summary=None,
+        player_objective_focus=None,
+        recently_visited=False,
+        use_cache=True,
+    ):
+        prompt, context = self._atmospheric_details_request(
+            player_character,
+            location_name,
+            time_period,
+            recent_event_summary,
+            player_objective_focus,
+            recently_visited,
+        )
+        return self._generate_content_with_fallback(
+            prompt, context, use_cache=use_cache, call_site="atmospheric_details"
+        )
+
+    async def get_atmospheric_details_async(
+        self,
+        player_character,
+        location_name,
+        time_period,
+        recent_event_summary=None,
+        player_objective_focus=None,
+        recently_visited=False,
+        use_cache=True,
+    ):
+        prompt, context = self._atmospheric_details_request(
+            player_character,
+            location_name,
+            time_period,
+            recent_event_summary,
+            player_objective_focus,
+            recently_visited,
+        )
+        return await self._generate_content_with_fallback_async(
+            prompt, context, use_cache=use_cache, call_site="atmospheric_details"
+        )
+
+    def _npc_to_npc_interaction_request(
+        self,
+        npc1,
+        npc2,
+        location_name,
+        game_time_period,
+        npc1_objectives_summary="their usual concerns",
+        npc2_objectives_summary="their usual concerns",
+    ):
+        prompt = prompt_templates.render(
+            "npc_to_npc_interaction",
+            location=location_name,
+            time_period=game_time_period,
+            npc1_name=npc1.name,
+            npc1_state=npc1.apparent_state,
+            npc1_persona=npc1.persona[:150],
+            npc1_objectives=npc1_objectives_summary,
+            npc2_name=npc2.name,
+            npc2_state=npc2.apparent_state,
+            npc2_persona=npc2.persona[:150],
+            npc2_objectives=npc2_objectives_summary,
+        )
+        return prompt, f"NPC-to-NPC interaction between {npc1.name} and {npc2.name}"
 
     def get_npc_to_npc_interaction(
         self,
@@ -945,31 +1920,65 @@ class GeminiAPI:
         game_time_period,
         npc1_objectives_summary="their usual concerns",
         npc2_objectives_summary="their usual concerns",
+        use_cache=True,
     ):
-        prompt = f"""
-        **Task: Simulate brief, ambient, Dostoevskian NPC-to-NPC interaction (1-3 lines).**
-        **Setting:** {location_name}, {game_time_period}.
-        **Characters:** {npc1.name} (appears {npc1.apparent_state}, persona: {npc1.persona[:150]}..., objectives: {npc1_objectives_summary}) & {npc2.name} (appears {npc2.apparent_state}, persona: {npc2.persona[:150]}..., objectives: {npc2_objectives_summary}).
-        **Guidelines:**
-        - Interaction should be in-character, reflecting their personas, current states, and objectives.
-        - Avoid direct player involvement or addressing the player. This is an ambient exchange.
-        - Maintain a Dostoevskian tone appropriate for "Crime and Punishment".
-        - Format:
-          {npc1.name}: [Their dialogue line 1]
-          {npc2.name}: [Their dialogue line 1, responding to NPC1 or initiating]
-          (Optional {npc1.name}: [Their dialogue line 2, responding to NPC2])
-        - The conversation might also touch upon local gossip or a rumor. If so, make the rumor distinct or have one NPC explicitly share a piece of news or gossip they've heard.
-        **Example of incorporating a rumor (do not use this specific rumor):**
-        NPC1: The price of bread is scandalous, isn't it?
-        NPC2: It is. And did you hear about that student, the one involved in that dreadful business with the pawnbroker? They say he's been seen lurking near the Haymarket, looking like a ghost...
-        NPC1: Hush now, it's not wise to speak of such things.
-        **Output:** Generate only the dialogue lines as specified.
-        Generate the interaction now:
-        """
+        prompt, context = self._npc_to_npc_interaction_request(
+            npc1,
+            npc2,
+            location_name,
+            game_time_period,
+            npc1_objectives_summary,
+            npc2_objectives_summary,
+        )
         return self._generate_content_with_fallback(
-            prompt, f"NPC-to-NPC interaction between {npc1.name} and {npc2.name}"
+            prompt, context, use_cache=use_cache, call_site="npc_to_npc_interaction"
+        )
+
+    async def get_npc_to_npc_interaction_async(
+        self,
+        npc1,
+        npc2,
+        location_name,
+        game_time_period,
+        npc1_objectives_summary="their usual concerns",
+        npc2_objectives_summary="their usual concerns",
+        use_cache=True,
+    ):
+        prompt, context = self._npc_to_npc_interaction_request(
+            npc1,
+            npc2,
+            location_name,
+            game_time_period,
+            npc1_objectives_summary,
+            npc2_objectives_summary,
+        )
+        return await self._generate_content_with_fallback_async(
+            prompt, context, use_cache=use_cache, call_site="npc_to_npc_interaction"
         )
 
+    def _item_interaction_description_request(
+        self,
+        character,
+        item_name,
+        item_details,
+        action_type="examine",
+        location_name="an undisclosed location",
+        time_period="an unknown time",
+        target_details=None,
+    ):
+        prompt = prompt_templates.render(
+            "item_interaction_description",
+            character_name=character.name,
+            character_state=character.apparent_state,
+            location=location_name,
+            time_period=time_period,
+            item_name=item_name,
+            item_description=item_details.get("description", "No details"),
+            action_type=action_type,
+            target_details=target_details if target_details else "N/A",
+        )
+        return prompt, f"item interaction with {item_name} by {character.name}"
+
     def get_item_interaction_description(
         self,
         character,
@@ -979,36 +1988,131 @@ class GeminiAPI:
         location_name="an undisclosed location",
         time_period="an unknown time",
         target_details=None,
+        use_cache=True,
     ):
-        prompt = f"""
-        **Roleplay Mandate: Generate {character.name}'s internal, first-person Dostoevskian thought for item interaction.**
-        **Context:** {character.name} ({character.apparent_state}) in {location_name} at {time_period}.
-        **Item:** '{item_name}' ({item_details.get('description', 'No details')}). Action: {action_type}.
-        Target: {target_details if target_details else "N/A"}.
-        **Task: Describe {character.name}'s brief, evocative thought (1-2 sentences).**
-        **Guidelines:** Psychologically resonant, first-person, sensory, concise, no OOC.
-        Generate {character.name}'s thought/observation now:
-        """
+        prompt, context = self._item_interaction_description_request(
+            character,
+            item_name,
+            item_details,
+            action_type,
+            location_name,
+            time_period,
+            target_details,
+        )
         return self._generate_content_with_fallback(
-            prompt, f"item interaction with {item_name} by {character.name}"
+            prompt, context, use_cache=use_cache, call_site="item_interaction_description"
         )
 
+    async def get_item_interaction_description_async(
+        self,
+        character,
+        item_name,
+        item_details,
+        action_type="examine",
+        location_name="an undisclosed location",
+        time_period="an unknown time",
+        target_details=None,
+        use_cache=True,
+    ):
+        prompt, context = self._item_interaction_description_request(
+            character,
+            item_name,
+            item_details,
+            action_type,
+            location_name,
+            time_period,
+            target_details,
+        )
+        return await self._generate_content_with_fallback_async(
+            prompt, context, use_cache=use_cache, call_site="item_interaction_description"
+        )
+
+    def _dream_sequence_request(
+        self,
+        character_obj,
+        recent_events_summary,
+        current_objectives_summary,
+        key_relationships_summary="No specific key relationships.",
+    ):
+        prompt = prompt_templates.render(
+            "dream_sequence",
+            character_name=character_obj.name,
+            character_state=character_obj.apparent_state,
+            recent_events=recent_events_summary,
+            objectives=current_objectives_summary,
+            relationships=key_relationships_summary,
+        )
+        return prompt, f"{character_obj.name}'s dream sequence"
+
     def get_dream_sequence(
         self,
         character_obj,
         recent_events_summary,
         current_objectives_summary,
         key_relationships_summary="No specific key relationships.",
+        use_cache=True,
+        on_text=None,
     ):
-        prompt = f"""
-        **Task: Describe a symbolic, surreal, Dostoevskian dream for {character_obj.name}.**
-        **Dreamer Profile:** {character_obj.name} ({character_obj.apparent_state}). Recent: {recent_events_summary}. Concerns: {current_objectives_summary}. Relationships: {key_relationships_summary}.
-        **Guidelines:** Symbolic/surreal, Dostoevskian tone, vivid/fragmented imagery, emotional impact, concise (3-5 sentences), output only dream.
-        Generate dream for {character_obj.name} now:
-        """
+        prompt, context = self._dream_sequence_request(
+            character_obj,
+            recent_events_summary,
+            current_objectives_summary,
+            key_relationships_summary,
+        )
+        return self._generate_or_stream(
+            prompt, context, use_cache, "dream_sequence", on_text=on_text
+        )
+
+    def _conversation_summary_request(self, character_name, other_name, previous_summary, lines):
+        prompt = prompt_templates.render(
+            "conversation_summary",
+            character_name=character_name,
+            other_name=other_name,
+            previous_summary=previous_summary or "Nothing yet.",
+            lines="\n".join(lines),
+            max_words=CONVERSATION_SUMMARY_MAX_CHARS // 6,
+        )
+        return prompt, f"summary of {character_name}'s conversation with {other_name}"
+
+    def get_conversation_summary(
+        self,
+        character_name,
+        other_name,
+        previous_summary,
+        lines,
+        use_cache=True,
+    ):
+        prompt, context = self._conversation_summary_request(
+            character_name,
+            other_name,
+            previous_summary,
+            lines,
+        )
         return self._generate_content_with_fallback(
-            prompt, f"{character_obj.name}'s dream sequence"
+            prompt, context, use_cache=use_cache, call_site="conversation_summary"
+        )
+
+    def _rumor_or_gossip_request(
+        self,
+        npc_obj,
+        location_name,
+        game_time_period,
+        known_facts_about_crime_summary,
+        player_notoriety_level,
+        npc_relationship_with_player_text="neutral",
+        npc_current_concerns="their usual worries",
+    ):
+        prompt = prompt_templates.render(
+            "rumor_or_gossip",
+            npc_name=npc_obj.name,
+            location=location_name,
+            time_period=game_time_period,
+            relationship=npc_relationship_with_player_text,
+            npc_concerns=npc_current_concerns,
+            known_facts=known_facts_about_crime_summary,
+            notoriety=player_notoriety_level,
         )
+        return prompt, f"rumor from {npc_obj.name}"
 
     def get_rumor_or_gossip(
         self,
@@ -1019,15 +2123,60 @@ class GeminiAPI:
         player_notoriety_level,
         npc_relationship_with_player_text="neutral",
         npc_current_concerns="their usual worries",
+        use_cache=True,
     ):
-        prompt = f"""
-        **Task: Generate brief, in-character Dostoevskian gossip/rumor (1-2 sentences) from {npc_obj.name}.**
-        **Context:** {npc_obj.name} in {location_name} ({game_time_period}). Player relationship: {npc_relationship_with_player_text}. Concerns: {npc_current_concerns}.
-        **Background:** Crime: {known_facts_about_crime_summary}. Player Notoriety: {player_notoriety_level}.
-        **Guidelines:** In-character, Dostoevskian, varied content, subtle re:notoriety, plausible, concise, output only rumor.
-        Generate rumor from {npc_obj.name} now:
-        """
-        return self._generate_content_with_fallback(prompt, f"rumor from {npc_obj.name}")
+        prompt, context = self._rumor_or_gossip_request(
+            npc_obj,
+            location_name,
+            game_time_period,
+            known_facts_about_crime_summary,
+            player_notoriety_level,
+            npc_relationship_with_player_text,
+            npc_current_concerns,
+        )
+        return self._generate_content_with_fallback(
+            prompt, context, use_cache=use_cache, call_site="rumor_or_gossip"
+        )
+
+    async def get_rumor_or_gossip_async(
+        self,
+        npc_obj,
+        location_name,
+        game_time_period,
+        known_facts_about_crime_summary,
+        player_notoriety_level,
+        npc_relationship_with_player_text="neutral",
+        npc_current_concerns="their usual worries",
+        use_cache=True,
+    ):
+        prompt, context = self._rumor_or_gossip_request(
+            npc_obj,
+            location_name,
+            game_time_period,
+            known_facts_about_crime_summary,
+            player_notoriety_level,
+            npc_relationship_with_player_text,
+            npc_current_concerns,
+        )
+        return await self._generate_content_with_fallback_async(
+            prompt, context, use_cache=use_cache, call_site="rumor_or_gossip"
+        )
+
+    def _newspaper_article_snippet_request(
+        self,
+        game_day,
+        key_events_occurred_summary,
+        relevant_themes_for_raskolnikov_summary,
+        city_mood="tense and anxious",
+    ):
+        prompt = prompt_templates.render(
+            "newspaper_article_snippet",
+            game_day=game_day,
+            events=key_events_occurred_summary,
+            themes=relevant_themes_for_raskolnikov_summary,
+            city_mood=city_mood,
+        )
+        return prompt, "newspaper article snippet"
 
     def get_newspaper_article_snippet(
         self,
@@ -1035,14 +2184,36 @@ class GeminiAPI:
         key_events_occurred_summary,
         relevant_themes_for_raskolnikov_summary,
         city_mood="tense and anxious",
+        use_cache=True,
     ):
-        prompt = f"""
-        **Task: Generate short St. Petersburg newspaper snippet (2-4 sentences).**
-        **Context:** Day {game_day}. Events: {key_events_occurred_summary}. Themes: {relevant_themes_for_raskolnikov_summary}. Mood: {city_mood}.
-        **Guidelines:** Content (investigation, social conditions, philosophies, news, subtle allusions), 19th-C style, concise, output snippet.
-        Generate newspaper snippet now:
-        """
-        return self._generate_content_with_fallback(prompt, "newspaper article snippet")
+        prompt, context = self._newspaper_article_snippet_request(
+            game_day,
+            key_events_occurred_summary,
+            relevant_themes_for_raskolnikov_summary,
+            city_mood,
+        )
+        return self._generate_content_with_fallback(
+            prompt, context, use_cache=use_cache, call_site="newspaper_article_snippet"
+        )
+
+    def _scenery_observation_request(
+        self,
+        character_obj,
+        scenery_noun_phrase,
+        location_name,
+        time_period,
+        character_active_objectives_summary="their current thoughts",
+    ):
+        prompt = prompt_templates.render(
+            "scenery_observation",
+            character_name=character_obj.name,
+            character_state=character_obj.apparent_state,
+            location=location_name,
+            time_period=time_period,
+            scenery=scenery_noun_phrase,
+            objectives=character_active_objectives_summary,
+        )
+        return prompt, f"scenery observation of {scenery_noun_phrase}"
 
     def get_scenery_observation(
         self,
@@ -1051,17 +2222,42 @@ class GeminiAPI:
         location_name,
         time_period,
         character_active_objectives_summary="their current thoughts",
+        use_cache=True,
     ):
-        prompt = f"""
-        **Roleplay Mandate: Generate {character_obj.name}'s Dostoevskian observation of scenery.**
-        **Context:** {character_obj.name} ({character_obj.apparent_state}) in {location_name} ({time_period}). Focus: '{scenery_noun_phrase}'. Preoccupations: {character_active_objectives_summary}.
-        **Task: Generate brief, introspective observation (1-2 sentences).**
-        **Guidelines:** Psychologically resonant, deeper meaning, first-person, concise, no OOC, output observation.
-        Generate {character_obj.name}'s scenery observation now:
-        """
+        prompt, context = self._scenery_observation_request(
+            character_obj,
+            scenery_noun_phrase,
+            location_name,
+            time_period,
+            character_active_objectives_summary,
+        )
         return self._generate_content_with_fallback(
-            prompt, f"scenery observation of {scenery_noun_phrase}"
+            prompt, context, use_cache=use_cache, call_site="scenery_observation"
+        )
+
+    def _generated_text_document_request(
+        self,
+        document_type,
+        author_persona_hint="an unknown person",
+        recipient_persona_hint="the recipient",
+        subject_matter="an important matter",
+        desired_tone="neutral",
+        key_info_to_include="some key details",
+        length_sentences=3,
+        purpose_of_document_in_game="To convey information.",
+    ):
+        prompt = prompt_templates.render(
+            "generated_text_document",
+            document_type=document_type,
+            author=author_persona_hint,
+            recipient=recipient_persona_hint,
+            subject=subject_matter,
+            tone=desired_tone,
+            key_info=key_info_to_include,
+            length_sentences=length_sentences,
+            purpose=purpose_of_document_in_game,
         )
+        return prompt, f"generated text for {document_type}"
 
     def get_generated_text_document(
         self,
@@ -1073,16 +2269,24 @@ class GeminiAPI:
         key_info_to_include="some key details",
         length_sentences=3,
         purpose_of_document_in_game="To convey information.",
+        use_cache=True,
+        on_text=None,
     ):
-        prompt = f"""
-        **Task: Generate text for a '{document_type}' in Dostoevsky's world.**
-        **Specs:** Author: {author_persona_hint}. Recipient: {recipient_persona_hint}. Subject: {subject_matter}. Tone: {desired_tone}. Key Info: {key_info_to_include}. Length: {length_sentences} sentences. Style: 19th-C St. Petersburg. Purpose: {purpose_of_document_in_game}.
-        **Guidelines:** Authentic voice, Dostoevskian flavor, convey info subtly, output only document text.
-        Generate text for '{document_type}' now:
-        """
-        return self._generate_content_with_fallback(prompt, f"generated text for {document_type}")
+        prompt, context = self._generated_text_document_request(
+            document_type,
+            author_persona_hint,
+            recipient_persona_hint,
+            subject_matter,
+            desired_tone,
+            key_info_to_include,
+            length_sentences,
+            purpose_of_document_in_game,
+        )
+        return self._generate_or_stream(
+            prompt, context, use_cache, "generated_text_document", on_text=on_text
+        )
 
-    def get_npc_dialogue_persuasion_attempt(
+    def _npc_persuasion_request(
         self,
         npc_character,
         player_character,
@@ -1099,65 +2303,53 @@ class GeminiAPI:
         persuasion_skill_check_result_text,
     ):
         conversation_context = npc_character.get_formatted_history(player_character.name)
-        situation_summary = (
-            f"You, {npc_character.name} (current internal state/mood: '{npc_character.apparent_state}', pursuing: {npc_objectives_summary}), "
-            f"are in {current_location_name} during the {current_time_period}. "
-            f"The player, {player_character.name} (appearing '{player_apparent_state}', pursuing: {player_objectives_summary}), "
-            f"{player_notable_items_summary}. "
-            f"Your relationship with {player_character.name} is '{relationship_status_text}'. "
-            f"You recall: {npc_memory_summary}. "
-            f"Key recent events in the world: {recent_game_events_summary}."
-        )
-
-        player_state_persuasion_consideration = f"""
-        Additionally, consider the player's current apparent state: '{player_apparent_state}' when forming your response to their persuasion attempt.
-        An unusual state (e.g., 'agitated', 'feverish', 'paranoid', 'slightly drunk') might make you more or less receptive, or react in a specific way (e.g., wary, dismissive, concerned) to their attempt to persuade you.
-        Integrate this consideration naturally into your dialogue.
-        """
-
-        player_items_persuasion_consideration = f"""
-        Furthermore, consider the notable items the player is carrying: '{player_notable_items_summary}'.
-        The presence of certain items (e.g., a weapon, an item of evidence, something out of place) might influence your trust, suspicion, or overall reaction to their persuasion attempt.
-        Let this awareness subtly shape your response.
-        """
-
-        npc_objective_persuasion_consideration = f"""
-        Your current progress on your own objectives ('{npc_objectives_summary}') should also heavily influence your response to this persuasion attempt.
-        If their attempt aligns with or hinders your goals, or if your current objective stage makes you more or less receptive, reflect this in your dialogue.
-        """
-
-        prompt = f"""
-        **Roleplay Mandate: Embody {npc_character.name} from Dostoevsky's "Crime and Punishment" with utmost fidelity.**
-        **Your Persona, {npc_character.name}:**
-        {npc_character.persona}
-        **Current Detailed Situation:**
-        {situation_summary}
-        {player_state_persuasion_consideration}
-        {player_items_persuasion_consideration}
-        {npc_objective_persuasion_consideration}
-        **Recent Conversation History with {player_character.name} (most recent last):**
-        ---
-        {conversation_context if conversation_context else "No prior conversation in this session."}
-        ---
-        **Player's Persuasion Attempt:**
-        {player_character.name} is trying to persuade you, {npc_character.name}, about the following: "{player_persuasive_statement}"
-        This persuasion attempt was a {persuasion_skill_check_result_text}.
-
-        **Your Task (as {npc_character.name}):**
-        Respond to this persuasion attempt.
-        - Your reaction to the persuasion should also be influenced by the player's apparent state, as noted above.
-        - If the persuasion was a SUCCESS (e.g., "SUCCESS due to their skillful argument", "CRITICAL SUCCESS, they are very convincing"): You should seem noticeably swayed, convinced, more agreeable, or willing to reveal something (if appropriate to your persona and the statement). Your dialogue should reflect this change of heart or willingness.
-        - If the persuasion was a FAILURE (e.g., "FAILURE despite their efforts", "CRITICAL FAILURE, the attempt was clumsy and offensive"): You should resist the persuasion. You might become annoyed, suspicious, dismissive, reiterate your current stance more firmly, or even subtly mock the attempt, depending on your persona.
-        - Your response should still be in character, concise, and in Dostoevskian tone.
-        - DO NOT explicitly say "The persuasion succeeded" or "The persuasion failed." Show it through your dialogue.
-        - DO NOT use parenthetical remarks like (He seems hesitant) or similar stage directions. Your response is dialogue only.
-
-        Respond now as {npc_character.name}:
-        """
-        ai_text = self._generate_content_with_fallback(
-            prompt, f"NPC persuasion response for {npc_character.name}"
+        situation_summary = "\n".join(
+            [
+                prompt_templates.render(
+                    "npc_situation",
+                    npc_name=npc_character.name,
+                    npc_state=npc_character.apparent_state,
+                    npc_objectives=npc_objectives_summary,
+                    location=current_location_name,
+                    time_period=current_time_period,
+                    player_name=player_character.name,
+                    player_state=player_apparent_state,
+                    player_objectives=player_objectives_summary,
+                    player_items=player_notable_items_summary,
+                    relationship=relationship_status_text,
+                    npc_memory=npc_memory_summary,
+                    recent_events=recent_game_events_summary,
+                ),
+                prompt_templates.render(
+                    "persuasion_player_state_note", player_state=player_apparent_state
+                ),
+                prompt_templates.render(
+                    "persuasion_player_items_note", player_items=player_notable_items_summary
+                ),
+                prompt_templates.render(
+                    "persuasion_objectives_note", npc_objectives=npc_objectives_summary
+                ),
+            ]
         )
+        prompt = prompt_templates.render(
+            "npc_persuasion",
+            npc_name=npc_character.name,
+            persona=npc_character.persona,
+            situation=situation_summary,
+            player_name=player_character.name,
+            conversation_history=(
+                conversation_context
+                if conversation_context
+                else "No prior conversation in this session."
+            ),
+            statement=player_persuasive_statement,
+            check_result=persuasion_skill_check_result_text,
+        )
+        return prompt, f"NPC persuasion response for {npc_character.name}"
 
+    def _record_persuasion_exchange(
+        self, npc_character, player_character, player_persuasive_statement, ai_text
+    ):
         # Add to history (persuasion attempt is also a form of dialogue)
         if not ai_text.startswith("(OOC:"):
             npc_character.add_to_history(
@@ -1174,6 +2366,64 @@ class GeminiAPI:
             player_character.add_to_history(npc_character.name, npc_character.name, ai_text)
         return ai_text
 
+    def get_npc_dialogue_persuasion_attempt(
+        self,
+        npc_character,
+        player_character,
+        player_persuasive_statement,
+        current_location_name,
+        current_time_period,
+        relationship_status_text,
+        npc_memory_summary,
+        player_apparent_state,
+        player_notable_items_summary,
+        recent_game_events_summary,
+        npc_objectives_summary,
+        player_objectives_summary,
+        persuasion_skill_check_result_text,
+        use_cache=False,
+    ):
+        prompt, context = self._npc_persuasion_request(
+            npc_character,
+            player_character,
+            player_persuasive_statement,
+            current_location_name,
+            current_time_period,
+            relationship_status_text,
+            npc_memory_summary,
+            player_apparent_state,
+            player_notable_items_summary,
+            recent_game_events_summary,
+            npc_objectives_summary,
+            player_objectives_summary,
+            persuasion_skill_check_result_text,
+        )
+        ai_text = self._generate_content_with_fallback(
+            prompt, context, use_cache=use_cache, call_site="npc_persuasion"
+        )
+        return self._record_persuasion_exchange(
+            npc_character, player_character, player_persuasive_statement, ai_text
+        )
+
+    def _enhanced_observation_request(
+        self,
+        character_obj,
+        target_name,
+        target_category,
+        base_description,
+        skill_check_context,
+    ):
+        prompt = prompt_templates.render(
+            "enhanced_observation",
+            character_name=character_obj.name,
+            character_state=character_obj.apparent_state,
+            target_name=target_name,
+            target_category=target_category,
+            base_description=base_description,
+            skill_check_context=skill_check_context,
+        )
+        return prompt, f"enhanced observation of {target_name}"
+
     def get_enhanced_observation(
         self,
         character_obj,
@@ -1181,51 +2431,65 @@ class GeminiAPI:
         target_category,
         base_description,
         skill_check_context,
+        use_cache=True,
     ):
-        prompt = f"""
-        **Roleplay Mandate: Provide a subtle, insightful observation for {character_obj.name}, reflecting a successful Observation skill check.**
-        **Character Making Observation:** {character_obj.name} (State: {character_obj.apparent_state})
-        **Target of Observation:** '{target_name}' (Category: {target_category})
-        **Base Information Already Known/Visible:** {base_description}
-        **Specific Skill Check Context from Game:** {skill_check_context}
-
-        **Your Task:**
-        Generate a brief (1-2 sentences) additional detail that {character_obj.name} notices due to their keen observation. This detail should NOT be obvious and should provide a deeper understanding, hint, or nuance related to the target. It should feel like a reward for a successful skill check.
-        - If observing a *person*, focus on subtle body language, a faint scent, an almost hidden object on them, a flicker of emotion they try to hide.
-        - If observing an *item*, focus on a tiny inscription, wear patterns indicating unusual use, a faint smell, a hidden compartment, its true material or age if disguised.
-        - If observing *scenery*, focus on something out of place, a sign of recent passage, a hidden vantage point, an unusual silence or sound.
-
-        **Response Guidelines:**
-        1.  **Subtlety is Key:** Avoid revealing major secrets directly. Hint, imply, suggest.
-        2.  **Dostoevskian Tone:** Maintain the game's atmosphere.
-        3.  **Concise:** 1-2 sentences.
-        4.  **Direct Observation:** Output only the observed detail, not {character_obj.name}'s thoughts about it, unless the thought *is* the observation (e.g., "It strikes you that the stain is much fresher than the surrounding grime.").
-        5.  **No OOC or Meta-Commentary.**
-
-        Generate the enhanced observation now:
-        """
+        prompt, context = self._enhanced_observation_request(
+            character_obj,
+            target_name,
+            target_category,
+            base_description,
+            skill_check_context,
+        )
         return self._generate_content_with_fallback(
-            prompt, f"enhanced observation of {target_name}"
+            prompt, context, use_cache=use_cache, call_site="enhanced_observation"
         )
 
+    async def get_enhanced_observation_async(
+        self,
+        character_obj,
+        target_name,
+        target_category,
+        base_description,
+        skill_check_context,
+        use_cache=True,
+    ):
+        prompt, context = self._enhanced_observation_request(
+            character_obj,
+            target_name,
+            target_category,
+            base_description,
+            skill_check_context,
+        )
+        return await self._generate_content_with_fallback_async(
+            prompt, context, use_cache=use_cache, call_site="enhanced_observation"
+        )
+
+    def _street_life_event_description_request(
+        self,
+        location_name,
+        time_period,
+        player_character_context="present in the area",
+    ):
+        prompt = prompt_templates.render(
+            "street_life_event_description",
+            location=location_name,
+            time_period=time_period,
+            player_context=player_character_context,
+        )
+        return prompt, f"street life event in {location_name}"
+
     def get_street_life_event_description(
-        self, location_name, time_period, player_character_context="present in the area"
+        self,
+        location_name,
+        time_period,
+        player_character_context="present in the area",
+        use_cache=True,
     ):
-        prompt = f"""
-        **Task: Generate a brief, atmospheric 'street life' event (1-2 sentences) for St. Petersburg.**
-        **Setting:** {location_name}, {time_period}.
-        **Context:** The player character ({player_character_context}) is present but not directly involved.
-        **Examples (do not repeat these verbatim):**
-        - A ragged beggar insistently pleads with a well-dressed passerby, only to be scornfully ignored.
-        - Two market vendors shout loudly at each other over the price of radishes, attracting a small crowd.
-        - A stray dog, ribs showing, darts through the crowd, snatching a dropped piece of bread.
-        - Children's laughter echoes briefly from a nearby alleyway before being swallowed by the city's drone.
-        - A lone musician plays a mournful tune on a battered accordion, his eyes closed.
-        **Guidelines:**
-        - Evocative and Dostoevskian in tone.
-        - Focus on sensory details or brief human interactions.
-        - Should *not* require player interaction or be plot-critical. Purely atmospheric.
-        - Output only the 1-2 sentence description of the event.
-        Generate the street life event description now:
-        """
-        return self._generate_content_with_fallback(prompt, f"street life event in {location_name}")
+        prompt, context = self._street_life_event_description_request(
+            location_name,
+            time_period,
+            player_character_context,
+        )
+        return self._generate_content_with_fallback(
+            prompt, context, use_cache=use_cache, call_site="street_life_event_description"
+        )
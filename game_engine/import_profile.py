@@ -0,0 +1,61 @@
+# import_profile.py
+"""Summarize `python -X importtime` output to see what the game spends launch time importing."""
+
+import os
+import subprocess
+import sys
+
+# What main.py imports before the title screen, plus the SDK it loads in the background.
+STARTUP_IMPORTS = ("game_engine.game_state", "google.genai")
+
+
+def parse_importtime(stderr_text):
+    """Parse -X importtime lines into (module, self_us, cumulative_us, depth) tuples."""
+    entries = []
+    for line in stderr_text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # The column header line.
+        raw_name = parts[2]
+        name = raw_name.lstrip(" ")
+        depth = max(0, (len(raw_name) - len(name) - 1) // 2)
+        entries.append((name.rstrip(), self_us, cumulative_us, depth))
+    return entries
+
+
+def format_import_profile(entries, top=15):
+    if not entries:
+        return "No import timings were recorded."
+    top_level_depth = min(depth for _, _, _, depth in entries)
+    total_us = sum(cum for _, _, cum, depth in entries if depth == top_level_depth)
+    lines = [
+        f"Import profile: {total_us / 1000:.1f} ms across {len(entries)} modules.",
+        f"{'cumulative ms':>14} {'self ms':>9}  module",
+    ]
+    for name, self_us, cumulative_us, _ in sorted(entries, key=lambda e: e[2], reverse=True)[
+        :top
+    ]:
+        lines.append(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+    return "\n".join(lines)
+
+
+def profile_imports(modules=STARTUP_IMPORTS, top=15):
+    """Import modules in a fresh interpreter under -X importtime; returns the report text."""
+    statements = "\n".join(
+        f"try:\n    import {module}\nexcept ImportError:\n    pass" for module in modules
+    )
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statements],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return format_import_profile(parse_importtime(result.stderr), top=top)
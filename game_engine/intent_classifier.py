@@ -0,0 +1,196 @@
+# intent_classifier.py
+"""Deterministic intent matching for free-form input that the command grammar misses."""
+
+import re
+
+LOCAL_INTENT_CONFIDENCE_THRESHOLD = 0.8
+
+VERB_LEXICON = {
+    "move": {
+        "go",
+        "head",
+        "walk",
+        "run",
+        "hurry",
+        "travel",
+        "wander",
+        "return",
+        "enter",
+        "proceed",
+        "stroll",
+        "rush",
+        "flee",
+    },
+    "take": {"grab", "take", "pick", "snatch", "pocket", "collect", "seize", "lift", "steal"},
+    "examine": {"look", "examine", "inspect", "study", "observe", "check", "scrutinize", "peer"},
+    "talk": {"talk", "speak", "chat", "greet", "address", "converse", "ask", "question"},
+}
+
+# Words that carry no target information ("head over to the tavern").
+STOPWORDS = {
+    "a",
+    "an",
+    "the",
+    "to",
+    "at",
+    "over",
+    "into",
+    "in",
+    "inside",
+    "on",
+    "onto",
+    "up",
+    "down",
+    "toward",
+    "towards",
+    "with",
+    "for",
+    "of",
+    "back",
+    "that",
+    "this",
+    "some",
+    "please",
+    "i",
+    "me",
+    "my",
+    "let",
+    "lets",
+    "will",
+    "want",
+    "now",
+    "quickly",
+    "carefully",
+    "closely",
+    "again",
+    "around",
+    "across",
+    "along",
+    "through",
+    "off",
+    "out",
+    "and",
+}
+
+NEGATIONS = {"not", "dont", "don't", "never", "no", "without", "nor", "avoid", "refuse"}
+
+_POSSESSIVE = re.compile(r"['’]s\b")
+_WORD = re.compile(r"[^\W_]+(?:'t)?")
+
+
+def tokenize(text):
+    """Lower-case word tokens with possessives stripped ("Sonya's Room" -> sonya, room)."""
+    return _WORD.findall(_POSSESSIVE.sub("", str(text).lower()))
+
+
+class LocalIntentClassifier:
+    """Resolve simple move/take/examine/talk requests against the current scene.
+
+    classify() mirrors NaturalLanguageParser.parse_player_intent's payload so
+    callers can treat both the same way; resolve() applies the confidence
+    threshold and keeps the short-circuit/escalation counts.
+    """
+
+    def __init__(self, confidence_threshold=LOCAL_INTENT_CONFIDENCE_THRESHOLD):
+        self.confidence_threshold = confidence_threshold
+        self.short_circuits = 0
+        self.escalations = 0
+        self._verb_intents = {
+            verb: intent for intent, verbs in VERB_LEXICON.items() for verb in verbs
+        }
+
+    @staticmethod
+    def _unknown():
+        return {"intent": "unknown", "target": "", "confidence": 0.0}
+
+    @staticmethod
+    def _candidates_for(intent, context):
+        exits = [exit_info.get("name", "") for exit_info in context.get("exits", [])]
+        items = list(context.get("items", []))
+        npcs = list(context.get("npcs", []))
+        inventory = list(context.get("inventory", []))
+        if intent == "move":
+            return exits
+        if intent == "take":
+            return items
+        if intent == "talk":
+            return npcs
+        if intent == "examine":
+            return items + inventory + npcs
+        return []
+
+    @staticmethod
+    def _best_target(content_tokens, candidates):
+        """Return (name, score, ambiguous) for the candidate best covered by the input."""
+        content = set(content_tokens)
+        scored = []
+        for name in candidates:
+            name_tokens = set(tokenize(name)) - STOPWORDS
+            if not name_tokens:
+                continue
+            matched = len(content & name_tokens)
+            if not matched:
+                continue
+            coverage = matched / len(name_tokens)
+            precision = matched / len(content)
+            scored.append((precision * (0.5 + 0.5 * coverage), name))
+        if not scored:
+            return None, 0.0, False
+        scored.sort(key=lambda entry: entry[0], reverse=True)
+        best_score, best_name = scored[0]
+        ambiguous = len(scored) > 1 and scored[1][0] == best_score
+        return best_name, best_score, ambiguous
+
+    def classify(self, input_text, context):
+        tokens = tokenize(input_text or "")
+        if not tokens or NEGATIONS.intersection(tokens):
+            return self._unknown()
+
+        verb_intents = [
+            self._verb_intents[token] for token in tokens if token in self._verb_intents
+        ]
+        if len(set(verb_intents)) > 1:
+            return self._unknown()
+        # A bare destination ("the tavern") reads as movement; items and people need a verb.
+        intent = verb_intents[0] if verb_intents else "move"
+        base_confidence = 0.5 if verb_intents else 0.4
+
+        content_tokens = [
+            token for token in tokens if token not in STOPWORDS and token not in self._verb_intents
+        ]
+        if not content_tokens:
+            return self._unknown()
+        target, score, ambiguous = self._best_target(
+            content_tokens, self._candidates_for(intent, context)
+        )
+        if not target:
+            return self._unknown()
+        confidence = base_confidence + 0.5 * score
+        if ambiguous:
+            confidence *= 0.6
+        return {"intent": intent, "target": target, "confidence": round(confidence, 3)}
+
+    def resolve(self, input_text, context):
+        """Return a confident intent payload, or None when Gemini should decide."""
+        payload = self.classify(input_text, context)
+        if payload["intent"] != "unknown" and payload["confidence"] >= self.confidence_threshold:
+            self.short_circuits += 1
+            return payload
+        self.escalations += 1
+        return None
+
+    def stats(self):
+        lookups = self.short_circuits + self.escalations
+        return {
+            "short_circuits": self.short_circuits,
+            "escalations": self.escalations,
+            "short_circuit_rate": (self.short_circuits / lookups) if lookups else 0.0,
+        }
+
+    def format_status(self):
+        stats = self.stats()
+        lookups = stats["short_circuits"] + stats["escalations"]
+        return (
+            f"Commands resolved locally: {stats['short_circuits']} of {lookups} "
+            f"({stats['short_circuit_rate']:.0%}); {stats['escalations']} went to Gemini."
+        )
@@ -41,17 +41,37 @@ class ItemInteractionHandler:
         current_location_name = self.current_location_name or "Unknown Location"
         self._print_color(f"You examine the {item_name}:", Colors.GREEN)
         gen_desc = None
+        detailed_observation = None
         base_desc_for_skill_check = item_default.get("description", "An ordinary item.")
+        observation_succeeded = player_character.check_skill("Observation", 1)
 
         if not self.low_ai_data_mode and self.gemini_api.model:
-            gen_desc = self.gemini_api.get_item_interaction_description(
-                player_character,
-                item_name,
-                item_default,
-                action_context,
-                current_location_name,
-                self.world_manager.get_current_time_period(),
-            )
+            # The closer look builds on the item's own description rather than the generated
+            # thought, so both requests can be in flight at once.
+            generation_requests = [
+                self.gemini_api.get_item_interaction_description_async(
+                    player_character,
+                    item_name,
+                    item_default,
+                    action_context,
+                    current_location_name,
+                    self.world_manager.get_current_time_period(),
+                )
+            ]
+            if observation_succeeded:
+                generation_requests.append(
+                    self.gemini_api.get_enhanced_observation_async(
+                        player_character,
+                        target_name=item_name,
+                        target_category="item",
+                        base_description=base_desc_for_skill_check,
+                        skill_check_context=observation_context,
+                    )
+                )
+            results = self.gemini_api.gather_generations(*generation_requests)
+            gen_desc = results[0]
+            if observation_succeeded:
+                detailed_observation = results[1]
 
         if (
             gen_desc is not None
@@ -60,7 +80,6 @@ class ItemInteractionHandler:
         ):
             gen_desc = self._apply_verbosity(gen_desc)
             self._print_color(f'"{gen_desc}"', Colors.GREEN)
-            base_desc_for_skill_check = gen_desc
             self._remember_ai_output(gen_desc, "item_inspection")
         else:
             if (
@@ -75,20 +94,10 @@ class ItemInteractionHandler:
 
         self._display_item_properties(item_default)
 
-        if player_character.check_skill("Observation", 1):
+        if observation_succeeded:
             self._print_color(
                 "(Your keen eye picks up on finer details...)", Colors.CYAN + Colors.DIM
             )
-            detailed_observation = None
-            if not self.low_ai_data_mode and self.gemini_api.model:
-                detailed_observation = self.gemini_api.get_enhanced_observation(
-                    player_character,
-                    target_name=item_name,
-                    target_category="item",
-                    base_description=base_desc_for_skill_check,
-                    skill_check_context=observation_context,
-                )
-
             if (
                 detailed_observation is None
                 or (
@@ -1244,7 +1253,7 @@ class ItemInteractionHandler:
                     current_location_name,
                     self.world_manager.get_current_time_period(),
                     relationship_text,
-                    target_npc.get_player_memory_summary(self.game_time),
+                    target_npc.get_player_memory_summary(self.game_time, query=dialogue_prompt),
                     player_character.apparent_state,
                     player_character.get_notable_carried_items_summary(),
                     self._get_recent_events_summary(),
@@ -0,0 +1,73 @@
+# location_index.py
+"""Inverted index from location name to the characters currently there."""
+
+from .character_module import Character
+
+
+class LocationIndex:
+    """Answer "who is here" without scanning every character.
+
+    Character objects report their own moves through Character.current_location,
+    so the index stays current between rebuilds. Anything else placed in the
+    character mapping (test doubles, plain namespaces) cannot report moves and
+    is checked directly on each lookup instead.
+    """
+
+    def __init__(self):
+        self._occupants = {}
+        self._rank = {}
+        self._untracked = []
+        self._source = None
+        self._source_size = 0
+
+    def sync(self, characters):
+        """Rebuild if the character mapping was replaced or gained/lost entries."""
+        if characters is self._source and len(characters) == self._source_size:
+            return
+        self.rebuild(characters)
+
+    def rebuild(self, characters):
+        self._detach()
+        self._occupants = {}
+        self._rank = {}
+        self._untracked = []
+        self._source = characters
+        self._source_size = len(characters)
+        for rank, char_obj in enumerate(characters.values()):
+            if id(char_obj) in self._rank:
+                continue
+            self._rank[id(char_obj)] = rank
+            if isinstance(char_obj, Character):
+                char_obj.add_location_observer(self._on_character_moved)
+                self._place(char_obj, char_obj.current_location)
+            else:
+                self._untracked.append(char_obj)
+
+    def characters_at(self, location_name):
+        """Characters at location_name, in the order of the character mapping."""
+        present = list(self._occupants.get(location_name, {}).values())
+        present.extend(
+            char_obj
+            for char_obj in self._untracked
+            if getattr(char_obj, "current_location", None) == location_name
+        )
+        present.sort(key=lambda char_obj: self._rank.get(id(char_obj), 0))
+        return present
+
+    def _place(self, char_obj, location_name):
+        self._occupants.setdefault(location_name, {})[id(char_obj)] = char_obj
+
+    def _on_character_moved(self, char_obj, old_location, new_location):
+        if id(char_obj) not in self._rank:
+            return
+        previous = self._occupants.get(old_location)
+        if previous is not None:
+            previous.pop(id(char_obj), None)
+            if not previous:
+                del self._occupants[old_location]
+        self._place(char_obj, new_location)
+
+    def _detach(self):
+        for occupants in self._occupants.values():
+            for char_obj in occupants.values():
+                char_obj.remove_location_observer(self._on_character_moved)
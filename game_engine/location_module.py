@@ -4,10 +4,15 @@ import logging  # It's good practice to log errors
 
 
 def load_locations_data(data_path=None):
-    """Loads location data from a JSON file."""
+    """Loads location data from the data bundle if it is current, else from JSON."""
     from .game_config import get_data_path
 
     if data_path is None:
+        from .data_bundle import bundled_data
+
+        bundled_locations = bundled_data("locations")
+        if bundled_locations is not None:
+            return bundled_locations
         data_path = get_data_path("data/locations.json")
     try:
         with open(data_path, "r", encoding="utf-8") as f:
@@ -23,10 +28,15 @@ def load_locations_data(data_path=None):
 _LOCATIONS_DATA = None
 
 
-def __getattr__(name):
+def get_locations_data():
+    """LOCATIONS_DATA, loaded on first use and then kept for the process."""
     global _LOCATIONS_DATA
+    if _LOCATIONS_DATA is None:
+        _LOCATIONS_DATA = load_locations_data()
+    return _LOCATIONS_DATA
+
+
+def __getattr__(name):
     if name == "LOCATIONS_DATA":
-        if _LOCATIONS_DATA is None:
-            _LOCATIONS_DATA = load_locations_data()
-        return _LOCATIONS_DATA
+        return get_locations_data()
     raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
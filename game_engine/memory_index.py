@@ -0,0 +1,144 @@
+# memory_index.py
+"""BM25 index over an NPC's memories of the player, with recency decay."""
+
+import bisect
+import heapq
+import math
+import re
+from collections import Counter, deque
+
+from .game_config import MEMORY_RECENCY_FLOOR, MEMORY_RECENCY_HALF_LIFE_TURNS
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+_TOKEN = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by did do for from had has have he her him his i in is it its "
+    "me my no not of on or she so that the their them they this to was we were what with you "
+    "your player said something".split()
+)
+
+
+def tokenize(text):
+    """Lower-cased words of text worth matching on: no stopwords, no single letters."""
+    return [
+        token.strip("'")
+        for token in _TOKEN.findall(text.lower())
+        if len(token.strip("'")) > 1 and token.strip("'") not in STOPWORDS
+    ]
+
+
+def _recency_key(memory):
+    """The order get_player_memory_summary has always used: newest turn, then strongest feeling."""
+    if not isinstance(memory, dict):
+        return (0, 0)
+    return (memory.get("turn", 0), abs(memory.get("sentiment_impact", 0)))
+
+
+class MemoryIndex:
+    """Answer "which memories matter for what the player just said" without scanning them all.
+
+    Memories are indexed as they are added and dropped as the oldest is evicted,
+    so the postings, document frequencies and average length that BM25 needs are
+    kept current incrementally. A query only scores memories sharing a term with
+    it; the most recent memories are read off an order kept sorted on insert.
+    """
+
+    def __init__(self, describe):
+        self._describe = describe
+        self._postings = {}  # term -> {doc id: term frequency}
+        self._docs = {}  # doc id -> (memory, terms, length, recency key)
+        self._arrival = deque()  # doc ids, oldest first
+        self._by_recency = []  # (turn, |sentiment|, -doc id), ascending
+        self._total_length = 0
+        self._next_id = 0
+        self.source = None
+        self.source_size = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def sync(self, memories):
+        """Rebuild if the memory list was replaced or changed other than through add()/evict()."""
+        if memories is self.source and len(memories) == self.source_size:
+            return
+        self.rebuild(memories)
+
+    def rebuild(self, memories):
+        self._postings = {}
+        self._docs = {}
+        self._arrival = deque()
+        self._by_recency = []
+        self._total_length = 0
+        self.source = memories
+        self.source_size = 0
+        for memory in memories:
+            self.add(memory)
+
+    def _text(self, memory):
+        if not isinstance(memory, dict):
+            return str(memory)
+        content = memory.get("content", {})
+        # The full values as well as the description, which truncates what the player said.
+        values = content.values() if isinstance(content, dict) else [content]
+        return " ".join([self._describe(memory), *(str(value) for value in values)])
+
+    def add(self, memory):
+        doc_id = self._next_id
+        self._next_id += 1
+        terms = Counter(tokenize(self._text(memory)))
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        length = sum(terms.values())
+        key = _recency_key(memory)
+        self._docs[doc_id] = (memory, tuple(terms), length, key)
+        self._arrival.append(doc_id)
+        # Ties go to the earlier memory, as the stable sort in the old summary did.
+        bisect.insort(self._by_recency, (*key, -doc_id))
+        self._total_length += length
+        self.source_size += 1
+
+    def evict_oldest(self):
+        doc_id = self._arrival.popleft()
+        _, terms, length, key = self._docs.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        entry = (*key, -doc_id)
+        del self._by_recency[bisect.bisect_left(self._by_recency, entry)]
+        self._total_length -= length
+        self.source_size -= 1
+
+    def most_recent(self, count):
+        """Up to count memories, newest (then most strongly felt) first."""
+        if count <= 0:
+            return []
+        return [self._docs[-entry[2]][0] for entry in reversed(self._by_recency[-count:])]
+
+    def relevant(self, query, current_turn, count):
+        """Up to count memories matching query, best BM25 score times recency decay first."""
+        query_terms = set(tokenize(query or ""))
+        if not query_terms or not self._docs or count <= 0:
+            return []
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count or 1
+        scores = {}
+        for term in query_terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                length = self._docs[doc_id][2]
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                scores[doc_id] = (
+                    scores.get(doc_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                )
+        for doc_id in scores:
+            age = max(0, current_turn - self._docs[doc_id][3][0])
+            decay = 0.5 ** (age / MEMORY_RECENCY_HALF_LIFE_TURNS)
+            scores[doc_id] *= MEMORY_RECENCY_FLOOR + (1 - MEMORY_RECENCY_FLOOR) * decay
+        best = heapq.nlargest(count, scores, key=lambda doc_id: (scores[doc_id], doc_id))
+        return [self._docs[doc_id][0] for doc_id in best]
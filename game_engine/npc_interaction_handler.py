@@ -9,6 +9,7 @@ from .game_config import (
     NEGATIVE_KEYWORDS,
     TIME_UNITS_PER_PLAYER_ACTION,
     HIGHLY_NOTABLE_ITEMS_FOR_MEMORY,
+    CONVERSATION_SUMMARY_BATCH_LINES,
 )
 
 
@@ -25,6 +26,8 @@ class NPCInteractionHandler:
     last_significant_event_summary: str | None = None
     player_notoriety_level: float = 0.0
     current_conversation_log: list[str] = []
+    conversation_summarizer: Any = None
+    low_ai_data_mode: bool = False
 
     def check_conversation_conclusion(self, text):
         for phrase_regex in CONCLUDING_PHRASES:
@@ -32,6 +35,20 @@ class NPCInteractionHandler:
                 return True
         return False
 
+    def _summarize_conversation_history(self, target_npc, min_lines=1):
+        """Have the background summarizer fold both sides' evicted history lines into summaries.
+
+        In low AI mode they are folded in extractively by Character instead.
+        """
+        if (
+            self.conversation_summarizer is None
+            or self.low_ai_data_mode
+            or not self.gemini_api.model
+        ):
+            return
+        self.conversation_summarizer.schedule(target_npc, self.player_character.name, min_lines)
+        self.conversation_summarizer.schedule(self.player_character, target_npc.name, min_lines)
+
     def _record_npc_post_interaction_memories(self, target_npc, context_str):
         """Records NPC memories of the player's unusual state and notable inventory items after an interaction."""
         unusual_states = [
@@ -127,6 +144,12 @@ class NPCInteractionHandler:
                 self.current_conversation_log.append(initial_greeting_text)
                 if len(self.current_conversation_log) > MAX_CONVERSATION_LOG_LINES:
                     self.current_conversation_log.pop(0)
+            # One chat per conversation, so each line sends only what changed.
+            conversation = (
+                self.gemini_api.open_conversation(target_npc, self.player_character)
+                if self.gemini_api.model
+                else None
+            )
             conversation_active = True
             while conversation_active:
                 player_dialogue = self._input_color(
@@ -169,6 +192,9 @@ class NPCInteractionHandler:
                 if not player_dialogue:
                     self._print_color("You remain silent for a moment.", Colors.DIM)
                 used_ai_dialogue = False
+                printer = self._streaming_printer(
+                    f'{target_npc.name}: {Colors.RESET}"', Colors.YELLOW, suffix='"'
+                )
                 if self.gemini_api.model:
                     ai_response = self.gemini_api.get_npc_dialogue(
                         target_npc,
@@ -177,12 +203,16 @@ class NPCInteractionHandler:
                         self.current_location_name,
                         self.world_manager.get_current_time_period(),
                         self.get_relationship_text(target_npc.relationship_with_player),
-                        target_npc.get_player_memory_summary(self.game_time),
+                        target_npc.get_player_memory_summary(
+                            self.game_time, query=player_dialogue
+                        ),
                         self.player_character.apparent_state,
                         self.player_character.get_notable_carried_items_summary(),
                         self._get_recent_events_summary(),
                         self._get_objectives_summary(target_npc),
                         self._get_objectives_summary(self.player_character),
+                        on_text=printer.feed,
+                        session=conversation,
                     )
                     used_ai_dialogue = True
                 else:
@@ -206,8 +236,11 @@ class NPCInteractionHandler:
                     NEGATIVE_KEYWORDS,
                     self.game_time,
                 )
-                self._print_color(f"{target_npc.name}: ", Colors.YELLOW, end="")
-                print(f'"{ai_response}"')
+                if printer.streamed:
+                    printer.finish(ai_response)
+                else:
+                    self._print_color(f"{target_npc.name}: ", Colors.YELLOW, end="")
+                    print(f'"{ai_response}"')
                 logged_ai_response = f'{target_npc.name}: "{ai_response}"'
                 self.current_conversation_log.append(logged_ai_response)
                 if used_ai_dialogue and not (
@@ -225,9 +258,13 @@ class NPCInteractionHandler:
                         Colors.MAGENTA,
                     )
                     conversation_active = False
+                self._summarize_conversation_history(target_npc, CONVERSATION_SUMMARY_BATCH_LINES)
                 self.world_manager.advance_time(TIME_UNITS_PER_PLAYER_ACTION)
                 if self.event_manager.check_and_trigger_events():
                     self.last_significant_event_summary = "an event occurred during conversation."
+            if conversation is not None:
+                conversation.close()
+            self._summarize_conversation_history(target_npc)
             self._record_npc_post_interaction_memories(target_npc, "during conversation")
             if (
                 self.player_character.name == "Rodion Raskolnikov"
@@ -288,7 +325,9 @@ class NPCInteractionHandler:
                 relationship_status_text=self.get_relationship_text(
                     target_npc.relationship_with_player
                 ),
-                npc_memory_summary=target_npc.get_player_memory_summary(self.game_time),
+                npc_memory_summary=target_npc.get_player_memory_summary(
+                    self.game_time, query=statement_text
+                ),
                 player_apparent_state=self.player_character.apparent_state,
                 player_notable_items_summary=self.player_character.get_notable_carried_items_summary(),
                 recent_game_events_summary=self._get_recent_events_summary(),
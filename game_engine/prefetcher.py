@@ -0,0 +1,152 @@
+# prefetcher.py
+"""Background generation of atmospheric text for the locations the player can reach next."""
+
+import logging
+import queue
+import threading
+from collections import OrderedDict
+
+DEFAULT_PREFETCH_MAX_ENTRIES = 16
+
+
+class AtmospherePrefetcher:
+    """Warm atmospheric details for adjacent locations while the player is typing.
+
+    Entries are keyed on every input that shapes the prompt, so a changed time
+    period or apparent state simply misses; discard_stale() also drops those
+    entries eagerly so the bounded store holds only text that can still be used.
+    """
+
+    def __init__(self, gemini_api, max_entries=DEFAULT_PREFETCH_MAX_ENTRIES):
+        self.gemini_api = gemini_api
+        self.max_entries = max(1, int(max_entries))
+        self._entries = OrderedDict()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._jobs = queue.Queue()
+        self._worker = None
+        self._conditions = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(
+        player_character, location_name, time_period, recent_event_summary, objective_focus
+    ):
+        return (
+            location_name,
+            time_period,
+            player_character.apparent_state,
+            recent_event_summary,
+            objective_focus,
+        )
+
+    def discard_stale(self, time_period, apparent_state):
+        with self._lock:
+            self._conditions = (time_period, apparent_state)
+            for key in [k for k in self._entries if (k[1], k[2]) != self._conditions]:
+                del self._entries[key]
+
+    def prefetch(
+        self, player_character, location_name, time_period, recent_event_summary, objective_focus
+    ):
+        self.discard_stale(time_period, player_character.apparent_state)
+        key = self.make_key(
+            player_character, location_name, time_period, recent_event_summary, objective_focus
+        )
+        with self._lock:
+            if key in self._entries or key in self._pending:
+                return
+            self._pending.add(key)
+        self._jobs.put(
+            (
+                key,
+                player_character,
+                location_name,
+                time_period,
+                recent_event_summary,
+                objective_focus,
+            )
+        )
+        self._ensure_worker()
+
+    def take(
+        self, player_character, location_name, time_period, recent_event_summary, objective_focus
+    ):
+        """Return (and consume) prefetched text for these inputs, or None."""
+        self.discard_stale(time_period, player_character.apparent_state)
+        key = self.make_key(
+            player_character, location_name, time_period, recent_event_summary, objective_focus
+        )
+        with self._lock:
+            text = self._entries.pop(key, None)
+            if text is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return text
+
+    def wait_until_idle(self):
+        self._jobs.join()
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name="atmosphere-prefetch", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                self._generate(*job)
+            finally:
+                self._jobs.task_done()
+
+    def _generate(
+        self,
+        key,
+        player_character,
+        location_name,
+        time_period,
+        recent_event_summary,
+        objective_focus,
+    ):
+        try:
+            with self._lock:
+                if self._conditions and (key[1], key[2]) != self._conditions:
+                    return
+            try:
+                with self.gemini_api.quiet_generations():
+                    text = self.gemini_api.get_atmospheric_details(
+                        player_character,
+                        location_name,
+                        time_period,
+                        recent_event_summary,
+                        objective_focus,
+                        False,
+                    )
+            except Exception as e:
+                logging.warning(f"Atmosphere prefetch for {location_name} failed: {e}")
+                return
+            if not isinstance(text, str) or not text or text.startswith("(OOC:"):
+                return
+            with self._lock:
+                if self._conditions and (key[1], key[2]) != self._conditions:
+                    return
+                self._entries[key] = text
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
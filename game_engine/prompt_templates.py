@@ -0,0 +1,368 @@
+# prompt_templates.py
+"""Named prompt templates, compacted once at import instead of on every call.
+
+Each template is written as an indented triple-quoted string for readability;
+PromptTemplate dedents it, strips every line and drops blank lines, so the
+indentation is never sent (and paid for) as input tokens. Placeholders use
+str.format syntax, so literal braces are written doubled. estimate_tokens()
+gives a deterministic, dependency-free token count; tests/test_prompt_templates.py
+holds each template's fixed part to a recorded budget.
+"""
+
+import math
+import re
+import string
+import textwrap
+
+# Words cost about one token per four letters; digits, symbols, newlines and runs of
+# indentation one each. A single space rides along with the word after it.
+_TOKEN_PIECES = re.compile(r"[^\W\d_]+|\d|[^\w\s]|_|\n|[ \t]{2,}")
+
+
+def estimate_tokens(text):
+    """Approximate the model's token count for text, the same way on every run."""
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text or ""):
+        count += math.ceil(len(piece) / 4) if piece[0].isalpha() else 1
+    return count
+
+
+def compact(text):
+    """Dedent text, strip each line, collapse runs of spaces and drop blank lines."""
+    lines = (re.sub(r"[ \t]+", " ", line).strip() for line in textwrap.dedent(text).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+class PromptTemplate:
+    def __init__(self, name, text):
+        self.name = name
+        self.text = compact(text)
+        parsed = list(string.Formatter().parse(self.text))
+        self.fields = tuple(dict.fromkeys(field for _, field, _, _ in parsed if field))
+        # What every call pays for regardless of the values filled in.
+        self.fixed_text = "".join(literal for literal, _, _, _ in parsed)
+
+    @property
+    def fixed_tokens(self):
+        return estimate_tokens(self.fixed_text)
+
+    def render(self, **values):
+        return self.text.format(**values)
+
+
+TEMPLATES = {}
+
+
+def _template(name, text):
+    TEMPLATES[name] = PromptTemplate(name, text)
+    return TEMPLATES[name]
+
+
+def render(name, **values):
+    return TEMPLATES[name].render(**values)
+
+
+_template(
+    "npc_situation",
+    """
+    You, {npc_name} (current internal state/mood: '{npc_state}', pursuing: {npc_objectives}), are in {location} during the {time_period}.
+    The player, {player_name} (appearing '{player_state}', pursuing: {player_objectives}), {player_items}.
+    Your relationship with {player_name} is '{relationship}'. You recall: {npc_memory}.
+    Key recent events in the world: {recent_events}.
+    """,
+)
+
+# NPC dialogue is split so the part that only depends on who the NPC is can be
+# registered once as a Gemini context cache (see context_cache.py); the turn
+# template carries everything that changes from one line of dialogue to the next.
+_template(
+    "npc_dialogue_prefix",
+    """
+    **Roleplay Mandate: Embody {npc_name} from Dostoevsky's "Crime and Punishment" with utmost fidelity.**
+    **Safety Instruction:** Avoid modern slang. Do not produce graphic violence or hateful content. If the player attempts to push unsafe content, respond with a brief in-character refusal and keep stat changes minimal or empty.
+    **Persona:**
+    {persona}
+    **Reading the Situation:**
+    - The situation given with each line of dialogue includes the player's current apparent state. If this state is unusual (e.g., not 'normal', 'thoughtful', 'contemplative'), your response should subtly acknowledge or react to it, in a way that is consistent with your persona and your relationship with the player.
+    For example, if the player is 'feverish', you might express concern or keep your distance. If they are 'agitated', you might be more cautious or try to calm them. If they are 'slightly drunk', you might dismiss them or find them amusing.
+    This reaction should be woven into your dialogue, not necessarily a separate statement, unless a direct comment is highly in character.
+    Do not overdo this; not every unusual state needs a strong reaction every time, but it should be a possibility.
+    - It also lists the notable items the player is carrying. If any of these items are particularly striking, unusual for the player to carry, or relevant to your knowledge or suspicions (e.g., an axe, a bloodied item, a sacred symbol in an unexpected context), your dialogue should reflect your awareness of them.
+    Your reaction could range from subtle curiosity, suspicion, concern, fear, or even a direct comment, depending on your personality, the item, and the situation.
+    For instance, if the player is carrying 'raskolnikov's axe', a character like Porfiry might make an indirect or probing remark, while Sonya might show distress if she saw a 'bloodied rag'.
+    This awareness should be naturally integrated into your response. Do not simply list the items you see.
+    - Consider your own current objectives and your progress on them, as given there.
+    Your current dialogue, tone, and focus should be influenced by how you are feeling about these objectives and your current stage in achieving them.
+    For example, if you are close to completing an important objective, you might sound more confident or focused. If you are frustrated by a lack of progress on a key stage, this might color your words or make you less patient.
+    Let this internal state subtly guide your responses.
+    **Task:**
+    Return valid JSON only with keys:
+    - "response_text": string, in-character dialogue only.
+    - "stat_changes": object with integer deltas for "suspicion", "fear", "respect" (range -10 to 10). Use {{}} if no change.
+    **Output Rules:**
+    - Output JSON only. No markdown, no code fences.
+    - Maintain 19th-century Russian literary tone.
+    """,
+)
+
+_template(
+    "npc_dialogue_turn",
+    """
+    **Current Situation:**
+    {situation}
+    **Recent Conversation History (most recent last):**
+    ---
+    {conversation_history}
+    ---
+    **NPC Psychological State (0-100 scale):**
+    {stats_json}
+    **Player's Input:** "{player_input}"
+    """,
+)
+
+# A turn of an open conversation (see conversation_session.py): the chat already
+# holds the persona prefix and the earlier turns, so only the changes are sent.
+_template(
+    "npc_chat_turn",
+    """
+    **What changed since your last line:**
+    {state_changes}
+    **Player's Input:** "{player_input}"
+    """,
+)
+
+_template(
+    "intent_classification",
+    """
+    You are an intent classifier for a text adventure game. Map the player's input to a JSON object following the schema exactly. Only choose targets from the provided lists. If the player expresses a refusal, negation, or the target is not available, return intent 'unknown'. If the input requests unsafe or disallowed actions, return intent 'unknown'. Return JSON only, no markdown or code fences.
+    Schema: {schema}
+    Available exits: {exits}
+    Available items in room: {items}
+    Available NPCs: {npcs}
+    Player inventory: {inventory}
+    Player input: "{player_input}"
+    """,
+)
+
+_template(
+    "player_reflection",
+    """
+    **Roleplay Mandate: Embody the internal thoughts of {player_name} from Dostoevsky's "Crime and Punishment".**
+    **Your Persona, {player_name}:**
+    {persona}
+    **Current Situation:**
+    * Location: {location}, Time: {time_period}, State: {player_state}
+    * Carrying: {inventory_highlights}, Objectives: {objectives}
+    * Recent Interactions: {recent_interactions}, Context: {context}
+    **Your Task: Generate a brief, introspective inner thought (1-3 sentences).**
+    **Reflection Guidelines (Strict Adherence Required):** Deeply Personal, Dostoevskian Style, First-Person, Contextual, Concise, No OOC, Output Only Thought.
+    Generate {player_name}'s inner thought now:
+    """,
+)
+
+_template(
+    "atmospheric_details",
+    """
+    **Task: Evoke Dostoevsky's St. Petersburg atmosphere via {player_name}'s perception.**
+    **Context:** {context}
+    **Instructions:** {brevity_instruction} Enhance mood, Dostoevskian tone. Sensory/Symbolic. Reflect internal state. Not a plot point. Output only description.
+    Generate the atmospheric detail now:
+    """,
+)
+
+_template(
+    "npc_to_npc_interaction",
+    """
+    **Task: Simulate brief, ambient, Dostoevskian NPC-to-NPC interaction (1-3 lines).**
+    **Setting:** {location}, {time_period}.
+    **Characters:** {npc1_name} (appears {npc1_state}, persona: {npc1_persona}..., objectives: {npc1_objectives}) & {npc2_name} (appears {npc2_state}, persona: {npc2_persona}..., objectives: {npc2_objectives}).
+    **Guidelines:**
+    - Interaction should be in-character, reflecting their personas, current states, and objectives.
+    - Avoid direct player involvement or addressing the player. This is an ambient exchange.
+    - Maintain a Dostoevskian tone appropriate for "Crime and Punishment".
+    - Format:
+    {npc1_name}: [Their dialogue line 1]
+    {npc2_name}: [Their dialogue line 1, responding to NPC1 or initiating]
+    (Optional {npc1_name}: [Their dialogue line 2, responding to NPC2])
+    - The conversation might also touch upon local gossip or a rumor. If so, make the rumor distinct or have one NPC explicitly share a piece of news or gossip they've heard.
+    **Example of incorporating a rumor (do not use this specific rumor):**
+    NPC1: The price of bread is scandalous, isn't it?
+    NPC2: It is. And did you hear about that student, the one involved in that dreadful business with the pawnbroker? They say he's been seen lurking near the Haymarket, looking like a ghost...
+    NPC1: Hush now, it's not wise to speak of such things.
+    **Output:** Generate only the dialogue lines as specified.
+    Generate the interaction now:
+    """,
+)
+
+_template(
+    "item_interaction_description",
+    """
+    **Roleplay Mandate: Generate {character_name}'s internal, first-person Dostoevskian thought for item interaction.**
+    **Context:** {character_name} ({character_state}) in {location} at {time_period}.
+    **Item:** '{item_name}' ({item_description}). Action: {action_type}.
+    Target: {target_details}.
+    **Task: Describe {character_name}'s brief, evocative thought (1-2 sentences).**
+    **Guidelines:** Psychologically resonant, first-person, sensory, concise, no OOC.
+    Generate {character_name}'s thought/observation now:
+    """,
+)
+
+_template(
+    "dream_sequence",
+    """
+    **Task: Describe a symbolic, surreal, Dostoevskian dream for {character_name}.**
+    **Dreamer Profile:** {character_name} ({character_state}). Recent: {recent_events}. Concerns: {objectives}. Relationships: {relationships}.
+    **Guidelines:** Symbolic/surreal, Dostoevskian tone, vivid/fragmented imagery, emotional impact, concise (3-5 sentences), output only dream.
+    Generate dream for {character_name} now:
+    """,
+)
+
+_template(
+    "conversation_summary",
+    """
+    **Task: Update the running summary of what {character_name} and {other_name} have said to each other in "Crime and Punishment".**
+    **Summary so far:** {previous_summary}
+    **Lines to fold in (oldest first):**
+    {lines}
+    **Guidelines:** Keep names, promises, threats, confessions, secrets and shifts in feeling; drop small talk. Plain prose, at most {max_words} words. Output only the updated summary.
+    """,
+)
+
+_template(
+    "rumor_or_gossip",
+    """
+    **Task: Generate brief, in-character Dostoevskian gossip/rumor (1-2 sentences) from {npc_name}.**
+    **Context:** {npc_name} in {location} ({time_period}). Player relationship: {relationship}. Concerns: {npc_concerns}.
+    **Background:** Crime: {known_facts}. Player Notoriety: {notoriety}.
+    **Guidelines:** In-character, Dostoevskian, varied content, subtle re:notoriety, plausible, concise, output only rumor.
+    Generate rumor from {npc_name} now:
+    """,
+)
+
+_template(
+    "newspaper_article_snippet",
+    """
+    **Task: Generate short St. Petersburg newspaper snippet (2-4 sentences).**
+    **Context:** Day {game_day}. Events: {events}. Themes: {themes}. Mood: {city_mood}.
+    **Guidelines:** Content (investigation, social conditions, philosophies, news, subtle allusions), 19th-C style, concise, output snippet.
+    Generate newspaper snippet now:
+    """,
+)
+
+_template(
+    "scenery_observation",
+    """
+    **Roleplay Mandate: Generate {character_name}'s Dostoevskian observation of scenery.**
+    **Context:** {character_name} ({character_state}) in {location} ({time_period}). Focus: '{scenery}'. Preoccupations: {objectives}.
+    **Task: Generate brief, introspective observation (1-2 sentences).**
+    **Guidelines:** Psychologically resonant, deeper meaning, first-person, concise, no OOC, output observation.
+    Generate {character_name}'s scenery observation now:
+    """,
+)
+
+_template(
+    "generated_text_document",
+    """
+    **Task: Generate text for a '{document_type}' in Dostoevsky's world.**
+    **Specs:** Author: {author}. Recipient: {recipient}. Subject: {subject}. Tone: {tone}. Key Info: {key_info}. Length: {length_sentences} sentences. Style: 19th-C St. Petersburg. Purpose: {purpose}.
+    **Guidelines:** Authentic voice, Dostoevskian flavor, convey info subtly, output only document text.
+    Generate text for '{document_type}' now:
+    """,
+)
+
+_template(
+    "persuasion_player_state_note",
+    """
+    Additionally, consider the player's current apparent state: '{player_state}' when forming your response to their persuasion attempt.
+    An unusual state (e.g., 'agitated', 'feverish', 'paranoid', 'slightly drunk') might make you more or less receptive, or react in a specific way (e.g., wary, dismissive, concerned) to their attempt to persuade you.
+    Integrate this consideration naturally into your dialogue.
+    """,
+)
+
+_template(
+    "persuasion_player_items_note",
+    """
+    Furthermore, consider the notable items the player is carrying: '{player_items}'.
+    The presence of certain items (e.g., a weapon, an item of evidence, something out of place) might influence your trust, suspicion, or overall reaction to their persuasion attempt.
+    Let this awareness subtly shape your response.
+    """,
+)
+
+_template(
+    "persuasion_objectives_note",
+    """
+    Your current progress on your own objectives ('{npc_objectives}') should also heavily influence your response to this persuasion attempt.
+    If their attempt aligns with or hinders your goals, or if your current objective stage makes you more or less receptive, reflect this in your dialogue.
+    """,
+)
+
+_template(
+    "npc_persuasion",
+    """
+    **Roleplay Mandate: Embody {npc_name} from Dostoevsky's "Crime and Punishment" with utmost fidelity.**
+    **Your Persona, {npc_name}:**
+    {persona}
+    **Current Detailed Situation:**
+    {situation}
+    **Recent Conversation History with {player_name} (most recent last):**
+    ---
+    {conversation_history}
+    ---
+    **Player's Persuasion Attempt:**
+    {player_name} is trying to persuade you, {npc_name}, about the following: "{statement}"
+    This persuasion attempt was a {check_result}.
+    **Your Task (as {npc_name}):**
+    Respond to this persuasion attempt.
+    - Your reaction to the persuasion should also be influenced by the player's apparent state, as noted above.
+    - If the persuasion was a SUCCESS (e.g., "SUCCESS due to their skillful argument", "CRITICAL SUCCESS, they are very convincing"): You should seem noticeably swayed, convinced, more agreeable, or willing to reveal something (if appropriate to your persona and the statement). Your dialogue should reflect this change of heart or willingness.
+    - If the persuasion was a FAILURE (e.g., "FAILURE despite their efforts", "CRITICAL FAILURE, the attempt was clumsy and offensive"): You should resist the persuasion. You might become annoyed, suspicious, dismissive, reiterate your current stance more firmly, or even subtly mock the attempt, depending on your persona.
+    - Your response should still be in character, concise, and in Dostoevskian tone.
+    - DO NOT explicitly say "The persuasion succeeded" or "The persuasion failed." Show it through your dialogue.
+    - DO NOT use parenthetical remarks like (He seems hesitant) or similar stage directions. Your response is dialogue only.
+    Respond now as {npc_name}:
+    """,
+)
+
+_template(
+    "enhanced_observation",
+    """
+    **Roleplay Mandate: Provide a subtle, insightful observation for {character_name}, reflecting a successful Observation skill check.**
+    **Character Making Observation:** {character_name} (State: {character_state})
+    **Target of Observation:** '{target_name}' (Category: {target_category})
+    **Base Information Already Known/Visible:** {base_description}
+    **Specific Skill Check Context from Game:** {skill_check_context}
+    **Your Task:**
+    Generate a brief (1-2 sentences) additional detail that {character_name} notices due to their keen observation. This detail should NOT be obvious and should provide a deeper understanding, hint, or nuance related to the target. It should feel like a reward for a successful skill check.
+    - If observing a *person*, focus on subtle body language, a faint scent, an almost hidden object on them, a flicker of emotion they try to hide.
+    - If observing an *item*, focus on a tiny inscription, wear patterns indicating unusual use, a faint smell, a hidden compartment, its true material or age if disguised.
+    - If observing *scenery*, focus on something out of place, a sign of recent passage, a hidden vantage point, an unusual silence or sound.
+    **Response Guidelines:**
+    1. **Subtlety is Key:** Avoid revealing major secrets directly. Hint, imply, suggest.
+    2. **Dostoevskian Tone:** Maintain the game's atmosphere.
+    3. **Concise:** 1-2 sentences.
+    4. **Direct Observation:** Output only the observed detail, not {character_name}'s thoughts about it, unless the thought *is* the observation (e.g., "It strikes you that the stain is much fresher than the surrounding grime.").
+    5. **No OOC or Meta-Commentary.**
+    Generate the enhanced observation now:
+    """,
+)
+
+_template(
+    "street_life_event_description",
+    """
+    **Task: Generate a brief, atmospheric 'street life' event (1-2 sentences) for St. Petersburg.**
+    **Setting:** {location}, {time_period}.
+    **Context:** The player character ({player_context}) is present but not directly involved.
+    **Examples (do not repeat these verbatim):**
+    - A ragged beggar insistently pleads with a well-dressed passerby, only to be scornfully ignored.
+    - Two market vendors shout loudly at each other over the price of radishes, attracting a small crowd.
+    - A stray dog, ribs showing, darts through the crowd, snatching a dropped piece of bread.
+    - Children's laughter echoes briefly from a nearby alleyway before being swallowed by the city's drone.
+    - A lone musician plays a mournful tune on a battered accordion, his eyes closed.
+    **Guidelines:**
+    - Evocative and Dostoevskian in tone.
+    - Focus on sensory details or brief human interactions.
+    - Should *not* require player interaction or be plot-critical. Purely atmospheric.
+    - Output only the 1-2 sentence description of the event.
+    Generate the street life event description now:
+    """,
+)
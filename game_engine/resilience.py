@@ -0,0 +1,248 @@
+# resilience.py
+"""Error classification, retries with backoff and jitter, and a circuit breaker for AI calls.
+
+call_with_retries() retries only errors that classify_error() calls retryable
+(rate limits, overloaded or unreachable service, timeouts), with capped
+exponential backoff and full jitter, and never past the per-call deadline;
+each attempt is handed the time left as its own request timeout. The
+CircuitBreaker opens after consecutive service failures so callers can go
+straight to static fallbacks for a cool-down period instead of waiting on an
+endpoint that keeps failing.
+"""
+
+import asyncio
+import random
+import threading
+import time
+
+from .game_config import (
+    AI_CALL_DEADLINE_SECONDS,
+    AI_CIRCUIT_COOLDOWN_SECONDS,
+    AI_CIRCUIT_FAILURE_THRESHOLD,
+    AI_RETRY_BASE_DELAY_SECONDS,
+    AI_RETRY_MAX_ATTEMPTS,
+    AI_RETRY_MAX_DELAY_SECONDS,
+)
+
+RETRYABLE = "retryable"  # Transient: try again after a pause.
+FATAL = "fatal"  # The key is invalid or not allowed: no call will succeed.
+TERMINAL = "terminal"  # This request will never succeed (e.g. a safety block), others may.
+UNKNOWN = "unknown"  # Not retried, but counted as a service failure.
+
+AUTH_ERROR_KEYWORDS = [
+    "api key not valid",
+    "permission_denied",
+    "authentication_failed",
+    "invalid api key",
+    "credential is invalid",
+    "unauthenticated",
+    "api_key_invalid",
+    "user_location_invalid",
+]
+RETRYABLE_HTTP_STATUSES = {408, 429, 500, 502, 503, 504}
+# gRPC DEADLINE_EXCEEDED, RESOURCE_EXHAUSTED, UNAVAILABLE
+RETRYABLE_GRPC_STATUSES = {4, 8, 14}
+RETRYABLE_KEYWORDS = [
+    "resource_exhausted",
+    "rate limit",
+    "quota",
+    "unavailable",
+    "overloaded",
+    "deadline_exceeded",
+    "timed out",
+    "timeout",
+]
+SAFETY_KEYWORDS = ["safety", "blocked", "block_reason", "prohibited_content"]
+
+
+def is_auth_error(error):
+    """True if an API exception means the key is invalid or not allowed to use the model."""
+    if getattr(error, "grpc_status_code", None) == 7:  # PERMISSION_DENIED
+        return True
+    error_str = str(error).lower()
+    return any(keyword in error_str for keyword in AUTH_ERROR_KEYWORDS)
+
+
+def _http_status(error):
+    for attribute in ("code", "status_code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def classify_error(error):
+    """RETRYABLE, FATAL, TERMINAL or UNKNOWN for an exception raised by a model call."""
+    if is_auth_error(error) or _http_status(error) in (401, 403):
+        return FATAL
+    prompt_feedback = getattr(getattr(error, "response", None), "prompt_feedback", None)
+    error_str = str(error).lower()
+    if getattr(prompt_feedback, "block_reason", None) or any(
+        keyword in error_str for keyword in SAFETY_KEYWORDS
+    ):
+        return TERMINAL
+    if isinstance(error, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return RETRYABLE
+    if (
+        _http_status(error) in RETRYABLE_HTTP_STATUSES
+        or getattr(error, "grpc_status_code", None) in RETRYABLE_GRPC_STATUSES
+        or any(keyword in error_str for keyword in RETRYABLE_KEYWORDS)
+    ):
+        return RETRYABLE
+    if _http_status(error) is not None and 400 <= _http_status(error) < 500:
+        return TERMINAL
+    return UNKNOWN
+
+
+class RetryPolicy:
+    """Capped exponential backoff with full jitter, bounded by a per-call deadline."""
+
+    def __init__(
+        self,
+        max_attempts=AI_RETRY_MAX_ATTEMPTS,
+        base_delay=AI_RETRY_BASE_DELAY_SECONDS,
+        max_delay=AI_RETRY_MAX_DELAY_SECONDS,
+        deadline=AI_CALL_DEADLINE_SECONDS,
+        sleep=time.sleep,
+        clock=time.monotonic,
+        rng=None,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.sleep = sleep
+        self.clock = clock
+        self.rng = rng or random.Random()
+
+    def backoff_delay(self, retry_number):
+        """Pause before retry number retry_number (0 for the first retry)."""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * 2**retry_number))
+
+    def remaining(self, started):
+        """Seconds left before the deadline of a call that began at started."""
+        return max(0.0, self.deadline - (self.clock() - started))
+
+    def next_delay(self, attempt, error, started):
+        """Seconds to wait before another attempt, or None if error should be raised now."""
+        if classify_error(error) != RETRYABLE or attempt + 1 >= self.max_attempts:
+            return None
+        delay = self.backoff_delay(attempt)
+        if self.clock() - started + delay >= self.deadline:
+            return None
+        return delay
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the model while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after consecutive service failures; lets one trial call through after a cool-down."""
+
+    def __init__(
+        self,
+        failure_threshold=AI_CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_seconds=AI_CIRCUIT_COOLDOWN_SECONDS,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return "closed"
+        if self._clock() - self.opened_at >= self.cooldown_seconds:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._trial_in_flight or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def record_outcome(self, error):
+        """Settle a call: only service failures count against the breaker."""
+        if error is None or classify_error(error) in (TERMINAL, FATAL):
+            # The service answered; a blocked prompt or a bad key says nothing about its health.
+            self.record_success()
+        else:
+            self.record_failure()
+
+
+def call_with_retries(call, retry_policy, breaker=None):
+    """Run call(timeout) under the retry policy and circuit breaker; raises the last error.
+
+    timeout is the time left before the policy's deadline, so a single hung request
+    cannot outlast it either.
+    """
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError("AI circuit breaker is open")
+    started = retry_policy.clock()
+    attempt = 0
+    while True:
+        try:
+            result = call(retry_policy.remaining(started))
+        except Exception as error:
+            delay = retry_policy.next_delay(attempt, error, started)
+            if delay is None:
+                if breaker is not None:
+                    breaker.record_outcome(error)
+                raise
+            retry_policy.sleep(delay)
+            attempt += 1
+            continue
+        if breaker is not None:
+            breaker.record_outcome(None)
+        return result
+
+
+async def call_with_retries_async(make_call, retry_policy, breaker=None):
+    """Async call_with_retries; make_call(timeout) returns a fresh awaitable per attempt."""
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError("AI circuit breaker is open")
+    started = retry_policy.clock()
+    attempt = 0
+    while True:
+        try:
+            result = await make_call(retry_policy.remaining(started))
+        except Exception as error:
+            delay = retry_policy.next_delay(attempt, error, started)
+            if delay is None:
+                if breaker is not None:
+                    breaker.record_outcome(error)
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+        if breaker is not None:
+            breaker.record_outcome(None)
+        return result
@@ -0,0 +1,205 @@
+# response_cache.py
+"""Content-addressed cache for generated AI text."""
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_MAX_ENTRIES = 256
+DEFAULT_CACHE_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_DISK_MAX_ENTRIES = 5000
+
+_WHITESPACE_RUN = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so re-indented prompts share a cache entry."""
+    return _WHITESPACE_RUN.sub(" ", str(prompt)).strip()
+
+
+class ResponseCache:
+    """Size-bounded LRU cache with TTL eviction and an optional SQLite backing store.
+
+    Keys come from make_key(); values must be JSON-serializable so they can be
+    written to the backing store and survive restarts.
+    """
+
+    def __init__(
+        self,
+        max_entries=DEFAULT_CACHE_MAX_ENTRIES,
+        ttl_seconds=DEFAULT_CACHE_TTL_SECONDS,
+        db_path=None,
+        disk_max_entries=DEFAULT_DISK_MAX_ENTRIES,
+        clock=time.time,
+    ):
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = ttl_seconds
+        self.disk_max_entries = disk_max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        self._db = None
+        self.db_path = None
+        self.hits = 0
+        self.misses = 0
+        if db_path:
+            self.attach_database(db_path)
+
+    @staticmethod
+    def make_key(model_name, prompt, generation_config=None):
+        payload = json.dumps(
+            {
+                "model": model_name or "",
+                "prompt": normalize_prompt(prompt),
+                "config": generation_config or {},
+            },
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, created_at):
+        if not self.ttl_seconds:
+            return False
+        return self._clock() - created_at > self.ttl_seconds
+
+    def attach_database(self, db_path):
+        """Open (or create) the on-disk store and drop rows that have outlived the TTL."""
+        with self._lock:
+            try:
+                connection = sqlite3.connect(db_path, check_same_thread=False)
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                if self.ttl_seconds:
+                    connection.execute(
+                        "DELETE FROM responses WHERE created_at < ?",
+                        (self._clock() - self.ttl_seconds,),
+                    )
+                connection.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Response cache store at {db_path} unavailable: {e}")
+                return False
+            if self._db is not None:
+                self._db.close()
+            self._db = connection
+            self.db_path = db_path
+            self._trim_database()
+            return True
+
+    def _trim_database(self):
+        if self._db is None or not self.disk_max_entries:
+            return
+        try:
+            self._db.execute(
+                "DELETE FROM responses WHERE key NOT IN "
+                "(SELECT key FROM responses ORDER BY created_at DESC LIMIT ?)",
+                (self.disk_max_entries,),
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Could not trim response cache store: {e}")
+
+    def _load_from_database(self, key):
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if not row:
+            return None
+        value_json, created_at = row
+        if self._is_expired(created_at):
+            return None
+        try:
+            return json.loads(value_json), created_at
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry[1]):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                entry = self._load_from_database(key)
+                if entry is not None:
+                    self._store_in_memory(key, entry[0], entry[1])
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def _store_in_memory(self, key, value, created_at):
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, key, value):
+        with self._lock:
+            created_at = self._clock()
+            self._store_in_memory(key, value, created_at)
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), created_at),
+                )
+                self._db.commit()
+            except (sqlite3.Error, TypeError, ValueError) as e:
+                logging.warning(f"Could not persist cached response: {e}")
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+
+    def clear(self, include_disk=False):
+        with self._lock:
+            self._entries.clear()
+            if include_disk and self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM responses")
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "persistent": self._db is not None,
+            }
@@ -0,0 +1,161 @@
+# save_codec.py
+"""Pluggable save encodings: legacy pretty JSON, or compact JSON/msgpack with compression.
+
+Encoded saves start with SAVE_MAGIC and the codec name on the first line, so
+read_save_file() can tell them apart from legacy JSON without being told. Codec
+names combine a serializer and an optional compressor, e.g. "json+zlib" or
+"msgpack+zstd". msgpack and zstandard are optional; "json" and "json+zlib" only
+need the standard library.
+"""
+
+import importlib
+import importlib.util
+import json
+import logging
+import zlib
+
+SAVE_MAGIC = b"CPSAVE\x01"
+LEGACY_JSON_CODEC = "json"
+FALLBACK_SAVE_CODEC = "json+zlib"
+
+# The objective fields a save must keep when the objective exists in static data;
+# Character.from_dict rebuilds descriptions and stage trees from characters.json.
+OBJECTIVE_STATE_FIELDS = ("id", "completed", "active", "current_stage_id")
+# Character fields that Character.from_dict falls back to static data for when absent.
+STATIC_DEFAULT_FIELDS = ("skills", "npc_relationships", "apparent_state")
+
+
+def _optional_module(name):
+    if importlib.util.find_spec(name) is None:
+        return None
+    return importlib.import_module(name)
+
+
+_msgpack = _optional_module("msgpack")
+_zstandard = _optional_module("zstandard")
+
+
+def _json_dumps(state):
+    return json.dumps(state, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+SERIALIZERS = {"json": (_json_dumps, json.loads)}
+if _msgpack is not None:
+    SERIALIZERS["msgpack"] = (
+        lambda state: _msgpack.packb(state, use_bin_type=True),
+        lambda payload: _msgpack.unpackb(payload, raw=False),
+    )
+
+COMPRESSORS = {"zlib": (lambda payload: zlib.compress(payload, 6), zlib.decompress)}
+if _zstandard is not None:
+    COMPRESSORS["zstd"] = (
+        lambda payload: _zstandard.ZstdCompressor(level=6).compress(payload),
+        lambda payload: _zstandard.ZstdDecompressor().decompress(payload),
+    )
+
+
+def _split_codec(codec):
+    serializer, _, compressor = codec.partition("+")
+    return serializer, compressor or None
+
+
+def is_codec_available(codec):
+    if codec == LEGACY_JSON_CODEC:
+        return True
+    serializer, compressor = _split_codec(codec)
+    return serializer in SERIALIZERS and (compressor is None or compressor in COMPRESSORS)
+
+
+def available_codecs():
+    codecs = [LEGACY_JSON_CODEC]
+    for serializer in SERIALIZERS:
+        if serializer != "json":
+            codecs.append(serializer)
+        codecs.extend(f"{serializer}+{compressor}" for compressor in COMPRESSORS)
+    return codecs
+
+
+def resolve_codec(codec):
+    """Return codec if it can be used here, otherwise the stdlib fallback."""
+    if codec and is_codec_available(codec):
+        return codec
+    if codec:
+        logging.warning(
+            f"Save codec '{codec}' is not available here; using '{FALLBACK_SAVE_CODEC}'."
+        )
+    return FALLBACK_SAVE_CODEC
+
+
+def strip_static_fields(state, characters_data=None):
+    """Drop character data that characters.json already provides; returns a new state."""
+    if characters_data is None:
+        from .character_module import CHARACTERS_DATA as characters_data
+    character_states = state.get("all_character_objects_state")
+    if not character_states:
+        return state
+    stripped_states = {}
+    for name, char_state in character_states.items():
+        static_data = characters_data.get(name)
+        if not static_data:
+            stripped_states[name] = char_state
+            continue
+        char_state = dict(char_state)
+        static_objective_ids = {obj.get("id") for obj in static_data.get("objectives", [])}
+        if "objectives" in char_state:
+            char_state["objectives"] = [
+                (
+                    {key: obj[key] for key in OBJECTIVE_STATE_FIELDS if key in obj}
+                    if obj.get("id") in static_objective_ids
+                    else obj
+                )
+                for obj in char_state["objectives"]
+            ]
+        for field_name in STATIC_DEFAULT_FIELDS:
+            static_value = static_data.get(field_name)
+            if field_name == "apparent_state" and static_value is None:
+                static_value = "normal"
+            if field_name in char_state and char_state[field_name] == static_value:
+                del char_state[field_name]
+        stripped_states[name] = char_state
+    stripped = dict(state)
+    stripped["all_character_objects_state"] = stripped_states
+    return stripped
+
+
+def encode_save(state, codec=FALLBACK_SAVE_CODEC, characters_data=None):
+    codec = resolve_codec(codec)
+    state = strip_static_fields(state, characters_data)
+    if codec == LEGACY_JSON_CODEC:
+        return json.dumps(state, indent=4).encode("utf-8")
+    serializer, compressor = _split_codec(codec)
+    payload = SERIALIZERS[serializer][0](state)
+    if compressor:
+        payload = COMPRESSORS[compressor][0](payload)
+    return SAVE_MAGIC + codec.encode("ascii") + b"\n" + payload
+
+
+def decode_save(raw):
+    if not raw.startswith(SAVE_MAGIC):
+        return json.loads(raw)
+    codec, _, payload = raw[len(SAVE_MAGIC) :].partition(b"\n")
+    codec = codec.decode("ascii")
+    if not is_codec_available(codec):
+        raise ValueError(f"Save file uses codec '{codec}', which is not installed here.")
+    serializer, compressor = _split_codec(codec)
+    if compressor:
+        payload = COMPRESSORS[compressor][1](payload)
+    return SERIALIZERS[serializer][1](payload)
+
+
+def load_save(f):
+    """Read a save from a binary file object, detecting the codec from its header."""
+    header = f.read(len(SAVE_MAGIC))
+    if header != SAVE_MAGIC:
+        f.seek(0)
+        return json.load(f)
+    return decode_save(header + f.read())
+
+
+def read_save_file(path):
+    with open(path, "rb") as f:
+        return load_save(f)
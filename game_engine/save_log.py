@@ -0,0 +1,86 @@
+# save_log.py
+"""Incremental saves: a full checkpoint plus an append-only log of per-character deltas.
+
+savegame_<slot>.json holds a full checkpoint tagged with a checkpoint_id.
+savegame_<slot>.json.log holds one JSON delta per line. Each delta carries the
+checkpoint_id it extends, the small world fields, and for each character only
+the large fields that changed since the previous delta. Lines for another
+checkpoint, e.g. left behind by a crash between the checkpoint and the log
+cleanup, are ignored. A torn last line ends the replay.
+"""
+
+import json
+import logging
+import os
+import uuid
+
+from .atomic_write import write_bytes_atomic
+from .save_codec import FALLBACK_SAVE_CODEC, encode_save
+
+DELTA_LOG_SUFFIX = ".log"
+CHARACTER_STATES_KEY = "all_character_objects_state"
+
+
+def delta_log_path(save_file):
+    return f"{save_file}{DELTA_LOG_SUFFIX}"
+
+
+def new_checkpoint_id():
+    return uuid.uuid4().hex
+
+
+def apply_delta(state, delta):
+    """Return state with delta layered on top; also merges two deltas into one."""
+    merged = dict(state)
+    for key, value in delta.items():
+        if key == CHARACTER_STATES_KEY:
+            characters = dict(merged.get(CHARACTER_STATES_KEY, {}))
+            for name, character_delta in value.items():
+                characters[name] = {**characters.get(name, {}), **character_delta}
+            merged[CHARACTER_STATES_KEY] = characters
+        else:
+            merged[key] = value
+    return merged
+
+
+def remove_delta_log(save_file):
+    try:
+        os.remove(delta_log_path(save_file))
+    except FileNotFoundError:
+        pass
+
+
+def write_checkpoint(save_file, state, codec=FALLBACK_SAVE_CODEC):
+    """Atomically replace the checkpoint, then drop the log it supersedes."""
+    write_bytes_atomic(save_file, encode_save(state, codec))
+    remove_delta_log(save_file)
+
+
+def append_delta(save_file, delta):
+    with open(delta_log_path(save_file), "a", encoding="utf-8") as f:
+        f.write(json.dumps(delta, separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def replay_delta_log(save_file, state):
+    """Apply the logged deltas for state's checkpoint; returns (state, deltas_applied)."""
+    checkpoint_id = state.get("checkpoint_id")
+    log_path = delta_log_path(save_file)
+    if not checkpoint_id or not os.path.exists(log_path):
+        return state, 0
+    applied = 0
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            try:
+                delta = json.loads(line)
+            except json.JSONDecodeError:
+                logging.warning(
+                    f"Stopped replaying {log_path} at line {line_number}: incomplete entry."
+                )
+                break
+            if delta.get("checkpoint_id") != checkpoint_id:
+                continue
+            state = apply_delta(state, delta)
+            applied += 1
+    return state, applied
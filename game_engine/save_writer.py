@@ -0,0 +1,106 @@
+# save_writer.py
+"""Write-behind persistence for autosaves: checkpoints and delta appends on a background thread."""
+
+import logging
+import pickle
+import threading
+
+from .save_log import append_delta, apply_delta, write_checkpoint
+
+
+class SaveWriter:
+    """Serialize and write save snapshots off the game thread.
+
+    submit() and submit_delta() take a private copy of the data and return
+    immediately. If the worker has not reached an older pending write for the
+    same path, a newer checkpoint replaces it and a newer delta is merged into
+    it, so only one write per path is ever queued. Failures are kept for the game
+    to report on its next turn instead of raising inside the worker.
+    """
+
+    def __init__(self, write=write_checkpoint, append=append_delta):
+        self._write = write
+        self._append = append
+        self._pending = {}
+        self._writing = 0
+        self._condition = threading.Condition()
+        self._worker = None
+        self._errors = []
+        self.writes = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def snapshot(data):
+        # Save data is plain JSON-compatible containers; a pickle round trip copies
+        # it several times faster than copy.deepcopy or json.dumps(indent=4).
+        return pickle.loads(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+
+    def submit(self, path, data):
+        """Queue a full checkpoint of data for path."""
+        self._enqueue(path, "checkpoint", self.snapshot(data))
+
+    def submit_delta(self, path, delta):
+        """Queue a delta to append to path's log."""
+        self._enqueue(path, "delta", self.snapshot(delta))
+
+    def _enqueue(self, path, kind, data):
+        with self._condition:
+            pending = self._pending.get(path)
+            if pending is not None:
+                self.coalesced += 1
+                if kind == "delta":
+                    kind, data = pending[0], apply_delta(pending[1], data)
+            self._pending[path] = (kind, data)
+            self._condition.notify_all()
+            self._ensure_worker()
+
+    def flush(self, timeout=None):
+        """Block until every submitted snapshot is on disk; False if timeout expired."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def pop_errors(self):
+        with self._condition:
+            errors, self._errors = self._errors, []
+            return errors
+
+    def _ensure_worker(self):
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._worker = threading.Thread(target=self._run, name="save-writer", daemon=True)
+        self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                path = next(iter(self._pending))
+                kind, data = self._pending.pop(path)
+                self._writing += 1
+            try:
+                if kind == "delta":
+                    self._append(path, data)
+                else:
+                    self._write(path, data)
+            except Exception as e:
+                logging.warning(f"Background save to {path} failed: {e}")
+                with self._condition:
+                    self._errors.append((path, e))
+            else:
+                with self._condition:
+                    self.writes += 1
+            finally:
+                with self._condition:
+                    self._writing -= 1
+                    self._condition.notify_all()
+
+    def stats(self):
+        with self._condition:
+            return {
+                "pending": len(self._pending),
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "errors": len(self._errors),
+            }
@@ -0,0 +1,267 @@
+# simulation.py
+"""Headless batch simulation of the game engine for balancing schedules and events."""
+
+import contextlib
+import functools
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from . import character_module, game_config, location_module
+from .game_config import MAX_TIME_UNITS_PER_DAY
+from .game_state import Game
+
+
+class RandomAgent:
+    """Wanders the map: mostly moves through exits, sometimes waits or picks things up."""
+
+    def __init__(self, rng, move_weight=6, wait_weight=3, take_weight=1):
+        self.rng = rng
+        self.move_weight = move_weight
+        self.wait_weight = wait_weight
+        self.take_weight = take_weight
+
+    def choose_action(self, game):
+        context = game.command_handler._build_intent_context()
+        options = [(("wait", None), self.wait_weight)]
+        options.extend(
+            (("move to", exit_info["name"]), self.move_weight / len(context["exits"]))
+            for exit_info in context["exits"]
+        )
+        options.extend(
+            (("take", item_name), self.take_weight / len(context["items"]))
+            for item_name in context["items"]
+        )
+        actions, weights = zip(*options)
+        return self.rng.choices(actions, weights=weights)[0]
+
+
+class ScriptedAgent:
+    """Replays a list of typed commands in a loop, parsed exactly as player input would be."""
+
+    def __init__(self, commands):
+        self.commands = [command for command in commands if command.strip()]
+        if not self.commands:
+            raise ValueError("ScriptedAgent needs at least one command.")
+        self._position = 0
+
+    def choose_action(self, game):
+        raw_command = self.commands[self._position % len(self.commands)]
+        self._position += 1
+        return game.command_handler.parse_action(raw_command)
+
+
+def _scripted_agent(commands, _rng):
+    return ScriptedAgent(commands)
+
+
+def scripted_agent_factory(commands):
+    """A picklable agent factory replaying `commands`, usable with worker processes."""
+    return functools.partial(_scripted_agent, list(commands))
+
+
+class HeadlessGame(Game):
+    """A Game that never prompts, prints, saves or calls the AI."""
+
+    def __init__(self):
+        super().__init__()
+        self.low_ai_data_mode = True
+        self.gemini_api.model = None
+        self.event_counts = Counter()
+        self.story_ended = False
+        for event in self.event_manager.story_events:
+            event["action"] = self._counted_event_action(event["id"], event["action"])
+
+    def _counted_event_action(self, event_id, action):
+        def counted_action():
+            self.event_counts[event_id] += 1
+            return action()
+
+        return counted_action
+
+    def _print_color(self, text, color_code, end="\n"):
+        pass
+
+    def _input_color(self, prompt_text, color_code):
+        return ""
+
+    def save_game(self, slot_name=None, is_autosave=False):
+        return None
+
+    def start_new_game(self, character_name=None):
+        self.world_manager.load_all_characters()
+        return self.world_manager.select_player_character(
+            non_interactive=True, character_name=character_name
+        )
+
+    def step(self, command, argument):
+        """Play one turn; returns False once the story has ended or the agent quit."""
+        self.world_manager._handle_ambient_rumors()
+        action_taken, _, time_units, special_flag = self.command_handler._process_command(
+            command, argument
+        )
+        if special_flag == "load_triggered":
+            return True
+        if special_flag:
+            return False
+        self.world_manager._update_world_state_after_action(command, action_taken, time_units)
+        self.story_ended = self.world_manager._check_game_ending_conditions()
+        return not self.story_ended
+
+
+def simulate_run(seed, days, agent_factory=None, character_name=None):
+    """Play one seeded game for `days` game-days and return its statistics."""
+    random.seed(seed)
+    agent_rng = random.Random(seed)
+    agent = agent_factory(agent_rng) if agent_factory else RandomAgent(agent_rng)
+    game = HeadlessGame()
+    if not game.start_new_game(character_name):
+        raise ValueError(f"Could not start a game as {character_name!r}.")
+    # Idle turns (unknown commands, failed moves) do not advance time, so cap the loop.
+    max_turns = days * MAX_TIME_UNITS_PER_DAY
+    turns = 0
+    # notoriety_by_day[i] is the player's notoriety at the end of day i + 1.
+    notoriety_by_day = []
+    while game.current_day <= days and turns < max_turns:
+        command, argument = agent.choose_action(game)
+        turns += 1
+        still_playing = game.step(command, argument)
+        while len(notoriety_by_day) < min(game.current_day - 1, days):
+            notoriety_by_day.append(game.player_notoriety_level)
+        if not still_playing:
+            break
+    days_played = min(game.current_day, days)
+    while len(notoriety_by_day) < days_played:
+        notoriety_by_day.append(game.player_notoriety_level)
+    return {
+        "seed": seed,
+        "turns": turns,
+        "days_played": days_played,
+        "ended": game.story_ended,
+        "ending_turn": turns if game.story_ended else None,
+        "ending_day": game.current_day if game.story_ended else None,
+        "event_counts": dict(game.event_counts),
+        "triggered_events": sorted(game.event_manager.triggered_events),
+        "objectives_completed": sorted(
+            objective["id"]
+            for objective in game.player_character.objectives
+            if objective.get("completed")
+        ),
+        "notoriety_by_day": notoriety_by_day,
+    }
+
+
+def summarize_runs(runs, days, elapsed, workers=1):
+    """Aggregate per-run statistics from simulate_run into one report."""
+    event_counts = Counter()
+    triggered_events = Counter()
+    objective_completions = Counter()
+    notoriety_totals = [0.0] * days
+    notoriety_samples = [0] * days
+    for run in runs:
+        event_counts.update(run["event_counts"])
+        triggered_events.update(run["triggered_events"])
+        objective_completions.update(run["objectives_completed"])
+        for day_index, notoriety in enumerate(run["notoriety_by_day"][:days]):
+            notoriety_totals[day_index] += notoriety
+            notoriety_samples[day_index] += 1
+    total_turns = sum(run["turns"] for run in runs)
+    total_days = sum(run["days_played"] for run in runs)
+    ended_runs = [run for run in runs if run["ended"]]
+    return {
+        "runs": len(runs),
+        "days": days,
+        "workers": workers,
+        "turns": total_turns,
+        "elapsed_seconds": elapsed,
+        "turns_per_second": (total_turns / elapsed) if elapsed else 0.0,
+        "event_counts": dict(event_counts.most_common()),
+        "events_per_day": {
+            event_id: count / total_days for event_id, count in event_counts.most_common()
+        }
+        if total_days
+        else {},
+        "triggered_events": dict(triggered_events.most_common()),
+        "objective_completions": dict(objective_completions.most_common()),
+        "mean_notoriety_by_day": [
+            total / samples for total, samples in zip(notoriety_totals, notoriety_samples) if samples
+        ],
+        "endings": len(ended_runs),
+        "mean_turns_to_ending": (
+            sum(run["ending_turn"] for run in ended_runs) / len(ended_runs) if ended_runs else None
+        ),
+        "mean_days_to_ending": (
+            sum(run["ending_day"] for run in ended_runs) / len(ended_runs) if ended_runs else None
+        ),
+        "per_run": runs,
+    }
+
+
+def run_simulation(seeds, days, agent_factory=None, character_name=None):
+    """Run one game per seed with all output discarded and aggregate the results."""
+    runs = []
+    started = time.perf_counter()
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        for seed in seeds:
+            runs.append(simulate_run(seed, days, agent_factory, character_name))
+    return summarize_runs(runs, days, time.perf_counter() - started)
+
+
+def _init_worker():
+    """Load the static game data once per worker process."""
+    character_module.get_characters_data()
+    location_module.get_locations_data()
+    game_config.get_default_items()
+
+
+def _simulate_seed(seed, days, agent_factory, character_name):
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        return simulate_run(seed, days, agent_factory, character_name)
+
+
+def run_parallel_simulation(seeds, days, agent_factory=None, character_name=None, workers=None):
+    """Shard seeds across a process pool; same report as run_simulation.
+
+    agent_factory must be picklable (a module-level callable or
+    scripted_agent_factory(...)), since it is sent to the worker processes.
+    """
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(seeds) // (workers * 4))
+    run_seed = functools.partial(
+        _simulate_seed, days=days, agent_factory=agent_factory, character_name=character_name
+    )
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        runs = list(executor.map(run_seed, seeds, chunksize=chunksize))
+    return summarize_runs(runs, days, time.perf_counter() - started, workers=workers)
+
+
+def format_report(report):
+    lines = [
+        f"Runs: {report['runs']} x {report['days']} day(s) on {report['workers']} worker(s), "
+        f"{report['turns']} turns in {report['elapsed_seconds']:.2f}s "
+        f"({report['turns_per_second']:.0f} turns/s)",
+        f"Story endings reached: {report['endings']}",
+    ]
+    if report["endings"]:
+        lines.append(
+            f"Mean time to ending: {report['mean_turns_to_ending']:.1f} turns, "
+            f"day {report['mean_days_to_ending']:.1f}"
+        )
+    lines.append("Event triggers (total, per game-day):")
+    if not report["event_counts"]:
+        lines.append("  (none)")
+    for event_id, count in report["event_counts"].items():
+        lines.append(f"  {event_id:<40} {count:>7} {report['events_per_day'][event_id]:>9.3f}")
+    lines.append("Objective completions (runs):")
+    if not report["objective_completions"]:
+        lines.append("  (none)")
+    for objective_id, count in report["objective_completions"].items():
+        lines.append(f"  {objective_id:<40} {count:>7}")
+    if report["mean_notoriety_by_day"]:
+        curve = ", ".join(f"{value:.2f}" for value in report["mean_notoriety_by_day"])
+        lines.append(f"Mean notoriety by day: {curve}")
+    return "\n".join(lines)
@@ -0,0 +1,150 @@
+# streaming.py
+"""Helpers for showing AI text while it streams in, instead of after the last token.
+
+JsonFieldStreamer pulls the text of one string field (e.g. "response_text") out
+of a JSON reply as it arrives. StreamingTextPrinter prints streamed text as it
+comes, cut off by apply_verbosity, the rule DisplayMixin._apply_verbosity also uses.
+"""
+
+import json
+import re
+import sys
+
+BRIEF_MAX_CHARS = 180
+STANDARD_MAX_CHARS = 550
+_SENTENCE_END = re.compile(r"[.!?]\s")
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+def _shorten(text, max_chars):
+    if len(text) > max_chars:
+        return text[: max_chars - 3].rstrip() + "..."
+    return text
+
+
+def apply_verbosity(text, verbosity):
+    """text cut to its first sentence ("brief") or a length cap ("standard")."""
+    if verbosity == "brief":
+        sentence_end = _SENTENCE_END.search(text)
+        return _shorten(text[: sentence_end.start() + 1] if sentence_end else text, BRIEF_MAX_CHARS)
+    if verbosity == "standard":
+        return _shorten(text, STANDARD_MAX_CHARS)
+    return text
+
+
+class JsonFieldStreamer:
+    """Incrementally decode the string value of one field in a streamed JSON object."""
+
+    def __init__(self, field, on_text):
+        self._key_pattern = re.compile(r'"' + re.escape(field) + r'"\s*:\s*"')
+        self._on_text = on_text
+        self._buffer = ""
+        self._position = None  # Index in _buffer of the next undecoded character of the value.
+        self.done = False
+
+    def feed(self, chunk):
+        if self.done or not chunk:
+            return
+        self._buffer += chunk
+        if self._position is None:
+            match = self._key_pattern.search(self._buffer)
+            if not match:
+                return
+            self._position = match.end()
+        decoded = []
+        buffer, i = self._buffer, self._position
+        while i < len(buffer):
+            char = buffer[i]
+            if char == '"':
+                self.done = True
+                break
+            if char != "\\":
+                decoded.append(char)
+                i += 1
+                continue
+            if i + 1 >= len(buffer):
+                break  # Wait for the rest of the escape sequence.
+            escape = buffer[i + 1]
+            if escape == "u":
+                if i + 6 > len(buffer):
+                    break
+                try:
+                    decoded.append(json.loads(f'"{buffer[i:i + 6]}"'))
+                except ValueError:
+                    pass
+                i += 6
+                continue
+            decoded.append(_ESCAPES.get(escape, escape))
+            i += 2
+        self._position = i
+        if decoded:
+            self._on_text("".join(decoded))
+
+
+class StreamingTextPrinter:
+    """Print text chunks as they arrive, cut off the way apply_verbosity would cut them.
+
+    Nothing is printed until the first non-blank chunk, so when no chunk ever
+    arrives (cache hit, fallback text, placeholder dialogue) the caller prints the
+    finished text the usual way; check `streamed` to tell which happened.
+    """
+
+    def __init__(self, print_func, prefix, prefix_color, text_color, suffix="", verbosity=None):
+        self._print = print_func
+        self.prefix = prefix
+        self.prefix_color = prefix_color
+        self.text_color = text_color
+        self.suffix = suffix
+        self.verbosity = verbosity
+        self._received = ""
+        self.printed = ""
+        self.streamed = False
+        self._cut_off = False
+
+    def _visible_text(self, text):
+        """(part of text sure to survive verbosity truncation, whether that part is final)."""
+        if self.verbosity == "brief":
+            limit = BRIEF_MAX_CHARS
+            final = _SENTENCE_END.search(text) is not None or len(text) > limit
+        elif self.verbosity == "standard":
+            limit = STANDARD_MAX_CHARS
+            final = len(text) > limit
+        else:
+            return text, False
+        if final:
+            return apply_verbosity(text, self.verbosity), True
+        # The last few characters may still be replaced by the ellipsis.
+        return text[: limit - 3], False
+
+    def _emit(self, visible):
+        if visible.startswith(self.printed):
+            new_text = visible[len(self.printed) :]
+        else:
+            # rstrip() before the ellipsis dropped spaces that were already shown.
+            new_text = "..." if self._cut_off else ""
+        if not new_text:
+            return
+        if not self.streamed:
+            self._print(self.prefix, self.prefix_color, end="")
+            self.streamed = True
+        self._print(new_text, self.text_color, end="")
+        sys.stdout.flush()
+        self.printed = visible
+
+    def feed(self, chunk):
+        if self._cut_off or not chunk:
+            return
+        self._received += chunk
+        text = self._received.lstrip()
+        if not text:
+            return
+        visible, self._cut_off = self._visible_text(text)
+        self._emit(visible)
+
+    def finish(self, final_text):
+        """Print whatever of final_text has not been shown yet, then close the line."""
+        if not self.streamed:
+            return
+        if final_text and final_text.startswith(self.printed):
+            self._print(final_text[len(self.printed) :], self.text_color, end="")
+        self._print(self.suffix, self.text_color)
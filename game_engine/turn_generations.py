@@ -0,0 +1,48 @@
+# turn_generations.py
+"""Run the independent generations a turn needs together, then show them in order."""
+
+from typing import NamedTuple
+
+
+class PlannedGeneration(NamedTuple):
+    """A GeminiAPI get_* call with its arguments, decided before it is made."""
+
+    method: str
+    args: tuple
+    kwargs: dict
+
+    def generate(self, gemini_api):
+        return getattr(gemini_api, self.method)(*self.args, **self.kwargs)
+
+    def generate_async(self, gemini_api):
+        return getattr(gemini_api, f"{self.method}_async")(*self.args, **self.kwargs)
+
+
+class TurnGenerations:
+    """Collect a turn's generations so their latency is the slowest call, not the sum.
+
+    Each step pairs a planned generation (or None when static text will do) with
+    the callable that presents its result. Steps are presented in the order they
+    were added, so the output reads exactly as it did when each call ran in turn.
+    """
+
+    def __init__(self, gemini_api):
+        self.gemini_api = gemini_api
+        self._steps = []
+
+    def add(self, generation, present):
+        self._steps.append((generation, present))
+
+    def run(self):
+        steps, self._steps = self._steps, []
+        planned = [generation for generation, _ in steps if generation is not None]
+        if len(planned) > 1:
+            texts = iter(
+                self.gemini_api.gather_generations(
+                    *(generation.generate_async(self.gemini_api) for generation in planned)
+                )
+            )
+        else:
+            texts = (generation.generate(self.gemini_api) for generation in planned)
+        for generation, present in steps:
+            present(next(texts) if generation is not None else None)
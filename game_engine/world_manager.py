@@ -1,6 +1,7 @@
 import random
 import copy
 from .game_config import (
+    AUTOSAVE_SLOT,
     Colors,
     TIME_UNITS_PER_PLAYER_ACTION,
     MAX_TIME_UNITS_PER_DAY,
@@ -19,11 +20,18 @@ from .game_config import (
 from .static_fallbacks import STATIC_DREAM_SEQUENCES, STATIC_RUMORS
 from .location_module import LOCATIONS_DATA
 from .character_module import Character, CHARACTERS_DATA
+from .location_index import LocationIndex
+from .data_bundle import bundled_item_data_problems, find_item_data_problems
+from .streaming import StreamingTextPrinter
+from .turn_generations import PlannedGeneration, TurnGenerations
 
 
 class WorldManager:
     def __init__(self, game_state):
         self.game_state = game_state
+        self.location_index = LocationIndex()
+        # Rumors rolled at the end of the last turn, shown at the top of this one.
+        self.planned_rumors = None
 
     def get_current_time_period(self):
         time_in_day = self.game_state.game_time % MAX_TIME_UNITS_PER_DAY
@@ -79,6 +87,9 @@ class WorldManager:
                         relationships_summary = f"Sonya: {self.game_state.get_relationship_text(sonya_npc.relationship_with_player if hasattr(sonya_npc, 'relationship_with_player') else 0)}"
 
                     dream_text = None
+                    printer = StreamingTextPrinter(
+                        self.game_state._print_color, 'Dream: "', Colors.CYAN, Colors.CYAN, suffix='"'
+                    )
                     if not self.game_state.low_ai_data_mode and self.game_state.gemini_api.model:
                         dream_text = self.game_state.gemini_api.get_dream_sequence(
                             self.game_state.player_character,
@@ -87,6 +98,7 @@ class WorldManager:
                                 self.game_state.player_character
                             ),
                             relationships_summary,
+                            on_text=printer.feed,
                         )
 
                     if (
@@ -99,9 +111,12 @@ class WorldManager:
                         else:
                             dream_text = "You had a restless night filled with strange, fleeting images."  # Ultimate fallback
 
-                    self.game_state._print_color(
-                        f'{Colors.CYAN}Dream: "{dream_text}"{Colors.RESET}', Colors.CYAN
-                    )
+                    if printer.streamed:
+                        printer.finish(dream_text)
+                    else:
+                        self.game_state._print_color(
+                            f'{Colors.CYAN}Dream: "{dream_text}"{Colors.RESET}', Colors.CYAN
+                        )
                     self.game_state.player_character.add_journal_entry(
                         "Dream",
                         dream_text,
@@ -198,7 +213,7 @@ class WorldManager:
             )
         self.initialize_dynamic_location_items()
 
-    def select_player_character(self, non_interactive=False):
+    def select_player_character(self, non_interactive=False, character_name=None):
         self.game_state._print_color("\n--- Choose Your Character ---", Colors.CYAN + Colors.BOLD)
         playable_character_names = [
             name for name, data in CHARACTERS_DATA.items() if not data.get("non_playable", False)
@@ -208,7 +223,7 @@ class WorldManager:
             return False
 
         if non_interactive:
-            chosen_name = playable_character_names[0]
+            chosen_name = character_name or playable_character_names[0]
             self.game_state._print_color(
                 f"Automatically selecting character: {chosen_name}", Colors.YELLOW
             )
@@ -352,56 +367,77 @@ class WorldManager:
             self.game_state.current_location_description_shown_this_visit = True
         self.update_npcs_in_current_location()
 
+    def prefetch_adjacent_atmospherics(self):
+        """Start generating arrival atmospherics for each exit while the player decides."""
+        prefetcher = getattr(self.game_state, "atmosphere_prefetcher", None)
+        player_character = self.game_state.player_character
+        if (
+            prefetcher is None
+            or player_character is None
+            or self.game_state.low_ai_data_mode
+            or not self.game_state.gemini_api.model
+        ):
+            return
+        current_location_name = self.game_state.current_location_name
+        location_data = LOCATIONS_DATA.get(current_location_name) or {}
+        time_period = self.get_current_time_period()
+        objective_focus = self.game_state._get_objectives_summary(player_character)
+        for destination in location_data.get("exits", {}):
+            if destination == getattr(self, "last_visited_location", None):
+                continue
+            # Matches the event summary _handle_move_to_command records on arrival.
+            prefetcher.prefetch(
+                player_character,
+                destination,
+                time_period,
+                f"moved from {current_location_name} to {destination}.",
+                objective_focus,
+            )
+
     def update_npcs_in_current_location(self):
         self.game_state.npcs_in_current_location = []
         if not self.game_state.current_location_name:
             return
-        for char_obj in self.game_state.all_character_objects.values():
-            if (
-                not char_obj.is_player
-                and char_obj.current_location == self.game_state.current_location_name
-            ):
-                if char_obj not in self.game_state.npcs_in_current_location:
-                    self.game_state.npcs_in_current_location.append(char_obj)
+        self.location_index.sync(self.game_state.all_character_objects)
+        self.game_state.npcs_in_current_location = [
+            char_obj
+            for char_obj in self.location_index.characters_at(
+                self.game_state.current_location_name
+            )
+            if not char_obj.is_player
+        ]
 
     def _validate_item_data(self):
-        missing_items = set()
-        for location_name, location_data in LOCATIONS_DATA.items():
-            for item_info in location_data.get("items_present", []):
-                item_name = item_info.get("name")
-                if item_name and item_name not in DEFAULT_ITEMS:
-                    missing_items.add(
-                        f"Location '{location_name}' references unknown item '{item_name}'."
-                    )
-
-        for character_name, character_data in CHARACTERS_DATA.items():
-            for item_info in character_data.get("inventory_items", []):
-                item_name = item_info.get("name")
-                if item_name and item_name not in DEFAULT_ITEMS:
-                    missing_items.add(
-                        f"Character '{character_name}' references unknown item '{item_name}'."
-                    )
-
-        for item_name in HIGHLY_NOTABLE_ITEMS_FOR_MEMORY:
-            if item_name not in DEFAULT_ITEMS:
-                missing_items.add(f"Notable items list references unknown item '{item_name}'.")
-
-        for item_name, item_data in DEFAULT_ITEMS.items():
-            hidden_location = item_data.get("hidden_in_location")
-            if hidden_location and hidden_location not in LOCATIONS_DATA:
-                missing_items.add(
-                    f"Item '{item_name}' references unknown hidden location '{hidden_location}'."
-                )
+        data_sets = (CHARACTERS_DATA, LOCATIONS_DATA, DEFAULT_ITEMS, HIGHLY_NOTABLE_ITEMS_FOR_MEMORY)
+        # A current data bundle was already validated when it was built.
+        missing_items = bundled_item_data_problems(*data_sets)
+        if missing_items is None:
+            missing_items = find_item_data_problems(*data_sets)
 
         if missing_items:
             self.game_state._print_color(
                 "Warning: Item data inconsistencies detected:", Colors.YELLOW
             )
-            for message in sorted(missing_items):
+            for message in missing_items:
                 self.game_state._print_color(f"- {message}", Colors.YELLOW)
             self.game_state._print_color("", Colors.RESET)
 
     def _handle_ambient_rumors(self):
+        rumors, self.planned_rumors = self.planned_rumors, None
+        if rumors is None:
+            turn = TurnGenerations(self.game_state.gemini_api)
+            rumors = self.plan_ambient_rumor(turn)
+            turn.run()
+        for source_npc, rumor_text in rumors:
+            self._show_ambient_rumor(source_npc, rumor_text)
+
+    def plan_ambient_rumor(self, turn):
+        """Roll for a rumor overheard here and add its generation to turn.
+
+        Returns the list the (source, text) pair lands in once the turn has run, so
+        the rumor for the next turn can be generated alongside this turn's text.
+        """
+        rumors = []
         if (
             self.game_state.current_location_name
             in ["Haymarket Square", "Tavern", "Squalid St. Petersburg Street"]
@@ -422,71 +458,80 @@ class WorldManager:
             if source_npc.name != "A Passerby" and hasattr(source_npc, "relationship_with_player"):
                 relationship_score_for_rumor = source_npc.relationship_with_player
 
-            rumor_text = None
+            generation = None
             if not self.game_state.low_ai_data_mode and self.game_state.gemini_api.model:
-                rumor_text = self.game_state.gemini_api.get_rumor_or_gossip(
-                    source_npc,
-                    self.game_state.current_location_name,
-                    self.get_current_time_period(),
-                    self.game_state._get_known_facts_summary(),
-                    self.game_state.player_notoriety_level,
-                    self.game_state.get_relationship_text(relationship_score_for_rumor),
-                    self.game_state._get_objectives_summary(source_npc),
+                generation = PlannedGeneration(
+                    "get_rumor_or_gossip",
+                    (
+                        source_npc,
+                        self.game_state.current_location_name,
+                        self.get_current_time_period(),
+                        self.game_state._get_known_facts_summary(),
+                        self.game_state.player_notoriety_level,
+                        self.game_state.get_relationship_text(relationship_score_for_rumor),
+                        self.game_state._get_objectives_summary(source_npc),
+                    ),
+                    {},
                 )
+            turn.add(generation, lambda text: rumors.append((source_npc, text)))
+        return rumors
 
-            if (
-                rumor_text is None
-                or (isinstance(rumor_text, str) and rumor_text.startswith("(OOC:"))
-                or self.game_state.low_ai_data_mode
-            ):
-                if STATIC_RUMORS:
-                    rumor_text = random.choice(STATIC_RUMORS)
-                else:
-                    rumor_text = "The air buzzes with indistinct chatter."  # Ultimate fallback
-                rumor_text = self.game_state._apply_verbosity(rumor_text)
-                # Print static rumor with a different color or note if desired
-                self.game_state._print_color(
-                    f'\n{Colors.DIM}(You overhear some chatter nearby: "{rumor_text}"){Colors.RESET}',
-                    Colors.DIM,
+    def _show_ambient_rumor(self, source_npc, rumor_text):
+        if (
+            rumor_text is None
+            or (isinstance(rumor_text, str) and rumor_text.startswith("(OOC:"))
+            or self.game_state.low_ai_data_mode
+        ):
+            if STATIC_RUMORS:
+                rumor_text = random.choice(STATIC_RUMORS)
+            else:
+                rumor_text = "The air buzzes with indistinct chatter."  # Ultimate fallback
+            rumor_text = self.game_state._apply_verbosity(rumor_text)
+            # Print static rumor with a different color or note if desired
+            self.game_state._print_color(
+                f'\n{Colors.DIM}(You overhear some chatter nearby: "{rumor_text}"){Colors.RESET}',
+                Colors.DIM,
+            )
+            self.game_state._print_color("", Colors.RESET)
+            if self.game_state.player_character and rumor_text:  # Check rumor_text is not None
+                self.game_state.player_character.add_journal_entry(
+                    "Overheard Rumor (Static)",
+                    rumor_text,
+                    self.game_state._get_current_game_time_period_str(),
                 )
-                self.game_state._print_color("", Colors.RESET)
-                if self.game_state.player_character and rumor_text:  # Check rumor_text is not None
-                    self.game_state.player_character.add_journal_entry(
-                        "Overheard Rumor (Static)",
-                        rumor_text,
-                        self.game_state._get_current_game_time_period_str(),
-                    )
-            elif rumor_text:  # AI success and not OOC
-                rumor_text = self.game_state._apply_verbosity(rumor_text)
-                self.game_state._print_color(
-                    f'\n{Colors.DIM}(You overhear some chatter nearby: "{rumor_text}"){Colors.RESET}',
-                    Colors.DIM,
+        elif rumor_text:  # AI success and not OOC
+            rumor_text = self.game_state._apply_verbosity(rumor_text)
+            self.game_state._print_color(
+                f'\n{Colors.DIM}(You overhear some chatter nearby: "{rumor_text}"){Colors.RESET}',
+                Colors.DIM,
+            )
+            self.game_state._print_color("", Colors.RESET)
+            if self.game_state.player_character:
+                self.game_state.player_character.add_journal_entry(
+                    "Overheard Rumor (AI)",
+                    rumor_text,
+                    self.game_state._get_current_game_time_period_str(),
                 )
-                self.game_state._print_color("", Colors.RESET)
-                if self.game_state.player_character:
-                    self.game_state.player_character.add_journal_entry(
-                        "Overheard Rumor (AI)",
-                        rumor_text,
-                        self.game_state._get_current_game_time_period_str(),
-                    )
-                self.game_state._remember_ai_output(rumor_text, "ambient_rumor")
+            self.game_state._remember_ai_output(rumor_text, "ambient_rumor")
 
-            # Common logic for Raskolnikov if any rumor was processed (AI or static)
-            if (
-                rumor_text
-                and self.game_state.player_character
-                and self.game_state.player_character.name == "Rodion Raskolnikov"
-                and any(
-                    kw in rumor_text.lower()
-                    for kw in ["student", "axe", "pawnbroker", "murder", "police"]
-                )
-            ):
-                self.game_state.player_character.apparent_state = "paranoid"
-                self.game_state.player_notoriety_level = min(
-                    self.game_state.player_notoriety_level + 0.2, 3
-                )
+        # Common logic for Raskolnikov if any rumor was processed (AI or static)
+        if (
+            rumor_text
+            and self.game_state.player_character
+            and self.game_state.player_character.name == "Rodion Raskolnikov"
+            and any(
+                kw in rumor_text.lower()
+                for kw in ["student", "axe", "pawnbroker", "murder", "police"]
+            )
+        ):
+            self.game_state.player_character.apparent_state = "paranoid"
+            self.game_state.player_notoriety_level = min(
+                self.game_state.player_notoriety_level + 0.2, 3
+            )
 
-    def _update_world_state_after_action(self, command, action_taken_this_turn, time_to_advance):
+    def _update_world_state_after_action(
+        self, command, action_taken_this_turn, time_to_advance, turn=None
+    ):
         if action_taken_this_turn:
             self.game_state.player_action_count += 1
             if command != "talk to":
@@ -497,7 +542,7 @@ class WorldManager:
                 >= self.game_state.autosave_interval_actions
                 and command not in ["save", "load", "quit"]
             ):
-                self.game_state.save_game("autosave", is_autosave=True)
+                self.game_state.save_game(AUTOSAVE_SLOT, is_autosave=True)
                 self.game_state.actions_since_last_autosave = 0
             event_triggered = self.game_state.event_manager.check_and_trigger_events()
             if (
@@ -521,7 +566,7 @@ class WorldManager:
                     len(self.game_state.npcs_in_current_location) >= 2
                     and random.random() < NPC_INTERACTION_CHANCE
                 ):
-                    if self.game_state.event_manager.attempt_npc_npc_interaction():
+                    if self.game_state.event_manager.attempt_npc_npc_interaction(turn):
                         self.game_state.last_significant_event_summary = (
                             "overheard an exchange between NPCs."
                         )
@@ -1,12 +1,33 @@
 # main.py
-import importlib.util
+import argparse
+import sys
 
 from game_engine.game_state import Game
+from game_engine.gemini_interactions import genai_installed
 
-if importlib.util.find_spec("google.genai") is None:
+if not genai_installed():
     print("\n[WARNING] 'google-genai' package is not installed.")
     print("[WARNING] The game will run in fallback deterministic mode without AI features.\n")
 
-if __name__ == "__main__":
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crime and Punishment: A Text Adventure.")
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="print a `python -X importtime` summary of startup imports and exit",
+    )
+    args = parser.parse_args(argv)
+    if args.profile_imports:
+        from game_engine.import_profile import profile_imports
+
+        print(profile_imports())
+        return 0
+
     game_instance = Game()
     game_instance.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# simulate.py
+"""Run the game engine headlessly across many seeds and report throughput and event rates.
+
+Examples:
+    python simulate.py --seeds 50 --days 30
+    python simulate.py --seeds 10 --days 5 --script my_commands.txt --json
+    python simulate.py --seeds 20000 --days 14 --workers 0
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from game_engine.simulation import (
+    format_report,
+    run_parallel_simulation,
+    run_simulation,
+    scripted_agent_factory,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless batch simulation of the game engine.")
+    parser.add_argument("--seeds", type=int, default=20, help="number of seeded games to run")
+    parser.add_argument("--first-seed", type=int, default=0, help="seed of the first game")
+    parser.add_argument("--days", type=int, default=7, help="game-days to simulate per seed")
+    parser.add_argument("--character", help="playable character name (default: first playable)")
+    parser.add_argument(
+        "--script",
+        help="file of commands, one per line, replayed in a loop instead of the random agent",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=f"worker processes; 0 uses every core ({os.cpu_count()} here), 1 runs in-process",
+    )
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    agent_factory = None
+    if args.script:
+        with open(args.script, "r", encoding="utf-8") as f:
+            commands = f.read().splitlines()
+        agent_factory = scripted_agent_factory(commands)
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    if args.workers == 1:
+        report = run_simulation(seeds, args.days, agent_factory, args.character)
+    else:
+        report = run_parallel_simulation(
+            seeds, args.days, agent_factory, args.character, workers=args.workers or None
+        )
+    if args.json:
+        print(json.dumps(report, indent=4))
+    else:
+        print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
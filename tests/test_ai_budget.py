@@ -0,0 +1,98 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.ai_budget import AdaptiveAIPolicy, percentile  # noqa: E402
+from game_engine.gemini_interactions import GeminiAPI  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAdaptiveAIPolicy(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.policy = AdaptiveAIPolicy(
+            latency_p95_budget=2.0,
+            error_rate_budget=0.25,
+            session_token_budget=1000,
+            window_seconds=60,
+            clock=self.clock,
+        )
+
+    def test_slow_calls_downgrade_flavor_text_but_not_dialogue(self):
+        for _ in range(5):
+            self.policy.observe("ok", latency=4.0)
+        self.assertFalse(self.policy.allows("atmospheric_details"))
+        self.assertFalse(self.policy.allows("rumor_or_gossip"))
+        self.assertTrue(self.policy.allows("npc_persuasion"))
+        self.assertIn("p95 latency", self.policy.degraded_reason())
+        self.assertEqual(self.policy.status()["skipped_calls"], 2)
+
+    def test_recovers_when_slow_calls_age_out_or_fast_calls_arrive(self):
+        for _ in range(5):
+            self.policy.observe("ok", latency=4.0)
+        self.clock.now += 61
+        self.assertTrue(self.policy.allows("atmospheric_details"))
+        for _ in range(5):
+            self.policy.observe("ok", latency=4.0)
+        for _ in range(100):
+            self.policy.observe("ok", latency=0.5)
+        self.assertTrue(self.policy.allows("atmospheric_details"))
+
+    def test_error_rate_and_token_budget(self):
+        for outcome in ("error", "error", "ok", "ok", "ok"):
+            self.policy.observe(outcome, latency=0.1)
+        self.assertIn("error rate", self.policy.degraded_reason())
+        self.clock.now += 61
+        self.policy.observe("ok", latency=0.1, tokens=1000)
+        self.assertIn("token budget", self.policy.degraded_reason())
+
+    def test_cache_hits_and_too_few_samples_do_not_count(self):
+        for _ in range(10):
+            self.policy.observe("cache_hit", latency=9.0)
+        for _ in range(4):
+            self.policy.observe("error", latency=9.0)
+        self.assertIsNone(self.policy.degraded_reason())
+
+    def test_percentile(self):
+        self.assertEqual(percentile(list(range(1, 21)), 0.95), 19)
+        self.assertIsNone(percentile([], 0.95))
+
+
+class TestBudgetedGeneration(unittest.TestCase):
+    def test_low_priority_calls_skip_the_api_while_degraded(self):
+        api = GeminiAPI()
+        api._log_message = MagicMock()
+        generate = MagicMock(return_value=SimpleNamespace(text="Words."))
+        api.model = GeminiAPI._GeminiModelAdapter(
+            SimpleNamespace(models=SimpleNamespace(generate_content=generate)), "m"
+        )
+        for _ in range(5):
+            api.ai_policy.observe("error")
+        skipped = api._generate_content_with_fallback(
+            "p", "atmospheric details", call_site="atmospheric_details"
+        )
+        self.assertTrue(skipped.startswith("(OOC:"))
+        generate.assert_not_called()
+        self.assertEqual(
+            api._generate_content_with_fallback("p", "persuasion", call_site="npc_persuasion"),
+            "Words.",
+        )
+        rows = {row["call_site"]: row for row in api.ai_metrics.rows()}
+        self.assertEqual(rows["atmospheric_details"]["skipped"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
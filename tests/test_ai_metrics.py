@@ -0,0 +1,141 @@
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.ai_metrics import EXPORT_FIELDS, AICallMetrics  # noqa: E402
+from game_engine.gemini_interactions import GeminiAPI, NaturalLanguageParser  # noqa: E402
+
+
+class TestAICallMetrics(unittest.TestCase):
+    def test_rows_aggregate_per_call_site(self):
+        metrics = AICallMetrics()
+        metrics.record("atmospheric_details", "ok", 100, 30, 12, latency=0.5)
+        metrics.record("atmospheric_details", "cache_hit", 100)
+        metrics.record("dream_sequence", "error", 50, latency=2.0)
+        dream, atmosphere = metrics.rows()
+        self.assertEqual(dream["call_site"], "dream_sequence")
+        self.assertEqual(atmosphere["calls"], 2)
+        self.assertEqual(atmosphere["cache_hit"], 1)
+        self.assertEqual(atmosphere["prompt_tokens"], 30)
+        self.assertEqual(atmosphere["mean_latency_s"], 0.5)
+        self.assertIn("dream_sequence", metrics.format_report())
+
+    def test_export_writes_json_and_csv(self):
+        metrics = AICallMetrics()
+        metrics.record("rumor_or_gossip", "fallback", 10, latency=0.1)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = metrics.export(os.path.join(tmp, "stats.json"))
+            with open(json_path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["call_sites"][0]["fallback"], 1)
+            csv_path = metrics.export(os.path.join(tmp, "stats.csv"))
+            with open(csv_path, encoding="utf-8", newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(tuple(rows[0]), EXPORT_FIELDS)
+            self.assertEqual(rows[0]["call_site"], "rumor_or_gossip")
+
+
+class TestGenerationInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.api = GeminiAPI()
+        self.api._log_message = MagicMock()
+        self.response = SimpleNamespace(
+            text="Fog over the canal.",
+            usage_metadata=SimpleNamespace(prompt_token_count=40, candidates_token_count=6),
+        )
+        self.api.model = GeminiAPI._GeminiModelAdapter(
+            SimpleNamespace(
+                models=SimpleNamespace(generate_content=MagicMock(return_value=self.response))
+            ),
+            "metrics-model",
+        )
+
+    def _site(self, call_site):
+        return next(row for row in self.api.ai_metrics.rows() if row["call_site"] == call_site)
+
+    def test_calls_cache_hits_and_failures_are_counted_per_site(self):
+        self.api._generate_content_with_fallback("p", "ctx", call_site="atmosphere")
+        self.api._generate_content_with_fallback("p", "ctx", call_site="atmosphere")
+        self.api.model.client.models.generate_content.side_effect = RuntimeError("offline")
+        self.api._generate_content_with_fallback("q", "ctx", call_site="atmosphere")
+        site = self._site("atmosphere")
+        self.assertEqual((site["calls"], site["ok"], site["cache_hit"], site["error"]), (3, 1, 1, 1))
+        self.assertEqual((site["prompt_tokens"], site["output_tokens"]), (40, 6))
+        self.assertEqual(site["prompt_chars"], 3)
+
+    def test_ooc_fallback_is_counted_and_site_defaults_to_context(self):
+        self.response.text = ""
+        self.api._generate_content_with_fallback("p", "scenery observation of a bridge")
+        self.assertEqual(self._site("scenery observation of a bridge")["fallback"], 1)
+
+
+class TestJsonModeReplies(unittest.TestCase):
+    def setUp(self):
+        self.api = GeminiAPI()
+        self.api._log_message = MagicMock()
+        self.generate = MagicMock()
+        self.api.model = GeminiAPI._GeminiModelAdapter(
+            SimpleNamespace(models=SimpleNamespace(generate_content=self.generate)), "json-model"
+        )
+
+    def _reply(self, text):
+        self.generate.return_value = SimpleNamespace(text=text)
+
+    def _npc_response(self):
+        return self.api.generate_npc_response({"name": "Sonya"}, "Hello", {"fear": 10})
+
+    def _json_stats(self, call_site):
+        row = next(row for row in self.api.ai_metrics.rows() if row["call_site"] == call_site)
+        return (
+            row["json_replies"],
+            row["json_malformed"],
+            row["json_unusable"],
+            row["json_malformed_bytes"],
+        )
+
+    def test_npc_response_requests_schema_constrained_json(self):
+        self._reply('{"response_text": "Go home.", "stat_changes": {"fear": 2}}')
+        self.assertEqual(
+            self._npc_response(), {"response_text": "Go home.", "stat_changes": {"fear": 2}}
+        )
+        config = self.generate.call_args.kwargs["config"]
+        self.assertEqual(config["response_mime_type"], "application/json")
+        self.assertEqual(config["response_schema"]["required"], ["response_text", "stat_changes"])
+        self.assertEqual(self._json_stats("npc_response"), (1, 0, 0, 0))
+
+    def test_malformed_replies_are_salvaged_or_counted_as_unusable(self):
+        fenced = '```json\n{"response_text": "Go home.", "stat_changes": {"fear": 2}}\n```'
+        self._reply(fenced)
+        self.assertEqual(self._npc_response()["stat_changes"], {"fear": 2})
+        self._reply("Go home, Rodion.")
+        self.assertEqual(
+            self._npc_response(), {"response_text": "Go home, Rodion.", "stat_changes": {}}
+        )
+        self.assertEqual(
+            self._json_stats("npc_response"), (2, 2, 1, len(fenced) + len("Go home, Rodion."))
+        )
+        self.assertIn(
+            "JSON replies for npc_response: 2, malformed: 2", self.api.ai_metrics.format_report()
+        )
+
+    def test_intent_classification_uses_json_mode(self):
+        self._reply('{"intent": "talk", "target": "Sonya", "confidence": 0.9}')
+        parser = NaturalLanguageParser(self.api)
+        parser._select_intent_model = lambda: self.api.model
+        intent = parser.parse_player_intent("speak with sonya", {"npcs": ["Sonya"]})
+        self.assertEqual(intent, {"intent": "talk", "target": "Sonya", "confidence": 0.9})
+        config = self.generate.call_args.kwargs["config"]
+        self.assertEqual(config["response_schema"], NaturalLanguageParser.RESPONSE_SCHEMA)
+        self.assertEqual(self._json_stats("intent_classification"), (1, 0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
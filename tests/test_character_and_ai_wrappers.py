@@ -183,14 +183,15 @@ def test_gemini_attempt_api_setup_success_and_failure_paths():
             assert api._attempt_api_setup("k", "src", "m") is False
 
 
-@patch("game_engine.gemini_interactions.os.getenv", return_value="env-key")
-def test_gemini_handle_env_and_config_and_generate_fallback(_getenv, tmp_path):
+def test_gemini_handle_env_and_config_and_generate_fallback(tmp_path):
     api = GeminiAPI()
     api._log_message = MagicMock()
     api._print_color_func = MagicMock()
     api._input_color_func = MagicMock(return_value="n")
 
-    with patch.object(api, "_attempt_api_setup", return_value=True):
+    with patch("game_engine.gemini_interactions.os.getenv", return_value="env-key"), patch.object(
+        api, "_attempt_api_setup", return_value=True
+    ):
         out = api._handle_env_key()
         assert out["api_configured"] is True
 
@@ -31,6 +31,7 @@ class TestCharacterModule(unittest.TestCase):
             "current_location": "test_room",
             "is_player": False,
             "conversation_histories": {},
+            "conversation_summaries": {},
             "memory_about_player": [],
             "journal_entries": [],
             "relationship_with_player": 0,
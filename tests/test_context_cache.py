@@ -0,0 +1,187 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.context_cache import ContextCache  # noqa: E402
+from game_engine.gemini_interactions import GeminiAPI  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCaches:
+    """A fake genai `client.caches` that records what was created, renewed and deleted."""
+
+    def __init__(self, refuse=False):
+        self.refuse = refuse
+        self.error = None
+        self.created = []
+        self.updated = []
+        self.deleted = []
+
+    def create(self, model, config):
+        if self.refuse:
+            raise ValueError("400 Cached content is too small")
+        if self.error:
+            raise self.error
+        self.created.append((model, config))
+        return SimpleNamespace(name=f"cachedContents/{len(self.created)}")
+
+    def update(self, name, config):
+        self.updated.append((name, config))
+
+    def delete(self, name):
+        self.deleted.append(name)
+
+
+class TestContextCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ContextCache(
+            ttl_seconds=600, refresh_margin_seconds=60, min_tokens=0, clock=self.clock
+        )
+        self.client = SimpleNamespace(caches=FakeCaches())
+
+    def _handle(self, prefix="persona"):
+        return self.cache.handle_for(self.client, "model", prefix, "npc-Sonya")
+
+    def _created_handle(self, prefix="persona"):
+        """The first call queues the create and goes inline; the next one gets the cache."""
+        self.assertIsNone(self._handle(prefix))
+        self.cache.wait_until_idle()
+        return self._handle(prefix)
+
+    def test_handle_is_reused_then_renewed_before_expiry(self):
+        self.assertEqual(self._created_handle(), "cachedContents/1")
+        self.clock.now = 500
+        self.assertEqual(self._handle(), "cachedContents/1")
+        self.cache.wait_until_idle()
+        self.assertEqual(self.client.caches.updated, [])
+        self.clock.now = 560
+        self.assertEqual(self._handle(), "cachedContents/1")
+        self.cache.wait_until_idle()
+        self.assertEqual(self.client.caches.updated, [("cachedContents/1", {"ttl": "600s"})])
+        self.clock.now = 1000
+        self.assertEqual(self._handle(), "cachedContents/1")
+        self.assertEqual(len(self.client.caches.created), 1)
+        self.assertEqual((self.cache.created, self.cache.refreshed, self.cache.reused), (1, 1, 4))
+
+    def test_create_is_queued_once_per_prefix(self):
+        self.assertIsNone(self._handle())
+        self.assertIsNone(self._handle())
+        self.cache.wait_until_idle()
+        self.assertEqual(len(self.client.caches.created), 1)
+
+    def test_expired_or_invalidated_handles_are_recreated(self):
+        self._created_handle()
+        self.clock.now = 700
+        self.assertEqual(self._created_handle(), "cachedContents/2")
+        self.cache.invalidate("cachedContents/2")
+        self.assertEqual(self._created_handle(), "cachedContents/3")
+        self.assertEqual(self._created_handle("another persona"), "cachedContents/4")
+
+    def test_prefix_below_the_minimum_is_never_offered(self):
+        cache = ContextCache(min_tokens=1024, clock=self.clock)
+        self.assertIsNone(cache.handle_for(self.client, "model", "A short persona."))
+        cache.wait_until_idle()
+        self.assertIsNone(cache.handle_for(self.client, "model", "A short persona."))
+        self.assertEqual(self.client.caches.created, [])
+        self.assertEqual(cache.refused, 1)
+
+    def test_refused_prefix_is_sent_inline_for_the_rest_of_the_session(self):
+        self.client.caches.refuse = True
+        self.assertIsNone(self._created_handle())
+        self.client.caches.refuse = False
+        self.clock.now = 10**6
+        self.assertIsNone(self._created_handle())
+        self.assertEqual(self.client.caches.created, [])
+        self.assertEqual(self.cache.refused, 1)
+
+    def test_transient_failure_is_retried_after_the_ttl(self):
+        self.client.caches.error = ConnectionError("503 unavailable")
+        self.assertIsNone(self._created_handle())
+        self.client.caches.error = None
+        self.assertIsNone(self._handle())
+        self.clock.now = 601
+        self.assertEqual(self._created_handle(), "cachedContents/1")
+        self.assertEqual(self.cache.refused, 0)
+
+    def test_release_all_deletes_created_caches(self):
+        self._handle()
+        self._handle("another persona")
+        self.cache.release_all(self.client)
+        self.assertEqual(self.client.caches.deleted, ["cachedContents/1", "cachedContents/2"])
+
+
+class TestNpcResponsePrefixCaching(unittest.TestCase):
+    def setUp(self):
+        self.api = GeminiAPI()
+        self.api._log_message = MagicMock()
+        self.generate = MagicMock(
+            return_value=SimpleNamespace(text='{"response_text": "Go home.", "stat_changes": {}}')
+        )
+        self.caches = FakeCaches()
+        self.client = SimpleNamespace(
+            models=SimpleNamespace(generate_content=self.generate), caches=self.caches
+        )
+        self.api.model = GeminiAPI._GeminiModelAdapter(self.client, "cache-model")
+        self.api.context_cache = ContextCache(min_tokens=0)
+        self.profile = {
+            "name": "Sonya",
+            "persona": "A meek, devout young woman.",
+            "situation_summary": "In the Haymarket at dusk.",
+            "conversation_history": "No prior conversation in this session.",
+        }
+
+    def _respond(self, player_input):
+        return self.api.generate_npc_response(self.profile, player_input, {"fear": 10})
+
+    def test_persona_prefix_is_cached_once_and_only_the_turn_is_sent(self):
+        self._respond("Hello")
+        self.api.context_cache.wait_until_idle()
+        self._respond("Goodbye")
+        self._respond("Farewell")
+        self.assertEqual(len(self.caches.created), 1)
+        model, config = self.caches.created[0]
+        self.assertEqual(model, "cache-model")
+        self.assertIn("A meek, devout young woman.", config["contents"][0])
+        first, *cached = self.generate.call_args_list
+        # The create runs in the background, so the first reply carries the prefix inline.
+        self.assertNotIn("cached_content", first.kwargs["config"])
+        self.assertIn("A meek, devout young woman.", first.kwargs["contents"])
+        for call, player_input in zip(cached, ("Goodbye", "Farewell")):
+            self.assertEqual(call.kwargs["config"]["cached_content"], "cachedContents/1")
+            self.assertNotIn("A meek, devout young woman.", call.kwargs["contents"])
+            self.assertIn(f'"{player_input}"', call.kwargs["contents"])
+
+    def test_prefix_is_sent_inline_without_cache_support(self):
+        self.caches.refuse = True
+        self.assertEqual(self._respond("Hello")["response_text"], "Go home.")
+        config = self.generate.call_args.kwargs["config"]
+        self.assertNotIn("cached_content", config)
+        self.assertIn("A meek, devout young woman.", self.generate.call_args.kwargs["contents"])
+
+    def test_failed_call_drops_the_cache_handle(self):
+        self._respond("Hello")
+        self.api.context_cache.wait_until_idle()
+        self.generate.side_effect = RuntimeError("404 CachedContent not found")
+        self.assertIn("(OOC:", self._respond("Hello again")["response_text"])
+        self.generate.side_effect = None
+        self._respond("Hello once more")
+        self.api.context_cache.wait_until_idle()
+        self.assertEqual(len(self.caches.created), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.character_module import Character  # noqa: E402
+from game_engine.conversation_session import ConversationSession  # noqa: E402
+from game_engine.gemini_interactions import GeminiAPI  # noqa: E402
+from game_engine.resilience import RetryPolicy  # noqa: E402
+
+
+class FakeChat:
+    def __init__(self, history, replies, fail=False):
+        self.history = list(history or [])
+        self.replies = replies
+        self.fail = fail
+        self.sent = []
+
+    def send_message(self, message):
+        if self.fail:
+            raise ValueError("400 chat not found")
+        self.sent.append(message)
+        reply = json.dumps({"response_text": self.replies.pop(0), "stat_changes": {"fear": 1}})
+        self.history += [("user", message), ("model", reply)]
+        return SimpleNamespace(text=reply)
+
+    def get_history(self):
+        return list(self.history)
+
+
+class FakeChats:
+    """A fake genai `client.chats` that records the chats it opened."""
+
+    def __init__(self, replies, fail=False):
+        self.replies = replies
+        self.fail = fail
+        self.created = []
+
+    def create(self, model, config, history=None):
+        chat = FakeChat(history, self.replies, self.fail)
+        self.created.append((model, config, chat))
+        return chat
+
+
+class TestConversationSession(unittest.TestCase):
+    def test_only_changed_state_is_reported(self):
+        session = ConversationSession(lambda history: FakeChat(history, []), "Sonya")
+        self.assertTrue(session.is_new)
+        session.record_exchange({"location": "Haymarket", "time_period": "Evening"})
+        changes = session.state_changes({"location": "Haymarket", "time_period": "Night"})
+        self.assertEqual(changes, {"time_period": "Night"})
+        self.assertFalse(session.is_new)
+
+    def test_long_chats_are_trimmed_to_the_latest_exchanges(self):
+        session = ConversationSession(
+            lambda history: FakeChat(history, ["..."] * 10),
+            "Sonya",
+            max_exchanges=3,
+            kept_exchanges=1,
+        )
+        for line in ("one", "two", "three"):
+            session.generate_content(line)
+            session.record_exchange({"location": "Haymarket"})
+        self.assertEqual([turn[1] for turn in session.chat.history][:1], ["three"])
+        self.assertEqual(len(session.chat.history), 2)
+        self.assertEqual(session.exchanges, 1)
+        # The situation is described in full again after a trim.
+        self.assertTrue(session.is_new)
+
+
+class TestGeminiConversations(unittest.TestCase):
+    def setUp(self):
+        self.api = GeminiAPI()
+        self.api._log_message = MagicMock()
+        self.api.retry_policy = RetryPolicy(sleep=lambda seconds: None)
+        self.npc = Character("Sonya", "persona", "greeting", "Haymarket", ["Haymarket"])
+        self.player = Character("Rodion", "persona", "greeting", "Haymarket", ["Haymarket"])
+
+    def _use(self, chats):
+        client = SimpleNamespace(chats=chats, models=MagicMock())
+        self.api.model = GeminiAPI._GeminiModelAdapter(client, "m")
+        return client
+
+    def _talk(self, line, session, time_period="Evening"):
+        return self.api.get_npc_dialogue(
+            self.npc,
+            self.player,
+            line,
+            "Haymarket",
+            time_period,
+            "Neutral",
+            "No memories.",
+            session=session,
+        )
+
+    def test_turns_send_the_player_line_and_the_state_delta(self):
+        chats = FakeChats(["Good evening.", "It is late."])
+        client = self._use(chats)
+        session = self.api.open_conversation(self.npc, self.player)
+        _, config, chat = chats.created[0]
+        self.assertIn("Embody Sonya", config["system_instruction"])
+        self.assertEqual(config["response_mime_type"], "application/json")
+
+        self.assertEqual(self._talk("Hello", session), "Good evening.")
+        self.assertEqual(self._talk("And now?", session, time_period="Night"), "It is late.")
+        first, second = chat.sent
+        self.assertIn("Location: Haymarket", first)
+        self.assertIn("Earlier conversation", first)
+        self.assertNotIn("Location", second)
+        self.assertIn("Time: Night", second)
+        self.assertIn('"fear": 1', second)
+        self.assertIn('"And now?"', second)
+        self.assertLess(len(second), len(first))
+        client.models.generate_content.assert_not_called()
+        self.assertEqual(self.api.ai_metrics.rows()[0]["call_site"], "npc_chat")
+        self.assertIn("It is late.", self.npc.conversation_histories["Rodion"][-1])
+
+    def test_failed_chat_falls_back_to_stateless_prompts(self):
+        client = self._use(FakeChats([], fail=True))
+        client.models.generate_content.return_value = SimpleNamespace(
+            text='{"response_text": "Who is there?", "stat_changes": {}}'
+        )
+        session = self.api.open_conversation(self.npc, self.player)
+        self.assertTrue(self._talk("Hello", session).startswith("(OOC:"))
+        self.assertTrue(session.closed)
+        self.assertEqual(self._talk("Hello?", session), "Who is there?")
+        client.models.generate_content.assert_called_once()
+
+    def test_no_session_without_a_chats_surface(self):
+        self.api.model = GeminiAPI._GeminiModelAdapter(SimpleNamespace(models=MagicMock()), "m")
+        self.assertIsNone(self.api.open_conversation(self.npc, self.player))
+
+
+if __name__ == "__main__":
+    unittest.main()
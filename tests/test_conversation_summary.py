@@ -0,0 +1,125 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.character_module import Character  # noqa: E402
+from game_engine.conversation_summary import (  # noqa: E402
+    ConversationSummarizer,
+    condense_line,
+    extractive_summary,
+)
+from game_engine.game_config import (  # noqa: E402
+    CONVERSATION_HISTORY_MAX_LINES,
+    CONVERSATION_SUMMARY_MAX_CHARS,
+    CONVERSATION_SUMMARY_MAX_PENDING_LINES,
+)
+
+
+def _talk(character, lines):
+    for index in range(lines):
+        speaker = "Rodion" if index % 2 == 0 else "Sonya"
+        character.add_to_history("Rodion", speaker, f"Line {index} is here. And more talk follows.")
+
+
+class TestExtractiveSummary(unittest.TestCase):
+    def test_keeps_the_first_sentence_of_each_line(self):
+        self.assertEqual(condense_line("Sonya: I will pray. Go now."), "Sonya: I will pray.")
+        self.assertEqual(
+            extractive_summary("Earlier.", ["Rodion: Money. Please.", "Sonya: No."]),
+            "Earlier.\nRodion: Money.\nSonya: No.",
+        )
+
+    def test_drops_the_oldest_lines_to_fit_the_budget(self):
+        lines = [f"Rodion: Sentence number {index} is long enough." for index in range(60)]
+        summary = extractive_summary("", lines)
+        self.assertLessEqual(len(summary), CONVERSATION_SUMMARY_MAX_CHARS)
+        self.assertTrue(summary.endswith("number 59 is long enough."))
+        self.assertNotIn("number 0 ", summary)
+
+
+class TestCharacterHistorySummaries(unittest.TestCase):
+    def setUp(self):
+        self.npc = Character("Sonya", "persona", "greeting", "Haymarket", ["Haymarket"])
+
+    def test_evicted_lines_wait_for_the_summarizer(self):
+        _talk(self.npc, CONVERSATION_HISTORY_MAX_LINES + 3)
+        self.assertEqual(len(self.npc.conversation_histories["Rodion"]), 10)
+        self.assertEqual(len(self.npc.get_pending_summary_lines("Rodion")), 3)
+        history = self.npc.get_formatted_history("Rodion")
+        self.assertTrue(history.startswith("(Earlier, in summary:\nRodion: Line 0 is here."))
+        self.assertTrue(history.endswith("Line 12 is here. And more talk follows."))
+        recent_only = self.npc.get_formatted_history("Rodion", include_summary=False)
+        self.assertNotIn("(Earlier", recent_only)
+
+    def test_lines_are_folded_in_extractively_when_no_summary_arrives(self):
+        _talk(self.npc, CONVERSATION_HISTORY_MAX_LINES + CONVERSATION_SUMMARY_MAX_PENDING_LINES + 1)
+        entry = self.npc.conversation_summaries["Rodion"]
+        self.assertEqual(entry["pending"], [])
+        self.assertIn("Rodion: Line 0 is here.", entry["summary"])
+
+    def test_prompt_history_stays_bounded(self):
+        _talk(self.npc, 200)
+        recent_budget = 6 * len("Rodion: Line 199 is here. And more talk follows.\n")
+        overhead = len("(Earlier, in summary:\n)\n")
+        self.assertLessEqual(
+            len(self.npc.get_formatted_history("Rodion")),
+            CONVERSATION_SUMMARY_MAX_CHARS + recent_budget + overhead,
+        )
+
+    def test_summaries_survive_a_save(self):
+        _talk(self.npc, CONVERSATION_HISTORY_MAX_LINES + 2)
+        loaded = Character.from_dict(self.npc.to_dict(), {})
+        self.assertEqual(loaded.conversation_summaries, self.npc.conversation_summaries)
+
+
+class TestConversationSummarizer(unittest.TestCase):
+    def setUp(self):
+        self.npc = Character("Sonya", "persona", "greeting", "Haymarket", ["Haymarket"])
+        self.api = MagicMock()
+        self.summarizer = ConversationSummarizer(self.api)
+
+    def test_ai_summary_replaces_the_pending_lines(self):
+        self.api.get_conversation_summary.return_value = "Rodion begged; Sonya refused."
+        _talk(self.npc, CONVERSATION_HISTORY_MAX_LINES + 2)
+        self.summarizer.schedule(self.npc, "Rodion")
+        self.summarizer.wait_until_idle()
+        args = self.api.get_conversation_summary.call_args[0]
+        self.assertEqual(args[:3], ("Sonya", "Rodion", ""))
+        self.assertEqual(len(args[3]), 2)
+        self.assertEqual(
+            self.npc.conversation_summaries["Rodion"],
+            {"summary": "Rodion begged; Sonya refused.", "pending": []},
+        )
+        self.assertEqual(self.summarizer.stats()["summarized"], 1)
+
+    def test_fallback_text_leaves_the_lines_pending(self):
+        self.api.get_conversation_summary.return_value = "(OOC: Skipped to stay within budget.)"
+        _talk(self.npc, CONVERSATION_HISTORY_MAX_LINES + 2)
+        self.summarizer.schedule(self.npc, "Rodion")
+        self.summarizer.wait_until_idle()
+        self.assertEqual(len(self.npc.get_pending_summary_lines("Rodion")), 2)
+        self.assertEqual(self.summarizer.stats()["failed"], 1)
+
+    def test_nothing_is_queued_below_min_lines(self):
+        _talk(self.npc, CONVERSATION_HISTORY_MAX_LINES + 2)
+        self.summarizer.schedule(self.npc, "Rodion", min_lines=4)
+        self.summarizer.wait_until_idle()
+        self.api.get_conversation_summary.assert_not_called()
+
+    def test_summary_built_on_a_stale_base_is_discarded(self):
+        _talk(self.npc, CONVERSATION_HISTORY_MAX_LINES + 2)
+        previous, lines = self.npc.summary_snapshot("Rodion")
+        _talk(self.npc, CONVERSATION_SUMMARY_MAX_PENDING_LINES)  # forces an extractive fold
+        self.assertFalse(
+            self.npc.apply_conversation_summary("Rodion", previous, len(lines), "Stale.")
+        )
+        self.assertNotEqual(self.npc.conversation_summaries["Rodion"]["summary"], "Stale.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,7 @@ from unittest.mock import MagicMock, patch
 from game_engine.character_module import Character, load_characters_data
 from game_engine.command_handler import CommandHandler
 from game_engine.event_manager import EventManager
-from game_engine.game_config import Colors
+from game_engine.game_config import Colors, MAX_PLAYER_MEMORIES
 from game_engine.game_state import Game
 from game_engine.gemini_interactions import GeminiAPI, NaturalLanguageParser
 from game_engine.location_module import load_locations_data
@@ -87,9 +87,9 @@ def test_character_edge_paths_inventory_psychology_and_memory_formats():
     with patch("builtins.print") as mock_print:
         c.add_player_memory("bad", 1, "not a dict")
     assert mock_print.called
-    for idx in range(31):
+    for idx in range(MAX_PLAYER_MEMORIES + 1):
         c.add_player_memory("other", idx, {"summary": str(idx)})
-    assert len(c.memory_about_player) == 30
+    assert len(c.memory_about_player) == MAX_PLAYER_MEMORIES
 
     empty = Character("Empty", "p", "g", "L", ["L"])
     assert "don't recall" in empty.get_player_memory_summary(current_turn=1)
@@ -302,10 +302,11 @@ def test_game_state_save_load_and_initialize_edge_paths(tmp_path):
     save_file = tmp_path / "savegame.json"
     with patch("game_engine.game_state.SAVE_GAME_FILE", str(save_file)):
         game.save_game(is_autosave=True)
+        assert game.save_writer.flush(timeout=5)
         assert save_file.exists()
 
     with patch("game_engine.game_state.SAVE_GAME_FILE", str(save_file)), patch(
-        "game_engine.game_state.open",
+        "game_engine.game_state.write_checkpoint",
         side_effect=OSError("disk full"),
     ):
         game.save_game()
@@ -233,6 +233,25 @@ def test_natural_language_parser_defaults_and_success():
     assert out["intent"] == "take"
 
 
+def test_natural_language_parser_memoizes_per_scene():
+    api = GeminiAPI()
+    api.model = MagicMock()
+    api.model.generate_content.return_value = SimpleNamespace(
+        text='{"intent":"take","target":"apple","confidence":0.9}'
+    )
+    parser = NaturalLanguageParser(api)
+    scene = {"items": ["apple", "book"], "npcs": ["Sonia"]}
+    parser.parse_player_intent("Snatch  the apple", scene)
+    reordered = {"npcs": ["Sonia"], "items": ["book", "apple"]}
+    assert parser.parse_player_intent("snatch the apple", reordered)["target"] == "apple"
+    assert api.model.generate_content.call_count == 1
+    assert parser.intent_cache_stats()["hits"] == 1
+
+    parser.parse_player_intent("snatch the apple", {"items": ["book"], "npcs": ["Sonia"]})
+    assert api.model.generate_content.call_count == 2
+    assert parser.intent_cache_stats()["entries"] == 1
+
+
 def test_gemini_api_json_and_config_helpers(tmp_path):
     api = GeminiAPI()
     assert api._extract_json_payload("```json\n{\"a\":1}\n```") == {"a": 1}
@@ -0,0 +1,109 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine import data_bundle  # noqa: E402
+from game_engine.data_bundle import (  # noqa: E402
+    BUNDLE_RELATIVE_PATH,
+    build_bundle,
+    find_item_data_problems,
+    load_bundle,
+)
+from game_engine.game_config import HIGHLY_NOTABLE_ITEMS_FOR_MEMORY  # noqa: E402
+
+
+class TestDataBundle(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base_path = self.tmp.name
+        shutil.copytree(os.path.join(project_root, "data"), os.path.join(self.base_path, "data"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_bundle_round_trips_the_json_data(self):
+        output_path, _ = build_bundle(HIGHLY_NOTABLE_ITEMS_FOR_MEMORY, self.base_path)
+        self.assertEqual(output_path, os.path.join(self.base_path, BUNDLE_RELATIVE_PATH))
+        bundle = load_bundle(self.base_path)
+        self.assertIsNotNone(bundle)
+        with open(os.path.join(self.base_path, "data", "items.json"), encoding="utf-8") as f:
+            self.assertEqual(bundle["items"], json.load(f))
+
+    def test_stale_bundle_is_ignored(self):
+        build_bundle(HIGHLY_NOTABLE_ITEMS_FOR_MEMORY, self.base_path)
+        with open(os.path.join(self.base_path, "data", "items.json"), "a", encoding="utf-8") as f:
+            f.write("\n")
+        self.assertIsNone(load_bundle(self.base_path))
+
+    def test_unchanged_sources_are_not_rehashed(self):
+        build_bundle(HIGHLY_NOTABLE_ITEMS_FOR_MEMORY, self.base_path)
+        with patch.object(data_bundle, "source_hash") as rehash:
+            self.assertIsNotNone(load_bundle(self.base_path))
+        rehash.assert_not_called()
+
+    def test_touched_but_unchanged_sources_still_match(self):
+        build_bundle(HIGHLY_NOTABLE_ITEMS_FOR_MEMORY, self.base_path)
+        items_path = os.path.join(self.base_path, "data", "items.json")
+        stat = os.stat(items_path)
+        os.utime(items_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNotNone(load_bundle(self.base_path))
+
+    def test_bundle_is_used_when_json_sources_are_not_shipped(self):
+        build_bundle(HIGHLY_NOTABLE_ITEMS_FOR_MEMORY, self.base_path)
+        os.remove(os.path.join(self.base_path, "data", "characters.json"))
+        self.assertIsNotNone(load_bundle(self.base_path))
+
+    def test_corrupt_bundle_is_ignored(self):
+        with open(os.path.join(self.base_path, BUNDLE_RELATIVE_PATH), "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(load_bundle(self.base_path))
+
+    def test_build_time_validation_is_reused_only_for_the_bundled_data(self):
+        build_bundle(HIGHLY_NOTABLE_ITEMS_FOR_MEMORY, self.base_path)
+        bundle = load_bundle(self.base_path)
+        with patch.object(data_bundle, "_bundle", bundle):
+            self.assertEqual(
+                data_bundle.bundled_item_data_problems(
+                    bundle["characters"],
+                    bundle["locations"],
+                    bundle["items"],
+                    bundle["notable_items"],
+                ),
+                bundle["item_data_problems"],
+            )
+            self.assertIsNone(
+                data_bundle.bundled_item_data_problems(
+                    dict(bundle["characters"]),
+                    bundle["locations"],
+                    bundle["items"],
+                    bundle["notable_items"],
+                )
+            )
+
+    def test_find_item_data_problems(self):
+        problems = find_item_data_problems(
+            {"N": {"inventory_items": [{"name": "ghost"}]}},
+            {"A": {"items_present": [{"name": "axe"}]}},
+            {"axe": {"hidden_in_location": "Nowhere"}},
+            ["axe", "cross"],
+        )
+        self.assertEqual(
+            problems,
+            [
+                "Character 'N' references unknown item 'ghost'.",
+                "Item 'axe' references unknown hidden location 'Nowhere'.",
+                "Notable items list references unknown item 'cross'.",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
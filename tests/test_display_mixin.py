@@ -139,6 +139,15 @@ class TestDisplayMixin(unittest.TestCase):
             self.game.display_atmospheric_details()
             self.mock_print_color.assert_any_call("\nStatic spooky.", Colors.CYAN)
 
+    def test_display_atmospheric_details_uses_prefetched_text(self):
+        self.game.gemini_api.get_atmospheric_details = MagicMock(return_value="Generated.")
+        self.game.world_manager = MagicMock()
+        self.game.atmosphere_prefetcher = MagicMock()
+        self.game.atmosphere_prefetcher.take.return_value = "Prefetched gloom."
+        self.game.display_atmospheric_details()
+        self.mock_print_color.assert_any_call("\nPrefetched gloom.", Colors.CYAN)
+        self.game.gemini_api.get_atmospheric_details.assert_not_called()
+
     def test_display_objectives(self):
         self.game.player_character.objectives = []
         self.game.display_objectives()
@@ -36,12 +36,14 @@ class TestGameState(unittest.TestCase):
         self.game.gemini_api.chosen_model_name = "test_model"
         self.game.low_ai_data_mode = False
 
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("json.dump")
-    def test_save_game(self, mock_json_dump, mock_open):
+    @patch("game_engine.game_state.write_checkpoint")
+    def test_save_game(self, mock_write_checkpoint):
         self.game.save_game()
 
-        mock_open.assert_called_once_with("savegame.json", "w", encoding="utf-8")
+        mock_write_checkpoint.assert_called_once()
+        args, kwargs = mock_write_checkpoint.call_args
+        self.assertEqual(args[0], "savegame.json")
+        self.assertEqual(args[2], self.game.save_codec)
 
         expected_save_data = {
             "player_character_name": "Test Player",
@@ -66,9 +68,7 @@ class TestGameState(unittest.TestCase):
             "command_history": [],
         }
 
-        mock_json_dump.assert_called_once()
-        args, kwargs = mock_json_dump.call_args
-        self.assertEqual(args[0], expected_save_data)
+        self.assertEqual(args[1], expected_save_data)
 
     @patch("os.path.exists", return_value=True)
     @patch("builtins.open", new_callable=mock_open, read_data="{}")
@@ -147,11 +147,11 @@ class TestGameState(unittest.TestCase):
         time_advanced = self.game._handle_wait_command()
         self.assertEqual(time_advanced, TIME_UNITS_PER_PLAYER_ACTION * 5)
 
-    @patch("builtins.open", new_callable=mock_open)
-    @patch("json.dump")
-    def test_save_game_with_slot(self, mock_json_dump, mock_open_file):
+    @patch("game_engine.game_state.write_checkpoint")
+    def test_save_game_with_slot(self, mock_write_checkpoint):
         self.game.save_game("slot1")
-        mock_open_file.assert_called_once_with("savegame_slot1.json", "w", encoding="utf-8")
+        mock_write_checkpoint.assert_called_once()
+        self.assertEqual(mock_write_checkpoint.call_args.args[0], "savegame_slot1.json")
 
     @patch("os.path.exists", return_value=True)
     @patch("builtins.open", new_callable=mock_open, read_data="{}")
@@ -1,5 +1,9 @@
+import asyncio
+import tempfile
+import threading
 import unittest
-from unittest.mock import MagicMock
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 import os
 import sys
 
@@ -9,6 +13,7 @@ if project_root not in sys.path:
 
 from game_engine.gemini_interactions import GeminiAPI  # noqa: E402
 from game_engine.character_module import Character  # noqa: E402
+from game_engine.import_profile import format_import_profile, parse_importtime  # noqa: E402
 
 
 class TestGeminiInteractions(unittest.TestCase):
@@ -54,6 +59,195 @@ class TestGeminiInteractions(unittest.TestCase):
         )
         self.assertEqual(dream, "You dream of electric sheep.")
 
+    def test_identical_prompts_are_served_from_cache(self):
+        self.api.model.model_name = "test-model"
+        self.api.model.generate_content.return_value.text = "Fog rolls along the canal."
+        first = self.api.get_atmospheric_details(self.player, "Canal", "night")
+        second = self.api.get_atmospheric_details(self.player, "Canal", "night")
+        self.assertEqual(first, second)
+        self.assertEqual(self.api.model.generate_content.call_count, 1)
+
+        self.api.get_atmospheric_details(self.player, "Canal", "night", use_cache=False)
+        self.assertEqual(self.api.model.generate_content.call_count, 2)
+
+    def test_ooc_fallbacks_are_not_cached(self):
+        self.api.model.model_name = "test-model"
+        self.api.model.generate_content.side_effect = RuntimeError("offline")
+        self.assertTrue(self.api.get_atmospheric_details(self.player, "Canal", "night").startswith("(OOC:"))
+        self.api.model.generate_content.side_effect = None
+        self.api.model.generate_content.return_value.text = "Recovered."
+        self.assertEqual(self.api.get_atmospheric_details(self.player, "Canal", "night"), "Recovered.")
+
+    def test_async_variant_uses_aio_client(self):
+        async def aio_generate(**kwargs):
+            return SimpleNamespace(text=f"Async reply from {kwargs['model']}.")
+
+        client = SimpleNamespace(
+            models=SimpleNamespace(generate_content=MagicMock(side_effect=AssertionError)),
+            aio=SimpleNamespace(models=SimpleNamespace(generate_content=aio_generate)),
+        )
+        self.api.model = GeminiAPI._GeminiModelAdapter(client, "async-model")
+        details = asyncio.run(self.api.get_atmospheric_details_async(self.player, "Canal", "night"))
+        self.assertEqual(details, "Async reply from async-model.")
+        client.models.generate_content.assert_not_called()
+
+    def test_gather_generations_runs_requests_concurrently(self):
+        # Each request waits for the other, so a serial run would time out.
+        barriers = []
+
+        async def request(text):
+            if not barriers:
+                barriers.append(asyncio.Barrier(2))
+            await asyncio.wait_for(barriers[0].wait(), timeout=5)
+            return text
+
+        async def failing_request():
+            raise RuntimeError("offline")
+
+        results = self.api.gather_generations(
+            request("first"), request("second"), failing_request()
+        )
+        self.assertEqual(results, ["first", "second", None])
+
+    def test_gather_generations_reuses_one_event_loop_across_turns(self):
+        # Like the SDK's pooled async client, this one only works on the loop it first ran on.
+        bound = []
+
+        async def aio_generate(**kwargs):
+            loop = asyncio.get_running_loop()
+            bound.append(bound[0] if bound else loop)
+            if bound[0] is not loop:
+                raise RuntimeError("Event loop is closed")
+            return SimpleNamespace(text="The canal smells of tar.")
+
+        client = SimpleNamespace(
+            models=SimpleNamespace(generate_content=MagicMock(side_effect=AssertionError)),
+            aio=SimpleNamespace(models=SimpleNamespace(generate_content=aio_generate)),
+        )
+        self.api.model = GeminiAPI._GeminiModelAdapter(client, "async-model")
+        for location in ("Canal", "Bridge"):
+            results = self.api.gather_generations(
+                self.api.get_atmospheric_details_async(self.player, location, "night"),
+                self.api.get_atmospheric_details_async(self.player, location, "dawn"),
+            )
+            self.assertEqual(results, ["The canal smells of tar."] * 2)
+        self.assertEqual(len(bound), 4)
+
+
+class TestBackgroundApiSetup(unittest.TestCase):
+    def _api_with_reply(self, reply_text, release):
+        def generate_content(**kwargs):
+            release.wait(timeout=5)
+            return SimpleNamespace(text=reply_text)
+
+        api = GeminiAPI()
+        api._print_color_func = MagicMock()
+        api.genai = SimpleNamespace(
+            Client=lambda **kwargs: SimpleNamespace(
+                models=SimpleNamespace(generate_content=generate_content)
+            )
+        )
+        return api
+
+    def test_verification_runs_in_background_until_model_is_read(self):
+        release = threading.Event()
+        api = self._api_with_reply("test", release)
+        self.assertTrue(api._attempt_api_setup("key", "env", "m", background=True))
+        self.assertTrue(api._setup_thread.is_alive())
+        api._print_color_func.assert_not_called()
+        release.set()
+        self.assertEqual(api.model.model_name, "m")
+        self.assertIsNone(api._setup_thread)
+        api._print_color_func.assert_not_called()
+
+    def test_failed_background_verification_is_reported_on_first_read(self):
+        release = threading.Event()
+        release.set()
+        api = self._api_with_reply("no", release)
+        on_failure = MagicMock()
+        self.assertTrue(
+            api._attempt_api_setup("key", "config", "m", background=True, on_failure=on_failure)
+        )
+        self.assertIsNone(api.model)
+        self.assertIsNone(api.model)
+        on_failure.assert_called_once_with()
+        printed = " ".join(call.args[0] for call in api._print_color_func.call_args_list)
+        self.assertIn("failed", printed)
+        self.assertIn("placeholder responses", printed)
+
+
+class TestVerificationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        config_path = os.path.join(self.tmp.name, "gemini_config.json")
+        patcher = patch("game_engine.gemini_interactions.API_CONFIG_FILE", config_path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+        self.generate_content = MagicMock(return_value=SimpleNamespace(text="test"))
+        self.api = GeminiAPI()
+        self.api._print_color_func = MagicMock()
+        self.api._log_message = MagicMock()
+        self.api.genai = SimpleNamespace(
+            Client=lambda **kwargs: SimpleNamespace(
+                models=SimpleNamespace(generate_content=self.generate_content)
+            )
+        )
+
+    def _setup(self, key="key"):
+        return self.api._attempt_api_setup(key, "env", "m", use_verification_cache=True)
+
+    def test_recent_verification_skips_the_test_call(self):
+        self.assertTrue(self._setup())
+        self.assertTrue(self._setup())
+        self.assertEqual(self.generate_content.call_count, 1)
+        self.assertTrue(self._setup("other-key"))
+        self.assertEqual(self.generate_content.call_count, 2)
+        with open(GeminiAPI._verification_cache_path(), encoding="utf-8") as f:
+            self.assertNotIn("key", f.read().replace('"verified"', ""))
+
+    def test_failed_rewrite_keeps_the_previous_cache(self):
+        self._setup()
+        cache_path = GeminiAPI._verification_cache_path()
+        with open(cache_path, encoding="utf-8") as f:
+            before = f.read()
+        with patch("game_engine.atomic_write.os.replace", side_effect=OSError("disk full")):
+            self._setup("other-key")
+        with open(cache_path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(os.listdir(self.tmp.name), [os.path.basename(cache_path)])
+
+    def test_zero_ttl_always_verifies(self):
+        with patch.dict(os.environ, {"GEMINI_VERIFICATION_TTL_HOURS": "0"}):
+            self._setup()
+            self._setup()
+        self.assertEqual(self.generate_content.call_count, 2)
+
+    def test_auth_error_on_a_real_call_forgets_the_verification(self):
+        self._setup()
+        self.generate_content.side_effect = RuntimeError("403 PERMISSION_DENIED")
+        text = self.api._generate_content_with_fallback("prompt", "ctx", use_cache=False)
+        self.assertIn("Permission Denied", text)
+        self.assertIsNone(self.api.model)
+        self.generate_content.side_effect = None
+        self._setup()
+        self.assertEqual(self.generate_content.call_count, 3)
+
+
+class TestImportProfile(unittest.TestCase):
+    def test_parse_and_format_importtime_output(self):
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 | _io\n"
+            "import time:       300 |        300 |   json.decoder\n"
+            "import time:       200 |        500 | json\n"
+        )
+        entries = parse_importtime(stderr)
+        self.assertEqual(entries[1], ("json.decoder", 300, 300, 1))
+        report = format_import_profile(entries, top=1)
+        self.assertIn("0.6 ms across 3 modules", report)
+        self.assertTrue(report.rstrip().endswith("json"))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.intent_classifier import LocalIntentClassifier  # noqa: E402
+from game_engine.command_handler import CommandHandler  # noqa: E402
+
+
+CONTEXT = {
+    "exits": [
+        {"name": "Tavern", "description": "A door."},
+        {"name": "Crystal Palace Tavern", "description": "Further off."},
+    ],
+    "items": ["dusty bottle", "worn coin"],
+    "npcs": ["Sonya Marmeladova"],
+    "inventory": ["raskolnikov's axe"],
+}
+
+
+class TestLocalIntentClassifier(unittest.TestCase):
+    def setUp(self):
+        self.classifier = LocalIntentClassifier()
+
+    def test_resolves_verbs_against_scene(self):
+        cases = {
+            "grab the bottle": ("take", "dusty bottle"),
+            "head over to the tavern": ("move", "Tavern"),
+            "go to the crystal palace": ("move", "Crystal Palace Tavern"),
+            "talk with sonya": ("talk", "Sonya Marmeladova"),
+            "inspect my axe": ("examine", "raskolnikov's axe"),
+        }
+        for text, (intent, target) in cases.items():
+            payload = self.classifier.resolve(text, CONTEXT)
+            self.assertIsNotNone(payload, text)
+            self.assertEqual((payload["intent"], payload["target"]), (intent, target))
+        self.assertEqual(self.classifier.stats()["short_circuits"], len(cases))
+
+    def test_escalates_uncertain_input(self):
+        for text in ["burn the tavern", "don't take the coin", "look at the bottle and take it", "go"]:
+            self.assertIsNone(self.classifier.resolve(text, CONTEXT), text)
+        self.assertEqual(self.classifier.stats()["escalations"], 4)
+        self.assertEqual(self.classifier.stats()["short_circuit_rate"], 0.0)
+        self.assertEqual(
+            self.classifier.format_status(),
+            "Commands resolved locally: 0 of 4 (0%); 4 went to Gemini.",
+        )
+
+    def test_command_handler_resolves_without_gemini(self):
+        handler = CommandHandler(MagicMock())
+        handler._build_intent_context = MagicMock(return_value=CONTEXT)
+        handler.game_state.gemini_api.model = None
+        self.assertEqual(handler._interpret_free_text("grab the bottle"), ("take", "dusty bottle"))
+        handler.game_state.nl_parser.parse_player_intent.assert_not_called()
+
+        handler.game_state.gemini_api.model = object()
+        handler.game_state.nl_parser.parse_player_intent.return_value = {
+            "intent": "talk",
+            "target": "Sonya Marmeladova",
+            "confidence": 0.9,
+        }
+        self.assertEqual(
+            handler._interpret_free_text("console the weeping girl"),
+            ("talk to", "Sonya Marmeladova"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 import sys
 import os
 
@@ -45,6 +45,9 @@ class TestItemInteractionHandler(unittest.TestCase):
         # Mock game systems
         self.game.gemini_api.model = MagicMock()
         self.game.gemini_api.get_item_interaction_description = MagicMock(return_value="A sharp axe.")
+        self.game.gemini_api.get_item_interaction_description_async = AsyncMock(
+            return_value="A sharp axe."
+        )
         self.game.world_manager.advance_time = MagicMock()
         self.game.world_manager.get_current_time_period = MagicMock(return_value="Day")
         self.game.event_manager.check_and_trigger_events = MagicMock(return_value=False)
@@ -61,7 +64,21 @@ class TestItemInteractionHandler(unittest.TestCase):
         item_def = {"description": "A base description."}
         self.game._inspect_item("axe", item_def, "inspecting an item", "the player looks at their axe", True)
         self.mock_print_color.assert_any_call('"A sharp axe."', Colors.GREEN)
-        self.game.gemini_api.get_item_interaction_description.assert_called_once()
+        self.game.gemini_api.get_item_interaction_description_async.assert_awaited_once()
+
+    def test_inspect_item_requests_description_and_detail_together(self):
+        self.game.player_character.check_skill = MagicMock(return_value=True)
+        self.game.gemini_api.get_enhanced_observation_async = AsyncMock(
+            return_value="A nick in the blade."
+        )
+        item_def = {"description": "A base description."}
+        self.game._inspect_item("axe", item_def, "inspecting an item", "the player looks at their axe", True)
+        self.mock_print_color.assert_any_call('"A sharp axe."', Colors.GREEN)
+        self.mock_print_color.assert_any_call('Detail: "A nick in the blade."', Colors.GREEN)
+        self.assertEqual(
+            self.game.gemini_api.get_enhanced_observation_async.call_args.kwargs["base_description"],
+            "A base description.",
+        )
 
     def test_inspect_item_without_gemini(self):
         self.game.gemini_api.model = None
@@ -0,0 +1,55 @@
+import unittest
+from types import SimpleNamespace
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.character_module import Character  # noqa: E402
+from game_engine.location_index import LocationIndex  # noqa: E402
+
+
+def _character(name, location):
+    return Character(name, "persona", "greeting", location, [location])
+
+
+class TestLocationIndex(unittest.TestCase):
+    def setUp(self):
+        self.sonya = _character("Sonya", "Sonya's Room")
+        self.porfiry = _character("Porfiry", "Porfiry's Office")
+        self.razumikhin = _character("Razumikhin", "Sonya's Room")
+        self.characters = {
+            "Sonya": self.sonya,
+            "Porfiry": self.porfiry,
+            "Razumikhin": self.razumikhin,
+        }
+        self.index = LocationIndex()
+        self.index.sync(self.characters)
+
+    def test_moves_update_the_index(self):
+        self.assertEqual(self.index.characters_at("Sonya's Room"), [self.sonya, self.razumikhin])
+        self.porfiry.current_location = "Sonya's Room"
+        self.sonya.current_location = "Haymarket Square"
+        # Occupants keep the order of the character mapping, as the old scan did.
+        self.assertEqual(
+            self.index.characters_at("Sonya's Room"), [self.porfiry, self.razumikhin]
+        )
+        self.assertEqual(self.index.characters_at("Haymarket Square"), [self.sonya])
+        self.assertEqual(self.index.characters_at("Porfiry's Office"), [])
+
+    def test_replaced_mapping_is_reindexed(self):
+        stranger = SimpleNamespace(name="Stranger", current_location="Tavern")
+        replacement = {"Sonya": self.sonya, "Stranger": stranger}
+        self.index.sync(replacement)
+        self.assertEqual(self.index.characters_at("Sonya's Room"), [self.sonya])
+        stranger.current_location = "Sonya's Room"
+        self.assertEqual(self.index.characters_at("Sonya's Room"), [self.sonya, stranger])
+        # Characters from the old mapping no longer report to this index.
+        self.razumikhin.current_location = "Tavern"
+        self.assertEqual(self.index.characters_at("Tavern"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import random
+import sys
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.character_module import Character  # noqa: E402
+from game_engine.memory_index import MemoryIndex, tokenize  # noqa: E402
+
+
+def _exchange(turn, statement, topic="", sentiment=0):
+    return {
+        "type": "dialogue_exchange",
+        "turn": turn,
+        "content": {"player_statement": statement, "topic_hint": topic},
+        "sentiment_impact": sentiment,
+    }
+
+
+class TestMemoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = MemoryIndex(Character._describe_player_memory)
+
+    def test_tokenize_drops_stopwords_and_punctuation(self):
+        self.assertEqual(
+            tokenize("I gave the old pawnbroker's ring!"), ["gave", "old", "pawnbroker's", "ring"]
+        )
+
+    def test_relevant_memories_outrank_unrelated_ones(self):
+        self.index.rebuild(
+            [
+                _exchange(1, "Where is the axe?", "the axe"),
+                _exchange(2, "Lovely weather today."),
+                _exchange(3, "I need money for my mother."),
+            ]
+        )
+        found = self.index.relevant("Tell me about that axe", current_turn=4, count=2)
+        self.assertEqual([mem["turn"] for mem in found], [1])
+
+    def test_recency_decay_prefers_the_newer_of_equal_matches(self):
+        self.index.rebuild([_exchange(1, "The ring."), _exchange(900, "The ring.")])
+        found = self.index.relevant("ring", current_turn=1000, count=2)
+        self.assertEqual([mem["turn"] for mem in found], [900, 1])
+
+    def test_eviction_removes_the_oldest_from_every_structure(self):
+        memories = [_exchange(1, "axe"), _exchange(2, "axe"), _exchange(3, "ring")]
+        self.index.rebuild(memories)
+        self.index.evict_oldest()
+        self.assertEqual(len(self.index), 2)
+        self.assertEqual([m["turn"] for m in self.index.relevant("axe", 3, 5)], [2])
+        self.assertEqual([m["turn"] for m in self.index.most_recent(5)], [3, 2])
+
+
+class TestCharacterMemoryRecall(unittest.TestCase):
+    def setUp(self):
+        self.npc = Character("Sonya", "persona", "greeting", "Haymarket", ["Haymarket"])
+
+    def test_without_a_query_the_summary_matches_the_old_recency_sort(self):
+        rng = random.Random(7)
+        for turn in range(60):
+            self.npc.add_player_memory(
+                "dialogue_exchange",
+                rng.randrange(30),
+                {"player_statement": f"statement {turn}", "topic_hint": ""},
+                rng.choice([-2, -1, 0, 1, 2]),
+            )
+        expected = sorted(
+            self.npc.memory_about_player,
+            key=lambda m: (m["turn"], abs(m["sentiment_impact"])),
+            reverse=True,
+        )[:7]
+        self.assertEqual(self.npc.recall_player_memories(40), expected)
+
+    def test_query_brings_a_relevant_old_memory_forward(self):
+        self.npc.add_player_memory(
+            "dialogue_exchange",
+            1,
+            {"player_statement": "The pawnbroker frightens me.", "topic_hint": ""},
+        )
+        for turn in range(2, 40):
+            self.npc.add_player_memory(
+                "player_action_observed", turn, {"action": "walked", "location": "Haymarket"}
+            )
+        summary = self.npc.get_player_memory_summary(40, query="What about the pawnbroker?")
+        self.assertIn("pawnbroker frightens", summary)
+        self.assertNotIn("pawnbroker", self.npc.get_player_memory_summary(40))
+        # The most recent memories keep their reserved slots.
+        self.assertIn("A moment ago, player walked in Haymarket", summary)
+
+    def test_replaced_memory_lists_are_reindexed(self):
+        self.npc.add_player_memory("other", 1, {"summary": "first"})
+        self.npc.memory_about_player = [
+            {"type": "other", "turn": 5, "content": {"summary": "loaded ring"}}
+        ]
+        self.assertIn("loaded ring", self.npc.get_player_memory_summary(6, query="ring"))
+
+
+if __name__ == "__main__":
+    unittest.main()
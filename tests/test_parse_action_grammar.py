@@ -0,0 +1,46 @@
+import unittest
+from types import SimpleNamespace
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.parse_action_benchmark import legacy_parse_action, load_corpus  # noqa: E402
+from game_engine.command_handler import CommandHandler  # noqa: E402
+from game_engine.game_config import COMMAND_SYNONYMS  # noqa: E402
+
+
+class TestCompiledCommandGrammar(unittest.TestCase):
+    def setUp(self):
+        self.handler = CommandHandler(SimpleNamespace())
+
+    def assert_matches_legacy(self, commands):
+        for command in commands:
+            self.assertEqual(
+                self.handler.parse_action(command), legacy_parse_action(command), command
+            )
+
+    def test_recorded_corpus_matches_legacy_parser(self):
+        self.assert_matches_legacy(load_corpus())
+
+    def test_every_synonym_matches_legacy_parser(self):
+        phrases = [p for base, synonyms in COMMAND_SYNONYMS.items() for p in [base] + synonyms]
+        commands = []
+        for phrase in phrases:
+            commands.extend([phrase, f"{phrase} sonya", f"{phrase}  the  axe ", f"{phrase}x"])
+        self.assert_matches_legacy(commands + ["", "   ", "look around the room", "pick  up coin"])
+
+    def test_stats_export_path_keeps_its_case(self):
+        self.assertEqual(
+            self.handler.parse_action("Stats ~/Reports/AI.csv"), ("stats", "~/Reports/AI.csv")
+        )
+        self.assertEqual(
+            self.handler.parse_action("AI Stats  /tmp/My Stats.json "),
+            ("stats", "/tmp/My Stats.json"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import MagicMock
+import os
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.character_module import Character  # noqa: E402
+from game_engine.gemini_interactions import GeminiAPI  # noqa: E402
+from game_engine.prefetcher import AtmospherePrefetcher  # noqa: E402
+
+
+class TestAtmospherePrefetcher(unittest.TestCase):
+    def setUp(self):
+        self.api = GeminiAPI()
+        self.api.model = MagicMock()
+        self.api.model.generate_content.return_value.text = "Wet cobbles gleam under the lamps."
+        self.player = Character("Player", "A student.", "...", "Haymarket Square", [])
+        self.prefetcher = AtmospherePrefetcher(self.api)
+
+    def test_prefetched_text_is_served_once(self):
+        args = ("Tavern", "Evening", "moved from Haymarket Square to Tavern.", "focus")
+        self.prefetcher.prefetch(self.player, *args)
+        self.prefetcher.wait_until_idle()
+        self.assertEqual(self.api.model.generate_content.call_count, 1)
+
+        self.assertEqual(
+            self.prefetcher.take(self.player, *args), "Wet cobbles gleam under the lamps."
+        )
+        self.assertIsNone(self.prefetcher.take(self.player, *args))
+        self.assertEqual(self.prefetcher.stats()["hits"], 1)
+
+    def test_changed_state_or_period_discards_entries(self):
+        args = ("Tavern", "Evening", None, "focus")
+        self.prefetcher.prefetch(self.player, *args)
+        self.prefetcher.wait_until_idle()
+
+        self.assertIsNone(self.prefetcher.take(self.player, "Tavern", "Night", None, "focus"))
+        self.assertEqual(self.prefetcher.stats()["entries"], 0)
+
+        self.prefetcher.prefetch(self.player, *args)
+        self.prefetcher.wait_until_idle()
+        self.player.apparent_state = "feverish"
+        self.assertIsNone(self.prefetcher.take(self.player, *args))
+
+    def test_ooc_results_are_not_stored(self):
+        self.api.model.generate_content.side_effect = RuntimeError("offline")
+        self.prefetcher.prefetch(self.player, "Tavern", "Evening", None, "focus")
+        self.prefetcher.wait_until_idle()
+        self.assertEqual(self.prefetcher.stats()["entries"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import sys
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.prompt_templates import (  # noqa: E402
+    TEMPLATES,
+    PromptTemplate,
+    compact,
+    estimate_tokens,
+)
+
+# Estimated tokens in each template's fixed text (everything but the filled-in values),
+# recorded when the templates were compacted. Raise a budget only on purpose.
+TOKEN_BUDGETS = {
+    "npc_situation": 75,
+    "npc_dialogue_prefix": 883,
+    "npc_dialogue_turn": 76,
+    "npc_chat_turn": 28,
+    "intent_classification": 161,
+    "player_reflection": 185,
+    "atmospheric_details": 92,
+    "npc_to_npc_interaction": 441,
+    "item_interaction_description": 140,
+    "dream_sequence": 111,
+    "conversation_summary": 119,
+    "rumor_or_gossip": 133,
+    "newspaper_article_snippet": 112,
+    "scenery_observation": 130,
+    "generated_text_document": 119,
+    "persuasion_player_state_note": 131,
+    "persuasion_player_items_note": 95,
+    "persuasion_objectives_note": 78,
+    "npc_persuasion": 498,
+    "enhanced_observation": 533,
+    "street_life_event_description": 341,
+}
+
+
+class TestPromptTemplates(unittest.TestCase):
+    def test_templates_stay_within_their_token_budgets(self):
+        self.assertEqual(set(TEMPLATES), set(TOKEN_BUDGETS), "record a budget for new templates")
+        for name, template in TEMPLATES.items():
+            with self.subTest(template=name):
+                self.assertLessEqual(template.fixed_tokens, TOKEN_BUDGETS[name])
+
+    def test_templates_carry_no_indentation_or_blank_lines(self):
+        for name, template in TEMPLATES.items():
+            with self.subTest(template=name):
+                for line in template.text.splitlines():
+                    self.assertTrue(line)
+                    self.assertEqual(line, line.strip())
+                    self.assertNotIn("  ", line)
+
+    def test_render_fills_every_field(self):
+        template = PromptTemplate(
+            "t",
+            """
+            **Task:** Describe {name}.
+                Use {{}} for nothing, then   greet {name}.
+            """,
+        )
+        self.assertEqual(template.fields, ("name",))
+        self.assertEqual(
+            template.render(name="Sonya"),
+            "**Task:** Describe Sonya.\nUse {} for nothing, then greet Sonya.",
+        )
+        with self.assertRaises(KeyError):
+            template.render()
+
+    def test_estimate_is_deterministic_and_charges_for_indentation(self):
+        text = "        **Task:** Describe the dream.\n        Output only the dream."
+        self.assertEqual(estimate_tokens(text), estimate_tokens(text))
+        self.assertLess(estimate_tokens(compact(text)), estimate_tokens(text))
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens("Dostoevskian 1866."), 3 + 4 + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.gemini_interactions import GeminiAPI, NaturalLanguageParser  # noqa: E402
+from game_engine.resilience import (  # noqa: E402
+    FATAL,
+    RETRYABLE,
+    TERMINAL,
+    UNKNOWN,
+    CircuitBreaker,
+    RetryPolicy,
+    classify_error,
+)
+
+
+class ApiError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class FlakyModels:
+    """A fake genai `client.models` that raises the scripted errors before answering."""
+
+    def __init__(self, *failures):
+        self.failures = list(failures)
+        self.calls = 0
+        self.timeouts = []
+
+    def generate_content(self, **kwargs):
+        self.calls += 1
+        self.timeouts.append(kwargs["config"]["http_options"]["timeout"])
+        if self.failures:
+            raise self.failures.pop(0)
+        return SimpleNamespace(text=f"Reply {self.calls}.")
+
+
+class TestClassifyError(unittest.TestCase):
+    def test_classification(self):
+        self.assertEqual(classify_error(ApiError(429, "RESOURCE_EXHAUSTED")), RETRYABLE)
+        self.assertEqual(classify_error(ApiError(503, "UNAVAILABLE")), RETRYABLE)
+        self.assertEqual(classify_error(TimeoutError("read timed out")), RETRYABLE)
+        self.assertEqual(classify_error(ApiError(400, "API key not valid")), FATAL)
+        self.assertEqual(classify_error(ApiError(400, "Prompt blocked for SAFETY")), TERMINAL)
+        self.assertEqual(classify_error(ApiError(400, "INVALID_ARGUMENT")), TERMINAL)
+        self.assertEqual(classify_error(RuntimeError("model down")), UNKNOWN)
+        # A status number alone in the message (e.g. a line count) is not a rate limit.
+        self.assertEqual(classify_error(RuntimeError("parsed 4290 lines")), UNKNOWN)
+
+
+class TestGeminiResilience(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.api = GeminiAPI()
+        self.api._log_message = MagicMock()
+        self.api.retry_policy = RetryPolicy(
+            max_attempts=3,
+            base_delay=1.0,
+            max_delay=4.0,
+            deadline=10.0,
+            sleep=self.clock.sleep,
+            clock=self.clock,
+        )
+        self.api.circuit_breaker = CircuitBreaker(
+            failure_threshold=2, cooldown_seconds=30, clock=self.clock
+        )
+
+    def _use(self, models):
+        self.api.model = GeminiAPI._GeminiModelAdapter(SimpleNamespace(models=models), "m")
+
+    def _generate(self):
+        return self.api._generate_content_with_fallback("p", "ctx", use_cache=False)
+
+    def test_rate_limits_are_retried_with_capped_backoff(self):
+        models = FlakyModels(ApiError(429, "RESOURCE_EXHAUSTED"), ApiError(503, "UNAVAILABLE"))
+        self._use(models)
+        self.assertEqual(self._generate(), "Reply 3.")
+        self.assertEqual(models.calls, 3)
+        self.assertLessEqual(self.clock.now, 1.0 + 2.0)
+        # Each attempt may only use what is left of the 10 s deadline.
+        self.assertEqual(models.timeouts[0], 10000)
+        self.assertEqual(models.timeouts[2], int((10.0 - self.clock.now) * 1000))
+
+    def test_safety_blocks_and_auth_errors_are_not_retried(self):
+        models = FlakyModels(ApiError(400, "blocked: SAFETY"))
+        self._use(models)
+        self.assertTrue(self._generate().startswith("(OOC:"))
+        self.assertEqual(models.calls, 1)
+        self.assertEqual(self.api.circuit_breaker.consecutive_failures, 0)
+
+    def test_deadline_stops_retries(self):
+        self.api.retry_policy.deadline = 0.01
+        models = FlakyModels(ApiError(503, "UNAVAILABLE"), ApiError(503, "UNAVAILABLE"))
+        self.api.retry_policy.rng = SimpleNamespace(uniform=lambda low, high: high)
+        self._use(models)
+        self.assertIn("muddled", self._generate())
+        self.assertEqual(models.calls, 1)
+
+    def test_circuit_opens_after_consecutive_failures_and_recovers(self):
+        models = FlakyModels(*[ApiError(503, "UNAVAILABLE")] * 6)
+        self._use(models)
+        self._generate()
+        self._generate()
+        self.assertEqual(self.api.circuit_breaker.state, "open")
+        calls_before = models.calls
+        self.assertIn("not answering", self._generate())
+        self.assertEqual(models.calls, calls_before)
+
+        self.clock.now += 31
+        models.failures.clear()
+        self.assertEqual(self.api.circuit_breaker.state, "half-open")
+        self.assertTrue(self._generate().startswith("Reply"))
+        self.assertEqual(self.api.circuit_breaker.state, "closed")
+
+    def test_open_circuit_skips_intent_parsing_without_counting_an_error(self):
+        self._use(FlakyModels())
+        self.api.circuit_breaker.opened_at = self.clock()
+        parser = NaturalLanguageParser(self.api)
+        payload = parser.parse_player_intent("go to the tavern", {})
+        self.assertEqual(payload["intent"], "unknown")
+        row = self.api.ai_metrics.rows()[0]
+        self.assertEqual((row["call_site"], row["skipped"], row["error"]), ("intent_classification", 1, 0))
+
+    def test_async_path_retries_too(self):
+        models = FlakyModels(ApiError(429, "RESOURCE_EXHAUSTED"))
+        self._use(models)
+        self.api.retry_policy.base_delay = 0
+        text = asyncio.run(
+            self.api._generate_content_with_fallback_async("p", "ctx", use_cache=False)
+        )
+        self.assertEqual(text, "Reply 2.")
+
+
+if __name__ == "__main__":
+    unittest.main()
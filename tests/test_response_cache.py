@@ -0,0 +1,80 @@
+import unittest
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.gemini_interactions import RESPONSE_CACHE_FILE_ENV_VAR, GeminiAPI  # noqa: E402
+from game_engine.response_cache import ResponseCache  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_key_ignores_prompt_indentation(self):
+        key_a = ResponseCache.make_key("model", "  Line one\n        Line two  ")
+        key_b = ResponseCache.make_key("model", "Line one Line two")
+        self.assertEqual(key_a, key_b)
+        self.assertNotEqual(key_a, ResponseCache.make_key("other-model", "Line one Line two"))
+        self.assertNotEqual(
+            key_a, ResponseCache.make_key("model", "Line one Line two", {"temperature": 0.1})
+        )
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", "first")
+        cache.put("b", "second")
+        self.assertEqual(cache.get("a"), "first")
+        cache.put("c", "third")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "first")
+        self.assertEqual(cache.get("c"), "third")
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = ResponseCache(ttl_seconds=10, clock=clock)
+        cache.put("a", "value")
+        clock.now += 5
+        self.assertEqual(cache.get("a"), "value")
+        clock.now += 6
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_database_survives_restart(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "cache.sqlite3")
+            first = ResponseCache(db_path=db_path)
+            first.put("key", "persisted text")
+            first.close()
+
+            second = ResponseCache(db_path=db_path)
+            self.assertEqual(second.get("key"), "persisted text")
+            second.clear(include_disk=True)
+            self.assertIsNone(second.get("key"))
+            second.close()
+
+    def test_cache_file_is_opened_at_configure_time_not_construction(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            db_path = os.path.join(temp_dir, "cache.sqlite3")
+            with patch.dict(os.environ, {RESPONSE_CACHE_FILE_ENV_VAR: db_path}):
+                api = GeminiAPI()
+                self.assertIsNone(api.response_cache.db_path)
+                self.assertFalse(os.path.exists(db_path))
+                api.attach_response_cache_file()
+            self.assertEqual(api.response_cache.db_path, db_path)
+            api.response_cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
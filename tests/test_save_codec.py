@@ -0,0 +1,153 @@
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.game_state import Game  # noqa: E402
+from game_engine.save_codec import (  # noqa: E402
+    SAVE_MAGIC,
+    available_codecs,
+    decode_save,
+    encode_save,
+    load_save,
+    resolve_codec,
+    strip_static_fields,
+)
+from convert_saves import convert_save  # noqa: E402
+
+STATIC = {
+    "Sonya": {
+        "skills": {"empathy": 3},
+        "apparent_state": "meek",
+        "objectives": [
+            {
+                "id": "help_family",
+                "description": "A very long description that lives in characters.json.",
+                "stages": [{"stage_id": "start", "description": "Also long."}],
+            }
+        ],
+    }
+}
+
+
+def _state():
+    return {
+        "game_time": 3,
+        "all_character_objects_state": {
+            "Sonya": {
+                "skills": {"empathy": 3},
+                "apparent_state": "weary",
+                "objectives": [
+                    {
+                        "id": "help_family",
+                        "description": "A very long description that lives in characters.json.",
+                        "completed": False,
+                        "active": True,
+                        "current_stage_id": "start",
+                        "stages": [{"stage_id": "start", "description": "Also long."}],
+                    },
+                    {"id": "improvised", "description": "Not in static data.", "stages": []},
+                ],
+            },
+            "Stranger": {"skills": {"luck": 1}},
+        },
+    }
+
+
+class TestSaveCodec(unittest.TestCase):
+    def test_strip_static_fields_keeps_only_differences(self):
+        stripped = strip_static_fields(_state(), STATIC)
+        sonya = stripped["all_character_objects_state"]["Sonya"]
+        self.assertNotIn("skills", sonya)
+        self.assertEqual(sonya["apparent_state"], "weary")
+        self.assertEqual(
+            sonya["objectives"][0],
+            {"id": "help_family", "completed": False, "active": True, "current_stage_id": "start"},
+        )
+        self.assertEqual(sonya["objectives"][1]["description"], "Not in static data.")
+        self.assertEqual(
+            stripped["all_character_objects_state"]["Stranger"], {"skills": {"luck": 1}}
+        )
+
+    def test_every_available_codec_round_trips(self):
+        expected = strip_static_fields(_state(), STATIC)
+        for codec in available_codecs():
+            with self.subTest(codec=codec):
+                raw = encode_save(_state(), codec, characters_data=STATIC)
+                self.assertEqual(decode_save(raw), expected)
+                self.assertEqual(load_save(io.BytesIO(raw)), expected)
+
+    def test_binary_codecs_carry_header_and_legacy_json_does_not(self):
+        self.assertTrue(encode_save({}, "json+zlib").startswith(SAVE_MAGIC + b"json+zlib\n"))
+        legacy = encode_save({"game_time": 1}, "json")
+        self.assertEqual(json.loads(legacy), {"game_time": 1})
+
+    def test_unavailable_codec_falls_back_to_stdlib(self):
+        self.assertEqual(resolve_codec("json+nonexistent"), "json+zlib")
+
+
+class TestSaveCodecWithGame(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.previous_cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.game = self._new_game()
+        self.game.world_manager.load_all_characters()
+        self.game.world_manager.select_player_character(non_interactive=True)
+
+    def tearDown(self):
+        os.chdir(self.previous_cwd)
+        self.tmp.cleanup()
+
+    @staticmethod
+    def _new_game():
+        game = Game()
+        game._print_color = MagicMock()
+        return game
+
+    def _loaded_objectives(self, slot):
+        loaded = self._new_game()
+        self.assertTrue(loaded.load_game(slot))
+        return loaded.player_character.objectives
+
+    def test_compact_save_loads_like_legacy_save_and_is_smaller(self):
+        self.game.save_codec = "json"
+        self.game.save_game("legacy")
+        self.game.save_codec = "json+zlib"
+        self.game.save_game("compact")
+        self.assertLess(
+            os.path.getsize("savegame_compact.json"), os.path.getsize("savegame_legacy.json") / 4
+        )
+        self.assertEqual(self._loaded_objectives("compact"), self._loaded_objectives("legacy"))
+
+    def test_converter_rewrites_legacy_file(self):
+        with open("savegame_old.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "player_character_name": self.game.player_character.name,
+                    "current_location_name": self.game.player_character.current_location,
+                    "all_character_objects_state": {
+                        name: char.to_dict()
+                        for name, char in self.game.all_character_objects.items()
+                    },
+                },
+                f,
+                indent=4,
+            )
+        before, after, folded = convert_save("savegame_old.json", "json+zlib")
+        self.assertLess(after, before)
+        self.assertEqual(folded, 0)
+        with open("savegame_old.json", "rb") as f:
+            self.assertTrue(f.read().startswith(SAVE_MAGIC))
+        self.assertEqual(self._loaded_objectives("old"), self.game.player_character.objectives)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.game_state import Game  # noqa: E402
+from game_engine.save_log import (  # noqa: E402
+    append_delta,
+    apply_delta,
+    delta_log_path,
+    replay_delta_log,
+)
+
+
+class TestDeltaLog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.save_file = os.path.join(self.tmp.name, "savegame_autosave.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_apply_delta_merges_character_fields(self):
+        state = {
+            "game_time": 1,
+            "all_character_objects_state": {
+                "Sonya": {"inventory": ["cross"], "journal_entries": ["a"]},
+                "Dunya": {"inventory": []},
+            },
+        }
+        merged = apply_delta(
+            state,
+            {"game_time": 5, "all_character_objects_state": {"Sonya": {"journal_entries": ["b"]}}},
+        )
+        self.assertEqual(merged["game_time"], 5)
+        self.assertEqual(
+            merged["all_character_objects_state"]["Sonya"],
+            {"inventory": ["cross"], "journal_entries": ["b"]},
+        )
+        self.assertEqual(merged["all_character_objects_state"]["Dunya"], {"inventory": []})
+        self.assertEqual(state["all_character_objects_state"]["Sonya"]["journal_entries"], ["a"])
+
+    def test_replay_skips_other_checkpoints_and_stops_at_torn_line(self):
+        append_delta(self.save_file, {"checkpoint_id": "old", "game_time": 99})
+        append_delta(self.save_file, {"checkpoint_id": "cp", "game_time": 2})
+        with open(delta_log_path(self.save_file), "a", encoding="utf-8") as f:
+            f.write('{"checkpoint_id": "cp", "game_ti')
+        state, applied = replay_delta_log(self.save_file, {"checkpoint_id": "cp", "game_time": 1})
+        self.assertEqual(applied, 1)
+        self.assertEqual(state["game_time"], 2)
+
+    def test_replay_ignores_saves_without_checkpoint_id(self):
+        append_delta(self.save_file, {"checkpoint_id": "cp", "game_time": 2})
+        state, applied = replay_delta_log(self.save_file, {"game_time": 1})
+        self.assertEqual((state, applied), ({"game_time": 1}, 0))
+
+
+class TestIncrementalAutosave(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.previous_cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.game = self._new_game()
+        self.game.world_manager.load_all_characters()
+        self.game.world_manager.select_player_character(non_interactive=True)
+
+    def tearDown(self):
+        os.chdir(self.previous_cwd)
+        self.tmp.cleanup()
+
+    @staticmethod
+    def _new_game():
+        game = Game()
+        game._print_color = MagicMock()
+        return game
+
+    def _npc_name(self):
+        player_name = self.game.player_character.name
+        return next(name for name in self.game.all_character_objects if name != player_name)
+
+    def _autosave(self):
+        self.game.save_game("autosave", is_autosave=True)
+        self.assertTrue(self.game.save_writer.flush(timeout=5))
+
+    def _read_log(self):
+        with open(delta_log_path("savegame_autosave.json"), encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_delta_contains_only_changed_character_fields(self):
+        self._autosave()
+        self.assertFalse(os.path.exists(delta_log_path("savegame_autosave.json")))
+        npc_name = self._npc_name()
+        self.game.all_character_objects[npc_name].add_to_history("Player", "Player", "Good day.")
+        self._autosave()
+
+        (delta,) = self._read_log()
+        for name, char_delta in delta["all_character_objects_state"].items():
+            if name == npc_name:
+                self.assertIn("conversation_histories", char_delta)
+            else:
+                self.assertNotIn("conversation_histories", char_delta)
+            self.assertNotIn("objectives", char_delta)
+            self.assertNotIn("memory_about_player", char_delta)
+
+    def test_load_replays_log_and_compaction_folds_it(self):
+        self._autosave()
+        npc_name = self._npc_name()
+        self.game.all_character_objects[npc_name].add_to_history("Player", "Player", "Good day.")
+        self.game.game_time = 42
+        self._autosave()
+
+        loaded = self._new_game()
+        self.assertTrue(loaded.load_game("autosave"))
+        self.assertEqual(loaded.game_time, 42)
+        self.assertEqual(
+            loaded.all_character_objects[npc_name].conversation_histories,
+            {"Player": ["Player: Good day."]},
+        )
+        self.assertEqual(loaded.delta_log_state["deltas"], 1)
+
+        self.assertTrue(loaded.compact_save())
+        self.assertFalse(os.path.exists(delta_log_path("savegame_autosave.json")))
+        compacted = self._new_game()
+        self.assertTrue(compacted.load_game("autosave"))
+        self.assertEqual(
+            compacted.all_character_objects[npc_name].conversation_histories,
+            {"Player": ["Player: Good day."]},
+        )
+
+    def test_full_checkpoint_after_interval(self):
+        self.game.save_checkpoint_interval = 2
+        for _ in range(3):
+            self._autosave()
+        self.assertEqual(len(self._read_log()), 2)
+        self._autosave()
+        self.assertFalse(os.path.exists(delta_log_path("savegame_autosave.json")))
+        self.assertEqual(self.game.delta_log_state["deltas"], 0)
+
+    def test_manual_save_drops_stale_log(self):
+        self._autosave()
+        self._autosave()
+        self.game.save_game("autosave")
+        self.assertFalse(os.path.exists(delta_log_path("savegame_autosave.json")))
+        self.assertIsNone(self.game.delta_log_state["path"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import ANY, MagicMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.atomic_write import write_json_atomic  # noqa: E402
+from game_engine.save_writer import SaveWriter  # noqa: E402
+from game_engine.game_state import Game  # noqa: E402
+from game_engine.character_module import Character  # noqa: E402
+
+
+class TestWriteJsonAtomic(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "savegame_autosave.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_complete_file_without_leaving_temp_files(self):
+        write_json_atomic(self.path, {"day": 2})
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"day": 2})
+        self.assertEqual(os.listdir(self.tmp.name), ["savegame_autosave.json"])
+
+    def test_failed_write_keeps_previous_save_intact(self):
+        write_json_atomic(self.path, {"day": 1})
+        with self.assertRaises(TypeError):
+            write_json_atomic(self.path, {"day": object()})
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), {"day": 1})
+        self.assertEqual(os.listdir(self.tmp.name), ["savegame_autosave.json"])
+
+
+class TestSaveWriter(unittest.TestCase):
+    def test_submit_copies_data_before_returning(self):
+        written = []
+        writer = SaveWriter(write=lambda path, data: written.append((path, data)))
+        data = {"inventory": ["axe"]}
+        writer.submit("save.json", data)
+        data["inventory"].append("coin")
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(written, [("save.json", {"inventory": ["axe"]})])
+
+    def test_only_newest_pending_snapshot_is_written(self):
+        release = threading.Event()
+        started = threading.Event()
+        written = []
+
+        def slow_write(path, data):
+            started.set()
+            release.wait(5)
+            written.append(data["turn"])
+
+        writer = SaveWriter(write=slow_write)
+        writer.submit("save.json", {"turn": 1})
+        self.assertTrue(started.wait(5))
+        for turn in (2, 3, 4):
+            writer.submit("save.json", {"turn": turn})
+        release.set()
+        self.assertTrue(writer.flush(timeout=5))
+        self.assertEqual(written, [1, 4])
+        self.assertEqual(writer.stats()["coalesced"], 2)
+
+    def test_write_errors_are_kept_for_the_game_to_report(self):
+        writer = SaveWriter(write=MagicMock(side_effect=OSError("disk full")))
+        writer.submit("save.json", {})
+        self.assertTrue(writer.flush(timeout=5))
+        errors = writer.pop_errors()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], "save.json")
+        self.assertEqual(writer.pop_errors(), [])
+
+
+class TestGameAutosave(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.game._print_color = MagicMock()
+        self.game.player_character = Character("P", "p", "g", "Room", ["Room"], is_player=True)
+        self.game.current_location_name = "Room"
+
+    def test_autosave_goes_through_background_writer(self):
+        self.game.save_writer = MagicMock()
+        self.game.save_writer.pop_errors.return_value = []
+        with patch("builtins.open") as mock_open_file:
+            self.game.save_game("autosave", is_autosave=True)
+        mock_open_file.assert_not_called()
+        path, data = self.game.save_writer.submit.call_args.args
+        self.assertEqual(path, "savegame_autosave.json")
+        self.assertEqual(data["player_character_name"], "P")
+
+    def test_pending_autosave_errors_are_reported_on_next_autosave(self):
+        self.game.save_writer = SaveWriter(write=MagicMock(side_effect=OSError("disk full")))
+        self.game.save_game("autosave", is_autosave=True)
+        self.game.save_writer.flush(timeout=5)
+        self.game.save_game("autosave", is_autosave=True)
+        self.game._print_color.assert_any_call(
+            "Error autosaving to savegame_autosave.json: disk full", ANY
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import pickle
+import sys
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+from game_engine.simulation import (  # noqa: E402
+    HeadlessGame,
+    ScriptedAgent,
+    format_report,
+    run_parallel_simulation,
+    run_simulation,
+    scripted_agent_factory,
+    simulate_run,
+)
+
+
+class TestSimulation(unittest.TestCase):
+    def test_run_simulation_reports_throughput_and_events(self):
+        report = run_simulation([1, 2], days=1)
+        self.assertEqual(report["runs"], 2)
+        self.assertGreater(report["turns"], 0)
+        self.assertEqual(len(report["per_run"]), 2)
+        for key in ("elapsed_seconds", "turns_per_second", "event_counts", "events_per_day"):
+            self.assertIn(key, report)
+        self.assertIn("Runs: 2 x 1 day(s)", format_report(report))
+
+    def test_same_seed_replays_identically(self):
+        first = simulate_run(7, days=2)
+        second = simulate_run(7, days=2)
+        self.assertEqual(first, second)
+
+    def test_scripted_agent_replays_commands(self):
+        run = simulate_run(3, days=1, agent_factory=lambda rng: ScriptedAgent(["look", "wait"]))
+        self.assertGreater(run["turns"], 0)
+        self.assertFalse(run["ended"])
+
+    def test_headless_game_never_prompts_or_uses_ai(self):
+        game = HeadlessGame()
+        self.assertTrue(game.start_new_game())
+        self.assertIsNone(game.gemini_api.model)
+        self.assertTrue(game.low_ai_data_mode)
+        self.assertEqual(game._input_color("> ", ""), "")
+
+    def test_scripted_agent_requires_commands(self):
+        with self.assertRaises(ValueError):
+            ScriptedAgent(["", "  "])
+
+    def test_run_records_objectives_events_and_notoriety_curve(self):
+        run = simulate_run(5, days=2)
+        self.assertEqual(len(run["notoriety_by_day"]), run["days_played"])
+        self.assertIsInstance(run["triggered_events"], list)
+        self.assertIsInstance(run["objectives_completed"], list)
+        self.assertIsNone(run["ending_turn"])
+
+    def test_parallel_runner_matches_serial_runs(self):
+        seeds = [11, 12, 13]
+        serial = run_simulation(seeds, days=1)
+        parallel = run_parallel_simulation(seeds, days=1, workers=2)
+        self.assertEqual(parallel["workers"], 2)
+        self.assertEqual(parallel["per_run"], serial["per_run"])
+        self.assertEqual(parallel["event_counts"], serial["event_counts"])
+        self.assertEqual(parallel["mean_notoriety_by_day"], serial["mean_notoriety_by_day"])
+
+    def test_scripted_agent_factory_survives_pickling(self):
+        factory = pickle.loads(pickle.dumps(scripted_agent_factory(["wait"])))
+        self.assertIsInstance(factory(None), ScriptedAgent)
+
+
+if __name__ == "__main__":
+    unittest.main()
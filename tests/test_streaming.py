@@ -0,0 +1,194 @@
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.character_module import Character  # noqa: E402
+from game_engine.gemini_interactions import GeminiAPI  # noqa: E402
+from game_engine.resilience import RetryPolicy  # noqa: E402
+from game_engine.streaming import (  # noqa: E402
+    JsonFieldStreamer,
+    StreamingTextPrinter,
+    apply_verbosity,
+)
+
+
+class StreamingModels:
+    """A fake genai `client.models` whose streams yield the scripted chunks."""
+
+    def __init__(self, chunks, fail_to_start=None, break_after=None):
+        self.chunks = chunks
+        self.fail_to_start = list(fail_to_start or [])
+        self.break_after = break_after
+        self.stream_calls = 0
+
+    def generate_content(self, **kwargs):
+        return SimpleNamespace(text="".join(self.chunks))
+
+    def generate_content_stream(self, **kwargs):
+        self.stream_calls += 1
+        if self.fail_to_start:
+            raise self.fail_to_start.pop(0)
+        return self._stream()
+
+    def _stream(self):
+        for index, text in enumerate(self.chunks):
+            if index == self.break_after:
+                raise ConnectionError("stream reset")
+            yield SimpleNamespace(text=text)
+
+
+class TestJsonFieldStreamer(unittest.TestCase):
+    def test_decodes_the_field_across_chunk_boundaries(self):
+        received = []
+        streamer = JsonFieldStreamer("response_text", received.append)
+        chunks = [
+            '{"stat_changes": {}, "respo',
+            'nse_text": "Say \\',
+            '"no\\"',
+            " \\u00e9",
+            't\\n"}',
+        ]
+        for chunk in chunks:
+            streamer.feed(chunk)
+        self.assertEqual("".join(received), 'Say "no" ét\n')
+        self.assertTrue(streamer.done)
+
+    def test_plain_text_replies_stream_nothing(self):
+        received = []
+        streamer = JsonFieldStreamer("response_text", received.append)
+        streamer.feed("Not JSON at all.")
+        self.assertEqual(received, [])
+
+
+class TestStreamingTextPrinter(unittest.TestCase):
+    def setUp(self):
+        self.output = []
+
+    def _print(self, text, color, end="\n"):
+        self.output.append(text + end)
+
+    def _stream(self, chunks, verbosity):
+        printer = StreamingTextPrinter(
+            self._print, "Sonya: ", "", "", suffix='"', verbosity=verbosity
+        )
+        for chunk in chunks:
+            printer.feed(chunk)
+        return printer
+
+    def test_brief_stops_after_the_first_sentence(self):
+        printer = self._stream(["  I know", " you. Go", " away now."], "brief")
+        printer.finish("I know you.")
+        self.assertEqual("".join(self.output), 'Sonya: I know you."\n')
+
+    def test_standard_truncates_long_text_with_an_ellipsis(self):
+        printer = self._stream(["word " * 200], "standard")
+        self.assertTrue(printer.printed.endswith("..."))
+        self.assertLessEqual(len(printer.printed), 550)
+
+    def test_text_held_back_near_the_limit_is_printed_on_finish(self):
+        text = "x" * 179
+        printer = self._stream([text], "brief")
+        self.assertEqual(printer.printed, "x" * 177)
+        printer.finish(text)
+        self.assertEqual("".join(self.output), f'Sonya: {text}"\n')
+
+    def test_streamed_text_is_what_apply_verbosity_returns(self):
+        texts = ["Short. Then more.", "A" * 200 + ". Second.", "word " * 200, "y" * 179]
+        for verbosity in ("brief", "standard"):
+            for text in texts:
+                printer = self._stream([text[i : i + 7] for i in range(0, len(text), 7)], verbosity)
+                final = apply_verbosity(text.strip(), verbosity)
+                printer.finish(final)
+                self.assertTrue(final.startswith(printer.printed), (verbosity, text))
+                self.assertEqual(self.output[-1], '"\n')
+                self.assertEqual("".join(self.output[1:-1]), final, (verbosity, text))
+                self.output.clear()
+
+    def test_nothing_printed_without_chunks(self):
+        printer = self._stream([], "rich")
+        printer.finish("Cached text.")
+        self.assertFalse(printer.streamed)
+        self.assertEqual(self.output, [])
+
+
+class TestGeminiStreaming(unittest.TestCase):
+    def setUp(self):
+        self.api = GeminiAPI()
+        self.api._log_message = MagicMock()
+        self.api.retry_policy = RetryPolicy(sleep=lambda seconds: None)
+
+    def _use(self, models):
+        self.api.model = GeminiAPI._GeminiModelAdapter(SimpleNamespace(models=models), "m")
+
+    def test_chunks_reach_on_text_and_the_full_text_is_returned(self):
+        self._use(StreamingModels(["The bridge ", "is cold ", "tonight."]))
+        received = []
+        text = self.api._stream_content_with_fallback(
+            "p", received.append, "ctx", use_cache=True, call_site="dream_sequence"
+        )
+        self.assertEqual(received, ["The bridge ", "is cold ", "tonight."])
+        self.assertEqual(text, "The bridge is cold tonight.")
+        self.assertEqual(self.api.ai_metrics.rows()[0]["ok"], 1)
+        # The assembled text is cached, so the next request is served without streaming.
+        received.clear()
+        again = self.api._stream_content_with_fallback(
+            "p", received.append, "ctx", use_cache=True, call_site="dream_sequence"
+        )
+        self.assertEqual(again, text)
+        self.assertEqual(received, [])
+
+    def test_stream_that_fails_to_start_is_retried(self):
+        models = StreamingModels(["Hello."], fail_to_start=[ConnectionError("reset")])
+        self._use(models)
+        text = self.api._stream_content_with_fallback("p", MagicMock(), "ctx", use_cache=False)
+        self.assertEqual(text, "Hello.")
+        self.assertEqual(models.stream_calls, 2)
+
+    def test_broken_stream_keeps_the_text_already_shown(self):
+        self._use(StreamingModels(["One. ", "Two. ", "Three."], break_after=2))
+        received = []
+        text = self.api._stream_content_with_fallback("p", received.append, "ctx", use_cache=True)
+        self.assertEqual(text, "One. Two.")
+        self.assertEqual("".join(received), "One. Two. ")
+        self.assertEqual(len(self.api.response_cache), 0)
+
+    def test_models_without_streaming_fall_back_to_one_call(self):
+        self.api.model = MagicMock(spec=["generate_content", "model_name"])
+        self.api.model.generate_content.return_value = SimpleNamespace(text="Whole reply.")
+        on_text = MagicMock()
+        text = self.api._stream_content_with_fallback("p", on_text, "ctx", use_cache=False)
+        self.assertEqual(text, "Whole reply.")
+        on_text.assert_not_called()
+
+    def test_npc_dialogue_streams_only_the_spoken_text(self):
+        self._use(
+            StreamingModels(
+                ['{"response_text": "You look pale', ', Rodion."', ', "stat_changes": {"fear": 2}}']
+            )
+        )
+        npc = Character("Sonya", "persona", "greeting", "Haymarket", ["Haymarket"])
+        player = Character("Rodion", "persona", "greeting", "Haymarket", ["Haymarket"])
+        received = []
+        text = self.api.get_npc_dialogue(
+            npc,
+            player,
+            "Hello",
+            "Haymarket",
+            "Evening",
+            "Neutral",
+            "No memories.",
+            on_text=received.append,
+        )
+        self.assertEqual("".join(received), "You look pale, Rodion.")
+        self.assertEqual(text, "You look pale, Rodion.")
+        self.assertIn("You look pale, Rodion.", npc.conversation_histories["Rodion"][-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
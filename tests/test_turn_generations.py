@@ -0,0 +1,88 @@
+import asyncio
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from game_engine.gemini_interactions import GeminiAPI  # noqa: E402
+from game_engine.turn_generations import PlannedGeneration, TurnGenerations  # noqa: E402
+from game_engine.world_manager import WorldManager  # noqa: E402
+
+
+class TestTurnGenerations(unittest.TestCase):
+    def setUp(self):
+        self.api = GeminiAPI()
+        self.shown = []
+
+    def test_generations_run_together_and_show_in_order(self):
+        barrier = []
+
+        async def reply(text):
+            if not barrier:
+                barrier.append(asyncio.Barrier(2))
+            # Neither reply finishes until both are in flight.
+            await asyncio.wait_for(barrier[0].wait(), timeout=5)
+            return text
+
+        self.api.get_npc_to_npc_interaction_async = lambda *args: reply("A: Hush.")
+        self.api.get_atmospheric_details_async = lambda *args: reply("Fog rolls in.")
+        turn = TurnGenerations(self.api)
+        turn.add(PlannedGeneration("get_npc_to_npc_interaction", ("a", "b"), {}), self.shown.append)
+        turn.add(None, lambda text: self.shown.append("static"))
+        turn.add(PlannedGeneration("get_atmospheric_details", ("p",), {}), self.shown.append)
+        turn.run()
+        self.assertEqual(self.shown, ["A: Hush.", "static", "Fog rolls in."])
+
+    def test_a_single_generation_is_made_directly(self):
+        self.api.get_rumor_or_gossip = MagicMock(return_value="They say...")
+        self.api.gather_generations = MagicMock()
+        turn = TurnGenerations(self.api)
+        turn.add(PlannedGeneration("get_rumor_or_gossip", ("npc",), {"x": 1}), self.shown.append)
+        turn.run()
+        self.api.get_rumor_or_gossip.assert_called_once_with("npc", x=1)
+        self.api.gather_generations.assert_not_called()
+        self.assertEqual(self.shown, ["They say..."])
+
+
+class TestPlannedRumors(unittest.TestCase):
+    def test_rumor_rolled_last_turn_is_shown_without_a_new_roll(self):
+        source_npc = SimpleNamespace(name="Gossip", relationship_with_player=0)
+        state = SimpleNamespace(
+            current_location_name="Tavern",
+            npcs_in_current_location=[source_npc],
+            low_ai_data_mode=False,
+            gemini_api=SimpleNamespace(
+                model=object(), get_rumor_or_gossip=MagicMock(return_value="Prices rise again.")
+            ),
+            player_character=None,
+            _print_color=MagicMock(),
+            _apply_verbosity=lambda text: text,
+            _get_known_facts_summary=lambda: "facts",
+            player_notoriety_level=0,
+            get_relationship_text=lambda score: "neutral",
+            _get_objectives_summary=lambda character: "objectives",
+            _remember_ai_output=MagicMock(),
+            game_time=0,
+        )
+        wm = WorldManager(state)
+        turn = TurnGenerations(state.gemini_api)
+        with patch("game_engine.world_manager.random.random", return_value=0.0):
+            wm.planned_rumors = wm.plan_ambient_rumor(turn)
+        turn.run()
+        state._print_color.assert_not_called()
+
+        with patch("game_engine.world_manager.random.random", return_value=0.0) as roll:
+            wm._handle_ambient_rumors()
+        roll.assert_not_called()
+        state.gemini_api.get_rumor_or_gossip.assert_called_once()
+        state._remember_ai_output.assert_called_once_with("Prices rise again.", "ambient_rumor")
+        self.assertIsNone(wm.planned_rumors)
+
+
+if __name__ == "__main__":
+    unittest.main()